@@ -78,6 +78,32 @@ class CheckRoutine:
         LOGGER.info(f'CHECK ROUTINE: Database collection validation status {collection_test}')
         return collection_test
 
+    def reconcile_indexes(self):
+        """
+        Create or rebuild the declared indexes of the existing collections.
+        Errors are logged - a missing index does not prevent the start.
+        """
+        LOGGER.info('CHECK ROUTINE: Reconciling database indexes')
+        from cmdb.framework import __COLLECTIONS__ as FRAMEWORK_CLASSES
+        from cmdb.user_management import __COLLECTIONS__ as USER_MANAGEMENT_COLLECTION
+        from cmdb.exportd import __COLLECTIONS__ as JOB_MANAGEMENT_COLLECTION
+        existing_collections = self.setup_database_manager.connector.database.list_collection_names()
+
+        for collection in FRAMEWORK_CLASSES + USER_MANAGEMENT_COLLECTION + JOB_MANAGEMENT_COLLECTION:
+            if collection.COLLECTION not in existing_collections:
+                continue
+            try:
+                result = self.setup_database_manager.reconcile_indexes(collection.COLLECTION,
+                                                                       collection.get_index_keys())
+            except Exception as err:
+                LOGGER.error(f'CHECK ROUTINE: Index reconciliation of "{collection.COLLECTION}" failed: {err}')
+                continue
+            if result['created'] or result['rebuilt']:
+                LOGGER.info(f'CHECK ROUTINE: Indexes of "{collection.COLLECTION}" - '
+                            f'created: {result["created"]}, rebuilt: {result["rebuilt"]}')
+            if result['unknown']:
+                LOGGER.debug(f'CHECK ROUTINE: Undeclared indexes of "{collection.COLLECTION}": {result["unknown"]}')
+
     def has_updates(self) -> bool:
         """
         check if updates are available
@@ -137,6 +137,9 @@ def build_arg_parser() -> Namespace:
     _parser.add_argument('-s', '--start', action='store_true', default=False, dest='start',
                          help="starting cmdb core system - enables services")
 
+    _parser.add_argument('--index-advisor', action='store_true', default=False, dest='index_advisor',
+                         help="explain the object queries and report collection scans")
+
     _parser.add_argument('-c', '--config', default='./etc/cmdb.conf', dest='config_file',
                          help="optional path to config file")
 
@@ -203,12 +206,22 @@ def main(args):
                 setup_status = setup_routine.get_setup_status()
                 LOGGER.warning(f'The setup did not go through as expected - Status {setup_status}')
             if setup_status == SetupRoutine.SetupStatus.FINISHED:
-                pass
+                check_routine.reconcile_indexes()
             else:
                 exit(1)
         else:
             pass
 
+    if args.index_advisor:
+        from cmdb.database.index_advisor import IndexAdvisor
+        reports = IndexAdvisor(dbm).advise()
+        for report in reports:
+            print(colored(str(report), 'red' if report.collection_scan else 'green'))
+        if any(report.collection_scan for report in reports):
+            LOGGER.warning('Collection scans detected - check the declared indexes or run an update.')
+            exit(1)
+        exit(0)
+
     if args.keys:
         from cmdb.__setup__ import SetupRoutine
         setup_routine = SetupRoutine(dbm)
@@ -0,0 +1,151 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2019 - 2021 NETHINKS GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Index advisor - replays the query shapes of the managers through `explain` and reports collection scans
+"""
+import logging
+from typing import List, Set
+
+from cmdb.database.managers import DatabaseManagerMongo
+
+LOGGER = logging.getLogger(__name__)
+
+
+class QueryShape:
+    """A named aggregation pipeline like the managers generate it"""
+
+    def __init__(self, name: str, collection: str, pipeline: List[dict]):
+        """
+        Constructor of `QueryShape`
+
+        Args:
+            name: Short description of the access path
+            collection: Name of the queried collection
+            pipeline: Aggregation pipeline with sample values
+        """
+        self.name = name
+        self.collection = collection
+        self.pipeline = pipeline
+
+
+class QueryShapeReport:
+    """Explain result of a single query shape"""
+
+    def __init__(self, shape: QueryShape, stages: Set[str], indexes: Set[str]):
+        self.shape = shape
+        self.stages = stages
+        self.indexes = indexes
+
+    @property
+    def collection_scan(self) -> bool:
+        return 'COLLSCAN' in self.stages
+
+    def __str__(self):
+        status = 'COLLSCAN' if self.collection_scan else 'OK'
+        indexes = ', '.join(sorted(self.indexes)) or '-'
+        return f'[{status:8}] {self.shape.collection}: {self.shape.name} (indexes: {indexes})'
+
+
+class IndexAdvisor:
+    """Explains the query shapes of the framework collections"""
+
+    def __init__(self, database_manager: DatabaseManagerMongo):
+        self.database_manager = database_manager
+
+    def explain(self, shape: QueryShape) -> QueryShapeReport:
+        """
+        Explain the pipeline of a query shape and collect the stages of the winning plans.
+
+        Args:
+            shape: query shape
+
+        Returns:
+            QueryShapeReport with the used plan stages and index names
+        """
+        explain_result = self.database_manager.connector.database.command(
+            'aggregate', shape.collection, pipeline=shape.pipeline, explain=True)
+        stages, indexes = set(), set()
+        self.__collect_plan(explain_result, stages, indexes, in_winning_plan=False)
+        return QueryShapeReport(shape, stages, indexes)
+
+    def __collect_plan(self, node, stages: Set[str], indexes: Set[str], in_winning_plan: bool):
+        if isinstance(node, list):
+            for item in node:
+                self.__collect_plan(item, stages, indexes, in_winning_plan)
+        elif isinstance(node, dict):
+            if in_winning_plan:
+                if 'stage' in node:
+                    stages.add(node['stage'])
+                if 'indexName' in node:
+                    indexes.add(node['indexName'])
+            for key, value in node.items():
+                if key == 'rejectedPlans':
+                    continue
+                self.__collect_plan(value, stages, indexes, in_winning_plan or key == 'winningPlan')
+
+    def object_query_shapes(self) -> List[QueryShape]:
+        """
+        Query shapes of the object access paths.
+        Sample values are taken from an existing object - the plans depend on the indexes, not on the values.
+
+        Returns:
+            List of QueryShape
+        """
+        from cmdb.framework import CmdbObject
+        from cmdb.framework.managers.object_manager import ObjectQueryBuilder
+
+        sample = self.database_manager.connector.get_collection(CmdbObject.COLLECTION).find_one({}) or {}
+        type_id = sample.get('type_id', 1)
+        author_id = sample.get('author_id', 1)
+        field = (sample.get('fields') or [{}])[0]
+        field_name, field_value = field.get('name', 'name'), field.get('value', '')
+
+        builder = ObjectQueryBuilder()
+
+        def _page(filter: dict, sort: str = 'public_id', order: int = 1) -> List[dict]:
+            return list(builder.build(filter=filter, limit=10, skip=0, sort=sort, order=order))
+
+        return [
+            QueryShape('objects of a type', CmdbObject.COLLECTION, _page({'type_id': type_id})),
+            QueryShape('active objects of a type', CmdbObject.COLLECTION,
+                       _page({'type_id': type_id, 'active': True})),
+            QueryShape('objects of several types', CmdbObject.COLLECTION, _page({'type_id': {'$in': [type_id]}})),
+            QueryShape('count of active objects', CmdbObject.COLLECTION, list(builder.count({'active': True}))),
+            QueryShape('newest objects', CmdbObject.COLLECTION, _page({}, sort='creation_time', order=-1)),
+            QueryShape('last changed objects', CmdbObject.COLLECTION, _page({}, sort='last_edit_time', order=-1)),
+            QueryShape('objects of an author', CmdbObject.COLLECTION, _page({'author_id': author_id})),
+            QueryShape('objects by field value', CmdbObject.COLLECTION,
+                       _page({'fields': {'$elemMatch': {'name': field_name, 'value': field_value}}})),
+            QueryShape('objects of a type by field value', CmdbObject.COLLECTION, _page({
+                'type_id': type_id, 'fields': {'$elemMatch': {'name': field_name, 'value': field_value}}
+            }))
+        ]
+
+    def advise(self) -> List[QueryShapeReport]:
+        """
+        Explain all known query shapes.
+
+        Returns:
+            List of QueryShapeReport - shapes which could not be explained are logged and skipped
+        """
+        reports = []
+        for shape in self.object_query_shapes():
+            try:
+                reports.append(self.explain(shape))
+            except Exception as err:
+                LOGGER.error(f'Query shape "{shape.name}" could not be explained: {err}')
+        return reports
@@ -19,11 +19,14 @@ Database Management instance for database actions
 
 """
 import logging
-from typing import Generic, List
+from collections import deque
+from threading import Lock
+from typing import Generic, List, Dict, Deque, Tuple
 
-from pymongo import IndexModel
+from pymongo import IndexModel, ReturnDocument
 from pymongo.database import Database
-from pymongo.results import DeleteResult, UpdateResult
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from pymongo.results import DeleteResult, UpdateResult, BulkWriteResult
 
 from cmdb.database import CONNECTOR
 from cmdb.database.connection import MongoConnector
@@ -36,6 +39,8 @@ from cmdb.database.utils import DESCENDING
 
 LOGGER = logging.getLogger(__name__)
 
+PUBLIC_ID_BLOCK_SIZE = 1000
+
 
 class DatabaseManager(Generic[CONNECTOR]):
     """
@@ -94,6 +99,10 @@ class DatabaseManager(Generic[CONNECTOR]):
 class DatabaseManagerMongo(DatabaseManager[MongoConnector]):
     """PyMongo (mongodb) implementation of Database Manager"""
 
+    # process wide cache of reserved public ids - key is (database name, collection)
+    _public_id_cache: Dict[Tuple[str, str], Deque[int]] = {}
+    _public_id_lock = Lock()
+
     def __init__(self, host: str, port: int, database_name: str, **kwargs):
         connector = MongoConnector(host, port, database_name, kwargs)
         super(DatabaseManagerMongo, self).__init__(connector)
@@ -130,6 +139,47 @@ class DatabaseManagerMongo(DatabaseManager[MongoConnector]):
     def create_indexes(self, collection: str, indexes: List[IndexModel]) -> List[str]:
         return self.connector.get_collection(collection).create_indexes(indexes)
 
+    def reconcile_indexes(self, collection: str, indexes: List[IndexModel]) -> Dict[str, List[str]]:
+        """Bring the indexes of a collection in line with the declared indexes.
+        Missing indexes are created, indexes whose keys or options differ from the declaration are rebuilt.
+        Undeclared indexes are only reported - they could be created by an administrator.
+
+        Args:
+            collection (str): name of database collection
+            indexes: declared indexes of the collection
+
+        Returns:
+            names of the `created`, `rebuilt` and `unknown` indexes
+        """
+        def _key_spec(keys) -> List[Tuple]:
+            return [(field, int(direction) if isinstance(direction, float) else direction)
+                    for field, direction in (keys.items() if isinstance(keys, dict) else keys)]
+
+        existing_indexes: dict = self.get_index_info(collection)
+        result = {'created': [], 'rebuilt': [], 'unknown': []}
+        for index in indexes:
+            declared = index.document
+            existing = existing_indexes.get(declared['name'])
+            if existing is None:
+                change = 'created'
+            elif _key_spec(existing['key']) != _key_spec(declared['key']) or \
+                    bool(existing.get('unique')) != bool(declared.get('unique')):
+                self.connector.get_collection(collection).drop_index(declared['name'])
+                change = 'rebuilt'
+            else:
+                continue
+            try:
+                self.create_indexes(collection, [index])
+            except OperationFailure as err:
+                # e.g. the same keys are already indexed under another name
+                LOGGER.warning(f'Index {declared["name"]} of {collection} could not be created: {err}')
+                continue
+            result[change].append(declared['name'])
+
+        declared_names = [index.document['name'] for index in indexes]
+        result['unknown'] = [name for name in existing_indexes if name != '_id_' and name not in declared_names]
+        return result
+
     def get_index_info(self, collection: str):
         """get the max index value"""
         return self.connector.get_collection(collection).index_information()
@@ -220,6 +270,17 @@ class DatabaseManagerMongo(DatabaseManager[MongoConnector]):
         filter = filter or {}
         return self.connector.get_collection(collection).count_documents(filter=filter, *args, **kwargs)
 
+    def estimated_count(self, collection: str) -> int:
+        """Count all documents of a collection based on the collection metadata.
+
+        Args:
+            collection (str): name of database collection
+
+        Returns:
+            returns the estimated count of the documents
+        """
+        return self.connector.get_collection(collection).estimated_document_count()
+
     def aggregate(self, collection: str, *args, **kwargs):
         """
         Aggregation on mongodb.
@@ -253,9 +314,11 @@ class DatabaseManagerMongo(DatabaseManager[MongoConnector]):
 
         if 'public_id' not in data:
             data['public_id'] = self.get_next_public_id(collection=collection)
-        self.connector.get_collection(collection).insert_one(data)
-        # update the id counter
-        self.update_public_id_counter(collection, data['public_id'])
+            self.connector.get_collection(collection).insert_one(data)
+        else:
+            self.connector.get_collection(collection).insert_one(data)
+            # update the id counter
+            self.update_public_id_counter(collection, data['public_id'])
         return data['public_id']
 
     def update(self, collection: str, filter: dict, data: dict, *args, **kwargs):
@@ -303,6 +366,22 @@ class DatabaseManagerMongo(DatabaseManager[MongoConnector]):
             raise DocumentCouldNotBeDeleted(collection)
         return result
 
+    def bulk_write(self, collection: str, operations: list, ordered: bool = True) -> BulkWriteResult:
+        """send a batch of write operations to the database in one request
+
+        Args:
+            collection (str): name of database collection
+            operations (list): pymongo write operations (InsertOne, ReplaceOne, DeleteOne, ...)
+            ordered (bool): stop at the first error - if false all operations are tried
+
+        Returns:
+            BulkWriteResult: result of the batch
+
+        Raises:
+            BulkWriteError: if one or more operations failed - the details include the index of the failed operations
+        """
+        return self.connector.get_collection(collection).bulk_write(operations, ordered=ordered)
+
     def insert_with_internal(self, collection: str, _id: int or str, data: dict):
         formatted_id = {'_id': _id}
         formatted_data = {'$set': data}
@@ -454,50 +533,81 @@ class DatabaseManagerMongo(DatabaseManager[MongoConnector]):
         return highest
 
     def get_next_public_id(self, collection: str) -> int:
-        try:
-            founded_counter = self.connector.get_collection(PublicIDCounter.COLLECTION).find_one(filter={
-                '_id': collection
-            })
-            new_id = founded_counter['counter'] + 1
-        except (NoDocumentFound, Exception) as err:
-            docs_count = self._init_public_id_counter(collection)
-            new_id = docs_count + 1
-        finally:
-            self.increment_public_id_counter(collection)
-        return new_id
+        """Get the next free public id of a collection with a single atomic counter increment
+
+        Args:
+            collection (str): name of database collection
+
+        Returns:
+            int: the next public id
+        """
+        return self.reserve_public_ids(collection, amount=1)[0]
+
+    def reserve_public_ids(self, collection: str, amount: int) -> range:
+        """Reserve a block of public ids with one atomic counter increment.
+        The ids are exclusively reserved for the caller, even between multiple processes.
+
+        Args:
+            collection (str): name of database collection
+            amount (int): number of ids to reserve
+
+        Returns:
+            range: the reserved public ids
+        """
+        if amount < 1:
+            return range(0)
+        counter_collection = self.connector.get_collection(PublicIDCounter.COLLECTION)
+        counter_doc = counter_collection.find_one_and_update({'_id': collection}, {'$inc': {'counter': amount}},
+                                                             return_document=ReturnDocument.AFTER)
+        if counter_doc is None:
+            self._init_public_id_counter(collection)
+            counter_doc = counter_collection.find_one_and_update({'_id': collection}, {'$inc': {'counter': amount}},
+                                                                 return_document=ReturnDocument.AFTER)
+        last_id = counter_doc['counter']
+        return range(last_id - amount + 1, last_id + 1)
+
+    def get_cached_public_id(self, collection: str, block_size: int = PUBLIC_ID_BLOCK_SIZE) -> int:
+        """Hand out a public id from a block reserved by this process.
+        Only needs a database round trip every `block_size` calls - unused ids of a block are lost
+        when the process ends, so this should only be used by bulk operations like imports.
+
+        Args:
+            collection (str): name of database collection
+            block_size (int): number of ids which will be reserved if the cached block is exhausted
+
+        Returns:
+            int: a free public id
+        """
+        cache_key = (self.connector.database.name, collection)
+        with DatabaseManagerMongo._public_id_lock:
+            reserved_ids = DatabaseManagerMongo._public_id_cache.get(cache_key)
+            if not reserved_ids:
+                reserved_ids = deque(self.reserve_public_ids(collection, amount=block_size))
+                DatabaseManagerMongo._public_id_cache[cache_key] = reserved_ids
+            return reserved_ids.popleft()
 
     def _init_public_id_counter(self, collection: str):
         LOGGER.info(f'Counter for collection {collection} wasn´t found - setup new with data from {collection}')
         docs_count = self.get_highest_id(collection)
-        self.connector.get_collection(PublicIDCounter.COLLECTION).insert({
-            '_id': collection,
-            'counter': docs_count
-        })
+        try:
+            self.connector.get_collection(PublicIDCounter.COLLECTION).update_one(
+                {'_id': collection}, {'$max': {'counter': docs_count}}, upsert=True)
+        except DuplicateKeyError:
+            # counter was initialized by a concurrent process
+            pass
         return docs_count
 
     def increment_public_id_counter(self, collection: str):
-        working_collection = self.connector.get_collection(PublicIDCounter.COLLECTION)
-        query = {
-            '_id': collection
-        }
-        counter_doc = working_collection.find_one(query)
-        counter_doc['counter'] = counter_doc['counter'] + 1
-        self.connector.get_collection(PublicIDCounter.COLLECTION).update(query, counter_doc)
+        self.reserve_public_ids(collection, amount=1)
 
     def update_public_id_counter(self, collection: str, value: int):
+        """Raise the counter to the value, if the value is higher than the counter"""
         working_collection = self.connector.get_collection(PublicIDCounter.COLLECTION)
-        query = {
-            '_id': collection
-        }
-        counter_doc = working_collection.find_one(query)
+        update_result = working_collection.update_one({'_id': collection}, {'$max': {'counter': value}})
         # init counter, if it was not found
-        if counter_doc is None:
+        if update_result.matched_count == 0:
             self._init_public_id_counter(collection)
-            counter_doc = working_collection.find_one(query)
-        # update counter only, if value is higher than counter
-        if value > counter_doc['counter']:
-            counter_doc['counter'] = value
-            self.connector.get_collection(PublicIDCounter.COLLECTION).update(query, counter_doc)
+            working_collection.update_one({'_id': collection}, {'$max': {'counter': value}})
 
 
 class DatabaseGridFS(GridFS):
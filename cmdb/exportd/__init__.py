@@ -16,9 +16,11 @@
 
 
 from cmdb.exportd.exportd_job.exportd_job import ExportdJob
+from cmdb.exportd.exportd_job.exportd_sync_state import ExportdSyncState
 from cmdb.exportd.exportd_logs.exportd_log import ExportdMetaLog
 
 __COLLECTIONS__ = [
     ExportdJob,
-    ExportdMetaLog
+    ExportdMetaLog,
+    ExportdSyncState
     ]
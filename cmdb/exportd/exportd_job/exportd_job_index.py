@@ -0,0 +1,81 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2019 - 2021 NETHINKS GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+from threading import RLock
+from typing import Dict, List
+
+from cmdb.exportd.exportd_job.exportd_job import ExportdJob
+from cmdb.exportd.exportd_job.exportd_job_manager import ExportdJobManagement
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ExportdJobIndex:
+    """
+    In-memory index of the exportd jobs by the type ids of their sources.
+    The index is loaded lazily and must be invalidated when a job is added, updated or deleted.
+    """
+
+    def __init__(self, job_manager: ExportdJobManagement):
+        self.job_manager = job_manager
+        self._jobs_by_type: Dict[int, List[ExportdJob]] = {}
+        self._dirty: bool = True
+        self._lock = RLock()
+
+    def invalidate(self):
+        """Reload the jobs on the next lookup"""
+        with self._lock:
+            self._dirty = True
+
+    def refresh(self):
+        """Load all jobs and index them by their source type ids"""
+        jobs_by_type: Dict[int, List[ExportdJob]] = {}
+        for job in self.job_manager.get_all_jobs():
+            for type_id in {source.get('type_id') for source in job.get_sources() or []}:
+                jobs_by_type.setdefault(type_id, []).append(job)
+        with self._lock:
+            self._jobs_by_type = jobs_by_type
+            self._dirty = False
+        LOGGER.debug(f'Exportd job index refreshed for {len(jobs_by_type)} types')
+
+    def get_jobs(self, type_id: int) -> List[ExportdJob]:
+        """
+        Get all jobs with a source of a type
+
+        Args:
+            type_id: public id of the type
+
+        Returns:
+            List of ExportdJob
+        """
+        with self._lock:
+            if self._dirty:
+                self.refresh()
+            return list(self._jobs_by_type.get(type_id, []))
+
+    def get_event_jobs(self, type_id: int) -> List[int]:
+        """
+        Get the ids of the active jobs which are executed on object changes of a type
+
+        Args:
+            type_id: public id of the type
+
+        Returns:
+            List of job public ids
+        """
+        return [job.get_public_id() for job in self.get_jobs(type_id)
+                if job.get_active() and (job.scheduling or {}).get('event', {}).get('active')]
@@ -0,0 +1,145 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2019 - 2021 NETHINKS GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Output cache of the pull jobs
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Callable, Dict
+
+from cmdb.database.managers import DatabaseManagerMongo
+from cmdb.exportd.exportd_header.exportd_header import ExportdHeader
+from cmdb.exportd.exportd_job.exportd_job import ExportdJob
+from cmdb.framework.cmdb_object import CmdbObject
+from cmdb.framework.models.log import CmdbMetaLog, LogAction
+from cmdb.framework.models.type import TypeModel
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _hash(data) -> str:
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class ExportdPullCacheEntry:
+    """Generated output of a pull job"""
+
+    def __init__(self, fingerprint: str, header: ExportdHeader, etag: str, last_modified: datetime):
+        """
+        Args:
+            fingerprint: state of the job and its data when the output was generated
+            header: output of the job
+            etag: hash of the output data
+            last_modified: time of the first generation of this output
+        """
+        self.fingerprint = fingerprint
+        self.header = header
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class ExportdPullCache:
+    """
+    Cache of the pull job outputs.
+    An output is valid as long as the fingerprint of the job is unchanged - the fingerprint covers the job settings,
+    the source types and the latest object insert, update and delete. The objects are checked collection wide,
+    because the templates can render referenced objects of any type, and with index lookups only -
+    so the fingerprint stays cheap compared to a run of the job.
+    Concurrent requests of the same job with an outdated output wait for a single rebuild.
+    """
+
+    def __init__(self, database_manager: DatabaseManagerMongo):
+        self.database_manager = database_manager
+        self._entries: Dict[int, ExportdPullCacheEntry] = {}
+        self._job_locks: Dict[int, Lock] = {}
+        self._lock = Lock()
+
+    def __latest(self, collection: str, key: str, filter: dict = None):
+        cursor = self.database_manager.find(collection, filter or {}, projection={'_id': 0, key: 1}) \
+            .sort(key, -1).limit(1)
+        return next((document.get(key) for document in cursor), None)
+
+    def fingerprint(self, job: ExportdJob) -> str:
+        """
+        Get the current state of a job and its data
+
+        Args:
+            job: pull job
+
+        Returns:
+            Hash which changes with every change of the job output
+        """
+        type_ids = sorted({source.get('type_id') for source in job.get_sources() or []})
+        types = list(self.database_manager.find(TypeModel.COLLECTION, {'public_id': {'$in': type_ids}},
+                                                projection={'_id': 0}).sort('public_id', 1))
+        return _hash({
+            'job': {'sources': job.get_sources(), 'destination': job.get_destinations(),
+                    'variables': job.get_variables()},
+            'types': types,
+            'objects': [
+                self.database_manager.connector.get_collection(CmdbObject.COLLECTION).estimated_document_count(),
+                self.__latest(CmdbObject.COLLECTION, 'creation_time'),
+                self.__latest(CmdbObject.COLLECTION, 'last_edit_time'),
+                self.__latest(CmdbMetaLog.COLLECTION, 'log_time', {'action': LogAction.DELETE.value})
+            ]
+        })
+
+    def get(self, job: ExportdJob, build: Callable[[], ExportdHeader]) -> ExportdPullCacheEntry:
+        """
+        Get the output of a pull job - it is rebuilt if the job or its data has changed
+
+        Args:
+            job: pull job
+            build: executes the job
+
+        Returns:
+            ExportdPullCacheEntry of the current output
+        """
+        public_id = job.get_public_id()
+        with self._lock:
+            job_lock = self._job_locks.setdefault(public_id, Lock())
+
+        # requests which waited for a running rebuild get its output
+        with job_lock:
+            fingerprint = self.fingerprint(job)
+            entry = self._entries.get(public_id)
+            if entry is not None and entry.fingerprint == fingerprint:
+                return entry
+
+            header = build()
+            etag = hashlib.sha1(header.data.encode(header.charset) if isinstance(header.data, str)
+                                else header.data).hexdigest()
+            if entry is not None and entry.etag == etag:
+                last_modified = entry.last_modified
+            else:
+                last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+            new_entry = ExportdPullCacheEntry(fingerprint, header, etag, last_modified)
+            # failed runs are not cached
+            if header.status == 200:
+                self._entries[public_id] = new_entry
+            else:
+                self._entries.pop(public_id, None)
+            LOGGER.debug(f'Output of pull job {public_id} rebuilt')
+            return new_entry
+
+    def invalidate(self, public_id: int):
+        """Drop the output of a job"""
+        with self._lock:
+            self._entries.pop(public_id, None)
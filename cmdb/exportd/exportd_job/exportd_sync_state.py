@@ -0,0 +1,83 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2019 - 2021 NETHINKS GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+from datetime import datetime
+from typing import List, Optional
+
+from cmdb.framework.cmdb_dao import CmdbDAO
+from cmdb.framework.utils import Collection, Model
+
+
+class ExportdSyncState(CmdbDAO):
+    """
+    Synchronisation state of an exportd job - the public id is the id of the job.
+    Holds a `last_edit_time` watermark per job source, so a run only exports the objects
+    which were changed or deleted since the last successful run.
+    """
+    COLLECTION: Collection = 'exportd.sync_states'
+    MODEL: Model = 'ExportdSyncState'
+
+    def __init__(self, public_id: int, config_hash: str = None, sources: List[dict] = None,
+                 last_sync: datetime = None, last_full_sync: datetime = None):
+        """
+        Args:
+            public_id: public id of the job
+            config_hash: hash of the destinations and variables of the last run
+            sources: `hash` of the source definition and `watermark` of every job source
+            last_sync: start time of the last successful run
+            last_full_sync: start time of the last successful full run
+        """
+        self.config_hash: str = config_hash
+        self.sources: List[dict] = sources or []
+        self.last_sync: datetime = last_sync
+        self.last_full_sync: datetime = last_full_sync
+        super(ExportdSyncState, self).__init__(public_id=public_id)
+
+    def get_watermarks(self, config_hash: str, source_hashes: List[str]) -> Optional[List[datetime]]:
+        """
+        Get the watermarks of the job sources.
+
+        Args:
+            config_hash: hash of the current destinations and variables
+            source_hashes: hashes of the current source definitions
+
+        Returns:
+            Watermark of every source or None if the job was changed since the last run
+        """
+        if config_hash != self.config_hash or len(source_hashes) != len(self.sources):
+            return None
+        watermarks = []
+        for source_hash, source in zip(source_hashes, self.sources):
+            if source.get('hash') != source_hash or not source.get('watermark'):
+                return None
+            watermarks.append(source['watermark'])
+        return watermarks
+
+    @classmethod
+    def from_data(cls, data: dict, *args, **kwargs) -> "ExportdSyncState":
+        return cls(public_id=data.get('public_id'), config_hash=data.get('config_hash', None),
+                   sources=data.get('sources', None), last_sync=data.get('last_sync', None),
+                   last_full_sync=data.get('last_full_sync', None))
+
+    @classmethod
+    def to_data(cls, instance: "ExportdSyncState") -> dict:
+        return {
+            'public_id': instance.get_public_id(),
+            'config_hash': instance.config_hash,
+            'sources': instance.sources,
+            'last_sync': instance.last_sync,
+            'last_full_sync': instance.last_full_sync
+        }
@@ -54,13 +54,15 @@ class ExportdJobLog(ExportdMetaLog):
 
     def __init__(self, public_id: int, log_type, log_time: datetime, action: LogAction, action_name: str,
                  job_id: int, state: bool = None, user_id: int = None, user_name: str = None, event: str = None,
-                 message=None):
+                 message=None, destination: str = None, duration: float = None):
         self.job_id = job_id
         self.state = state
         self.user_id = user_id
         self.user_name = user_name or self.UNKNOWN_USER_STRING
         self.event = event
         self.message = message
+        self.destination = destination
+        self.duration = duration
         super(ExportdJobLog, self).__init__(public_id=public_id, log_type=log_type, log_time=log_time, action=action,
                                             action_name=action_name)
 
@@ -77,6 +79,8 @@ class ExportdJobLog(ExportdMetaLog):
             log_time=data.get('log_time', None),
             log_type=data.get('log_type', None),
             message=data.get('message', None),
+            destination=data.get('destination', None),
+            duration=data.get('duration', None),
             action=data.get('action', None),
             action_name=data.get('action_name', None)
         )
@@ -94,6 +98,8 @@ class ExportdJobLog(ExportdMetaLog):
             'log_time': instance.log_time,
             'log_type': instance.log_type,
             'message': instance.message,
+            'destination': instance.destination,
+            'duration': instance.duration,
             'action': instance.action,
             'action_name': instance.action_name,
         }
@@ -14,20 +14,35 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import hashlib
+import json
 import logging
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from cmdb.database.managers import DatabaseManagerMongo
 from cmdb.exportd.exportd_job.exportd_job_manager import ExportdJobManagement
 from cmdb.exportd.exportd_logs.exportd_log_manager import ExportdLogManager
-from cmdb.exportd.exportd_job.exportd_job import ExportdJob
+from cmdb.exportd.exportd_job.exportd_job import ExportdJob, ExportdJobType
+from cmdb.exportd.exportd_job.exportd_sync_state import ExportdSyncState
+from cmdb.framework.cmdb_object import CmdbObject
+from cmdb.framework.models.type import TypeModel
+from cmdb.framework.models.log import CmdbMetaLog, CmdbObjectLog, LogAction as ObjectLogAction
 from cmdb.exportd.exportd_header.exportd_header import ExportdHeader
 from cmdb.utils.error import CMDBError
 from cmdb.utils.helpers import load_class
 from cmdb.utils.system_config import SystemConfigReader
 from cmdb.framework.cmdb_object_manager import CmdbObjectManager
 from cmdb.exportd.exportd_logs.exportd_log_manager import LogManagerInsertError, LogAction, ExportdJobLog
-from cmdb.framework.cmdb_render import CmdbRender, RenderList
-from cmdb.templates.template_data import ObjectTemplateData
+from cmdb.framework.cmdb_render import CmdbRender, RenderList, RenderResult
+from cmdb.templates.template_data import ObjectTemplateData, ObjectTemplateDataCache
 from cmdb.templates.template_engine import TemplateEngine
 
 LOGGER = logging.getLogger(__name__)
@@ -35,15 +50,26 @@ LOGGER = logging.getLogger(__name__)
 
 class ExportdManagerBase(ExportdJobManagement):
 
-    def __init__(self, job: ExportdJob):
+    # Max number of destinations of a job which are exported concurrently
+    DESTINATION_WORKERS: int = 4
+    # Time a delta run reaches back before the watermark - covers changes which were written late
+    DELTA_OVERLAP: timedelta = timedelta(seconds=10)
+
+    def __init__(self, job: ExportdJob, database_manager: DatabaseManagerMongo = None):
+        """
+        Args:
+            job: Exportd job to execute
+            database_manager: Shared database connection - a new connection is opened if not set
+        """
         self.job = job
         self.exportvars = self.__get_exportvars()
         self.destinations = self.__get__destinations()
 
-        scr = SystemConfigReader()
-        database_manager = DatabaseManagerMongo(
-            **scr.get_all_values_from_section('Database')
-        )
+        if database_manager is None:
+            scr = SystemConfigReader()
+            database_manager = DatabaseManagerMongo(
+                **scr.get_all_values_from_section('Database')
+            )
         self.__object_manager = CmdbObjectManager(
             database_manager=database_manager
         )
@@ -67,8 +93,8 @@ class ExportdManagerBase(ExportdJobManagement):
 
     def __get__destinations(self):
         destinations = []
-        destination_params = {}
         for destination in self.job.get_destinations():
+            destination_params = {}
             for param in destination["parameter"]:
                 destination_params.update({param["name"]: param["value"]})
 
@@ -81,39 +107,140 @@ class ExportdManagerBase(ExportdJobManagement):
 
         return destinations
 
-    def execute(self, event, user_id: int, user_name: str, log_flag: bool = True) -> ExportdHeader:
-        # get cmdb objects from all sources
-        cmdb_objects = set()
+    def execute(self, event, user_id: int, user_name: str, log_flag: bool = True,
+                full_sync: bool = False) -> ExportdHeader:
+        """
+        Export the objects of the job sources to all destinations.
+        If all destinations support deltas and the job was exported before, only the objects which were
+        changed or deleted since the last successful run are exported.
+
+        Args:
+            event: trigger event
+            user_id: public id of the triggering user
+            user_name: display name of the triggering user
+            log_flag: write the exportd logs and track the sync state - disabled for pull jobs
+            full_sync: force a full export, also for delta destinations
+
+        Returns:
+            ExportdHeader of the last destination
+        """
+        run_start = datetime.utcnow()
         exportd_header = ExportdHeader()
-        for source in self.sources:
-            cmdb_objects.update(source.get_objects())
-
-        # for every destination: do export
-        for destination in self.destinations:
-            external_system = destination.get_external_system()
-            external_system.prepare_export()
+        sync_state = self.__get_sync_state() if log_flag else None
+        config_hash, source_hashes = self.__config_hash(), [self.__hash(source) for source in self.job.get_sources()]
 
-            for cmdb_object in cmdb_objects:
-                # setup objectdata for use in ExportVariable templates
-                template_data = ObjectTemplateData(self.__object_manager, cmdb_object).get_template_data()
-                external_system.add_object(cmdb_object, template_data)
-            exportd_header = external_system.finish_export()
+        # delta run if possible
+        watermarks = None
+        if sync_state and not full_sync and self.job.exportd_type != ExportdJobType.PULL.name and \
+                self.destinations and all(destination.get_external_system().delta_support
+                                          for destination in self.destinations):
+            watermarks = sync_state.get_watermarks(config_hash, source_hashes)
 
+        # get cmdb objects from all sources
+        cmdb_objects = set()
+        deleted_ids = set()
+        if watermarks is not None:
+            for source in self.sources:
+                changes = source.get_changes([watermark - self.DELTA_OVERLAP for watermark in watermarks])
+                if changes is None:
+                    LOGGER.info(f'Exportd job {self.job.get_public_id()}: too many changes of referenced objects '
+                                f'- full export')
+                    watermarks = None
+                    break
+                cmdb_objects.update(changes[0])
+                deleted_ids.update(changes[1])
+        if watermarks is None:
+            cmdb_objects.clear()
+            deleted_ids.clear()
+            for source in self.sources:
+                cmdb_objects.update(source.get_objects())
+        else:
+            LOGGER.info(f'Exportd job {self.job.get_public_id()}: delta export of {len(cmdb_objects)} changed '
+                        f'and {len(deleted_ids)} deleted objects')
+
+        # compile every variable template once for the whole run
+        template_engine = TemplateEngine()
+        template_engine.precompile(template for variable in self.exportvars.values()
+                                   for template in variable.get_templates())
+
+        # resolve the references of all objects once and share the template data between all destinations
+        template_data_cache = ObjectTemplateDataCache(self.__object_manager)
+        template_data_cache.prefetch(cmdb_objects)
+        export_data = [(cmdb_object, ObjectTemplateData(self.__object_manager, cmdb_object,
+                                                        cache=template_data_cache).get_template_data())
+                       for cmdb_object in cmdb_objects]
+
+        # for every destination: do export - the destinations run concurrently
+        results: List[ExportDestinationResult] = []
+        if watermarks is not None and not export_data and not deleted_ids:
+            results = [ExportDestinationResult(type(destination.get_external_system()).__name__, 0,
+                                               message='No changes since the last export')
+                       for destination in self.destinations]
+        elif self.destinations:
+            workers = min(len(self.destinations), self.DESTINATION_WORKERS)
+            delta = watermarks is not None
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='exportd-destination') as pool:
+                results = list(pool.map(
+                    lambda destination: destination.export(export_data, deleted_ids=sorted(deleted_ids), delta=delta),
+                    self.destinations))
+
+        for result in results:
+            if result.error is None:
+                exportd_header = result.header
             if log_flag:
                 try:
                     log_params = {
                         'job_id': self.job.get_public_id(),
-                        'state': True,
+                        'state': result.error is None,
                         'user_id': user_id,
                         'user_name': user_name,
                         'event': event.get_type(),
-                        'message': external_system.msg_string,
+                        'message': result.message,
+                        'destination': result.name,
+                        'duration': result.duration
                     }
                     self.log_manager.insert_log(action=LogAction.EXECUTE, log_type=ExportdJobLog.__name__, **log_params)
                 except LogManagerInsertError as err:
                     LOGGER.error(err)
+        LOGGER.debug(f'Template cache after export: {template_engine.cache_stats()}')
+
+        failed = [result for result in results if result.error is not None]
+        if failed:
+            raise ExportdDestinationError(failed)
+        if log_flag:
+            self.__save_sync_state(sync_state, run_start, config_hash, source_hashes, full=watermarks is None)
         return exportd_header
 
+    @staticmethod
+    def __hash(data) -> str:
+        return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def __config_hash(self) -> str:
+        """Hash of the job parts which change the output of all objects"""
+        return self.__hash({'destination': self.job.get_destinations(), 'variables': self.job.get_variables()})
+
+    def __get_sync_state(self) -> Optional[ExportdSyncState]:
+        try:
+            data = self.dbm.find_one(ExportdSyncState.COLLECTION, public_id=self.job.get_public_id())
+        except Exception as err:
+            LOGGER.error(f'Sync state of exportd job {self.job.get_public_id()} could not be loaded: {err}')
+            return None
+        return ExportdSyncState.from_data(data) if data else None
+
+    def __save_sync_state(self, sync_state: Optional[ExportdSyncState], run_start: datetime, config_hash: str,
+                          source_hashes: List[str], full: bool):
+        """Store the start of the run as watermark of all sources"""
+        last_full_sync = run_start if full or not sync_state else sync_state.last_full_sync
+        new_state = ExportdSyncState(public_id=self.job.get_public_id(), config_hash=config_hash,
+                                     sources=[{'hash': source_hash, 'watermark': run_start}
+                                              for source_hash in source_hashes],
+                                     last_sync=run_start, last_full_sync=last_full_sync)
+        try:
+            self.dbm.update(ExportdSyncState.COLLECTION, {'public_id': new_state.get_public_id()},
+                            ExportdSyncState.to_data(new_state), upsert=True)
+        except Exception as err:
+            LOGGER.error(f'Sync state of exportd job {self.job.get_public_id()} could not be saved: {err}')
+
 
 class ExportVariable:
 
@@ -121,15 +248,17 @@ class ExportVariable:
         self.__name = name
         self.__value_tpl_default = value_tpl_default
         self.__value_tpl_types = value_tpl_types
+        self.__value_tpl_by_type = {int(templ['type']): templ['template']
+                                    for templ in value_tpl_types if templ['type'] != ''}
+
+    def get_templates(self) -> list:
+        """Get all value templates of the variable"""
+        return [self.__value_tpl_default] + list(self.__value_tpl_by_type.values())
 
     def get_value(self, cmdb_object, template_data):
         # get value template
-        value_template = self.__value_tpl_default
         object_type_id = cmdb_object.type_information['type_id']
-
-        for templ in self.__value_tpl_types:
-            if templ['type'] != '' and object_type_id == int(templ['type']):
-                value_template = templ['template']
+        value_template = self.__value_tpl_by_type.get(object_type_id, self.__value_tpl_default)
 
         # render template
         template_engine = TemplateEngine()
@@ -144,17 +273,119 @@ class ExportVariable:
 
 class ExportSource:
 
+    # Max number of changed and referencing objects of a delta run - more changes are exported by a full run
+    MAX_REFERENCE_IDS: int = 10000
+
     def __init__(self, job: ExportdJob, object_manager: CmdbObjectManager = None):
         self.__job = job
         self.__obm = object_manager
-        self.__objects = self.__fetch_objects()
+        self.__objects = None
 
     def get_objects(self):
+        if self.__objects is None:
+            self.__objects = self.__fetch_objects()
         return self.__objects
 
-    def __fetch_objects(self):
-        query = []
+    def get_changes(self, since: List[datetime]) -> Optional[Tuple[List[RenderResult], List[int]]]:
+        """
+        Get the objects which were changed or deleted since the watermarks of the sources.
+        Changed objects which do not match the source (anymore) are returned as deleted.
+        Objects whose template data contains a changed or deleted object of any type are returned as changed.
+
+        Args:
+            since: watermark of every job source
+
+        Returns:
+            Tuple of the changed objects and the ids of the deleted objects -
+            None if too many referenced objects changed and the source has to be exported completely
+        """
+        def _changed(watermark: datetime) -> dict:
+            return {'$or': [{'last_edit_time': {'$gte': watermark}}, {'creation_time': {'$gte': watermark}}]}
+
+        source_queries = self.__source_queries()
+        sources = self.__job.get_sources()
+        if not any(source_queries):
+            return [], []
+
+        # all objects which were changed or deleted since the oldest watermark - of all types
+        changed_types = {object_['public_id']: object_['type_id'] for object_ in self.__obm.dbm.find(
+            CmdbObject.COLLECTION, filter=_changed(min(since)), projection={'_id': 0, 'public_id': 1, 'type_id': 1})}
+        deleted_types = {}
+        for log in self.__obm.dbm.find(CmdbMetaLog.COLLECTION,
+                                       filter={'action': ObjectLogAction.DELETE.value,
+                                               'log_type': CmdbObjectLog.__name__,
+                                               'log_time': {'$gte': min(since)}},
+                                       projection={'_id': 0, 'object_id': 1, 'render_state': 1}):
+            try:
+                deleted_types[log['object_id']] = json.loads(log['render_state'])['type_information']['type_id']
+            except Exception:
+                deleted_types[log['object_id']] = None
+
+        # objects which render a changed object in their template data
+        referencing_ids = self.__referencing_ids(set(changed_types) | set(deleted_types))
+        if referencing_ids is None:
+            return None
+
+        query = [{'$and': [source_query, _changed(watermark)]}
+                 for queries, watermark in zip(source_queries, since) for source_query in queries]
+        if referencing_ids:
+            query += [{'$and': [source_query, {'public_id': {'$in': sorted(referencing_ids)}}]}
+                      for queries in source_queries for source_query in queries]
+        current_objects = self.__obm.get_objects_by(sort="public_id", **{'$or': query})
+
+        changed_ids = {object_['public_id'] for object_ in self.__obm.dbm.find(
+            CmdbObject.COLLECTION, filter={'$or': [{'$and': [{'type_id': source["type_id"]}, _changed(watermark)]}
+                                                   for source, watermark in zip(sources, since)]},
+            projection={'_id': 0, 'public_id': 1})}
+        deleted_ids = changed_ids - {object_.get_public_id() for object_ in current_objects}
+
+        # objects deleted from the types of the sources
+        type_ids = {source["type_id"] for source in sources}
+        deleted_ids.update(object_id for object_id, type_id in deleted_types.items()
+                           if type_id is None or type_id in type_ids)
+
+        return RenderList(current_objects, None).render_result_list(), sorted(deleted_ids)
+
+    def __referencing_ids(self, public_ids: Set[int]) -> Optional[Set[int]]:
+        """
+        Get the objects which reference one of the objects directly or over other objects -
+        up to the reference depth of the template data
+
+        Args:
+            public_ids: ids of the referenced objects
+
+        Returns:
+            ids of the referencing objects - None if more than MAX_REFERENCE_IDS objects are involved
+        """
+        if len(public_ids) > self.MAX_REFERENCE_IDS:
+            return None
+        ref_fields = {type_['public_id']: [field['name'] for field in type_.get('fields', [])
+                                           if field.get('type') == 'ref']
+                      for type_ in self.__obm.dbm.find(TypeModel.COLLECTION, filter={'fields.type': 'ref'},
+                                                       projection={'_id': 0, 'public_id': 1, 'fields': 1})}
+        referencing_ids = set()
+        level = set(public_ids)
+        for _ in range(ObjectTemplateDataCache.MAX_DEPTH):
+            if not level or not ref_fields:
+                break
+            # ref values can be stored as string
+            values = sorted(level) + [str(public_id) for public_id in sorted(level)]
+            query = {'$or': [{'type_id': type_id,
+                              'fields': {'$elemMatch': {'name': {'$in': names}, 'value': {'$in': values}}}}
+                             for type_id, names in ref_fields.items()]}
+            found = {object_['public_id'] for object_ in self.__obm.dbm.find(
+                CmdbObject.COLLECTION, filter=query, projection={'_id': 0, 'public_id': 1})}
+            level = found - referencing_ids - public_ids
+            referencing_ids.update(level)
+            if len(public_ids) + len(referencing_ids) > self.MAX_REFERENCE_IDS:
+                return None
+        return referencing_ids
+
+    def __source_queries(self) -> List[List[dict]]:
+        """Query clauses of every job source"""
+        source_queries = []
         for source in self.__job.get_sources():
+            query = []
             condition = []
             for con in source["condition"]:
                 if con["operator"] == "!=":
@@ -176,7 +407,11 @@ class ExportSource:
 
             if not source["condition"]:
                 query.append({'type_id': source["type_id"], 'active': {'$eq': True}})
+            source_queries.append(query)
+        return source_queries
 
+    def __fetch_objects(self):
+        query = [source_query for queries in self.__source_queries() for source_query in queries]
         current_objects = self.__obm.get_objects_by(sort="public_id", **{'$or': query})
         result = (RenderList(current_objects, None).render_result_list())
         return result
@@ -193,10 +428,79 @@ class ExportDestination:
     def get_external_system(self):
         return self.__external_system
 
+    def export(self, export_data: List[Tuple[RenderResult, dict]], deleted_ids: List[int] = None,
+               delta: bool = False) -> "ExportDestinationResult":
+        """
+        Export the objects to the external system.
+        Errors are not raised but returned with the result, so other destinations are not interrupted.
+
+        Args:
+            export_data: objects with their template data
+            deleted_ids: ids of the objects which were deleted since the last run - only for delta exports
+            delta: export only the changes instead of the complete object list
+
+        Returns:
+            ExportDestinationResult with the header, the message and the duration of the export
+        """
+        external_system = self.__external_system
+        name = type(external_system).__name__
+        start = time.perf_counter()
+        try:
+            if delta:
+                external_system.prepare_delta_export()
+                for cmdb_object, template_data in export_data:
+                    external_system.upsert_object(cmdb_object, template_data)
+                for object_id in deleted_ids or []:
+                    external_system.delete_object(object_id)
+                header = external_system.finish_delta_export()
+            else:
+                external_system.prepare_export()
+                for cmdb_object, template_data in export_data:
+                    external_system.add_object(cmdb_object, template_data)
+                header = external_system.finish_export()
+            return ExportDestinationResult(name, time.perf_counter() - start, header=header,
+                                           message=external_system.msg_string)
+        except Exception as err:
+            LOGGER.error(f'Export to destination {name} failed: {err}')
+            return ExportDestinationResult(name, time.perf_counter() - start, error=err,
+                                           message=list(err.args) or external_system.msg_string)
+        finally:
+            external_system.close()
+
+
+class ExportDestinationResult:
+    """Outcome of the export to a single destination"""
+
+    def __init__(self, name: str, duration: float, header: ExportdHeader = None, message=None,
+                 error: Exception = None):
+        """
+        Args:
+            name: class name of the external system
+            duration: export time in seconds
+            header: header of the export output
+            message: status message of the external system
+            error: exception if the export failed
+        """
+        self.name = name
+        self.duration = duration
+        self.header = header
+        self.message = message
+        self.error = error
+
 
 class ExternalSystem:
     parameters = {}
     variables = {}
+    # system can apply the changes since the last run - see `prepare_delta_export`
+    delta_support = False
+
+    # connection pool and retry policy of `create_http_session`
+    HTTP_POOL_SIZE = 10
+    HTTP_RETRIES = 3
+    HTTP_BACKOFF_FACTOR = 0.5
+    HTTP_RETRY_STATUS = (502, 503, 504)
+    # max number of parallel calls of `dispatch`
+    HTTP_WORKERS = 4
 
     def __init__(self, destination_parms, export_vars):
         # Set default if value is empty
@@ -211,6 +515,7 @@ class ExternalSystem:
         self._destination_parms = destination_parms
         self._export_vars = export_vars
         self.msg_string = ""
+        self._http_sessions: List[requests.Session] = []
 
     def prepare_export(self):
         pass
@@ -221,6 +526,69 @@ class ExternalSystem:
     def finish_export(self) -> ExportdHeader:
         pass
 
+    def prepare_delta_export(self):
+        """Start a delta export - only called if `delta_support` is set"""
+        pass
+
+    def upsert_object(self, cmdb_object, template_data):
+        """Create or replace an object which was changed since the last run"""
+        pass
+
+    def delete_object(self, object_id: int):
+        """Remove an object which was deleted since the last run or does not match the sources anymore"""
+        pass
+
+    def finish_delta_export(self) -> ExportdHeader:
+        pass
+
+    def create_http_session(self, auth=None, verify: bool = True) -> requests.Session:
+        """
+        Create a HTTP session which keeps the connections to the external system alive.
+        Failed connects and gateway errors are retried with an exponential backoff -
+        requests with non idempotent methods (POST) are not retried after they were sent.
+        The session is closed by `close` after the export.
+
+        Args:
+            auth: auth of all requests of the session
+            verify: verify the SSL certificate of the server
+
+        Returns:
+            requests.Session with a pooled adapter for http and https
+        """
+        retry = Retry(total=self.HTTP_RETRIES, backoff_factor=self.HTTP_BACKOFF_FACTOR,
+                      status_forcelist=self.HTTP_RETRY_STATUS, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.HTTP_POOL_SIZE, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.auth = auth
+        session.verify = verify
+        self._http_sessions.append(session)
+        return session
+
+    def dispatch(self, calls: List[Callable[[], Any]]) -> List[Any]:
+        """
+        Execute independent calls (e.g. REST requests) with at most `HTTP_WORKERS` in parallel.
+        All calls are finished before the first error is raised.
+
+        Args:
+            calls: functions without arguments
+
+        Returns:
+            List of the call results in the order of the calls
+        """
+        if len(calls) <= 1 or self.HTTP_WORKERS <= 1:
+            return [call() for call in calls]
+        with ThreadPoolExecutor(max_workers=min(self.HTTP_WORKERS, len(calls))) as executor:
+            futures = [executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """Release the resources of the export - called after every export, also if it failed"""
+        for session in self._http_sessions:
+            session.close()
+        self._http_sessions = []
+
     def error(self, msg):
         raise ExportJobConfigException(msg)
 
@@ -228,6 +596,16 @@ class ExternalSystem:
         self.msg_string = msg
 
 
+class ExportdDestinationError(CMDBError):
+    """Raised after the run if the export to one or more destinations failed"""
+
+    def __init__(self, results: List[ExportDestinationResult]):
+        self.results = results
+        self.message = 'Export failed for destinations: ' + \
+                       ', '.join(f'{result.name} ({result.error})' for result in results)
+        super(ExportdDestinationError, self).__init__()
+
+
 class ExportJobConfigException(CMDBError):
     def __init__(self, *args, **kwargs):
         Exception.__init__(self, *args, **kwargs)
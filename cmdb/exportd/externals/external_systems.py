@@ -136,6 +136,8 @@ class ExternalSystemOpenNMS(ExternalSystem):
         "longitude": 32
     }
 
+    delta_support = True
+
     def __init__(self, destination_parms, export_vars):
         super(ExternalSystemOpenNMS, self).__init__(destination_parms, export_vars)
         # init destination vars
@@ -149,6 +151,12 @@ class ExternalSystemOpenNMS(ExternalSystem):
         # init variables
         self.__timeout = 10
         self.__xml = None
+        self.__delta_nodes = []
+        self.__delta_deleted = []
+        self.__snmp_configs = []
+        # all requests share the connections of one session
+        self.__session = self.create_http_session(auth=(self._destination_parms["restuser"], self._destination_parms["restpassword"]),
+                                                  verify=False)
 
     def prepare_export(self):
         # check connection to OpenNMS
@@ -159,6 +167,34 @@ class ExternalSystemOpenNMS(ExternalSystem):
         self.__xml = ET.Element("model-import", attributes)
 
     def add_object(self, cmdb_object, template_data):
+        self.__xml.append(self.__create_node(cmdb_object, template_data))
+
+    def prepare_delta_export(self):
+        # check connection to OpenNMS
+        self.__onms_check_connection()
+        self.__delta_nodes = []
+        self.__delta_deleted = []
+
+    def upsert_object(self, cmdb_object, template_data):
+        self.__delta_nodes.append(self.__create_node(cmdb_object, template_data))
+
+    def delete_object(self, object_id: int):
+        self.__delta_deleted.append(object_id)
+
+    def finish_delta_export(self):
+        self.__onms_update_snmpconfs()
+        # nodes are independent of each other
+        calls = [lambda node_xml=node_xml: self.__onms_update_node(node_xml) for node_xml in self.__delta_nodes]
+        calls += [lambda foreign_id=foreign_id: self.__onms_delete_node(foreign_id) for foreign_id in self.__delta_deleted]
+        self.dispatch(calls)
+        self.__onms_sync_requisition()
+        # create result message
+        msg = "Delta export to OpenNMS finished. "
+        msg += "{} objects exported, {} objects removed. ".format(len(self.__obj_successful), len(self.__delta_deleted))
+        msg += "The following objects were exported with warnings: {}".format(self.__obj_warning)
+        self.set_msg(msg)
+
+    def __create_node(self, cmdb_object, template_data) -> ET.Element:
         # init error handling
         warning = False
 
@@ -224,8 +260,6 @@ class ExternalSystemOpenNMS(ExternalSystem):
             asset_xml_attr["name"] = asset
             asset_xml_attr["value"] = assets[asset]
             ET.SubElement(node_xml, "asset", asset_xml_attr)
-        # XML: append structure
-        self.__xml.append(node_xml)
 
         # update SNMP config if option is set
         if self.__snmp_export:
@@ -233,14 +267,16 @@ class ExternalSystemOpenNMS(ExternalSystem):
             snmp_community = str(self._export_vars.get("snmp_community", ExportVariable("snmp_community", "public")).get_value(cmdb_object, template_data))
             snmp_version = str(self._export_vars.get("snmp_version", ExportVariable("snmp_version", "v2c")).get_value(cmdb_object, template_data))
             if self.__check_ip(snmp_ip):
-                self.__onms_update_snmpconf_v12(snmp_ip, snmp_community, snmp_version)
+                self.__snmp_configs.append((snmp_ip, snmp_community, snmp_version))
 
         # update error counter
         self.__obj_successful.append(cmdb_object.object_information['object_id'])
         if warning:
             self.__obj_warning.append(cmdb_object.object_information['object_id'])
+        return node_xml
 
     def finish_export(self):
+        self.__onms_update_snmpconfs()
         self.__onms_update_requisition()
         self.__onms_sync_requisition()
         # create result message
@@ -252,7 +288,7 @@ class ExternalSystemOpenNMS(ExternalSystem):
     def __onms_check_connection(self):
         url = "{}/info".format(self._destination_parms["resturl"])
         try:
-            response = requests.get(url, auth=(self._destination_parms["restuser"], self._destination_parms["restpassword"]), verify=False, timeout=self.__timeout)
+            response = self.__session.get(url, timeout=self.__timeout)
             if response.status_code > 202:
                 self.error("Error communicating to OpenNMS: HTTP/{}".format(str(response.status_code)))
         except Exception:
@@ -266,24 +302,53 @@ class ExternalSystemOpenNMS(ExternalSystem):
             "Content-Type": "application/xml"
         }
         try:
-            response = requests.post(url, data=data, headers=headers, auth=(self._destination_parms["restuser"], self._destination_parms["restpassword"]),
-                                     verify=False, timeout=self.__timeout)
+            response = self.__session.post(url, data=data, headers=headers, timeout=self.__timeout)
             if response.status_code > 202:
                 self.error("Error communicating to OpenNMS: HTTP/{}".format(str(response.status_code)))
         except Exception:
             self.error("Can't connect to OpenNMS API")
         return True
 
+    def __onms_update_node(self, node_xml: ET.Element):
+        url = "{}/requisitions/{}/nodes".format(self._destination_parms["resturl"], self._destination_parms["requisition"])
+        data = ET.tostring(node_xml, encoding="utf-8", method="xml")
+        headers = {
+            "Content-Type": "application/xml"
+        }
+        try:
+            response = self.__session.post(url, data=data, headers=headers, timeout=self.__timeout)
+            if response.status_code > 204:
+                self.error("Error communicating to OpenNMS: HTTP/{}".format(str(response.status_code)))
+        except Exception:
+            self.error("Can't connect to OpenNMS API")
+        return True
+
+    def __onms_delete_node(self, foreign_id: int):
+        url = "{}/requisitions/{}/nodes/{}".format(self._destination_parms["resturl"], self._destination_parms["requisition"], foreign_id)
+        try:
+            response = self.__session.delete(url, timeout=self.__timeout)
+            # unknown nodes were never exported
+            if response.status_code > 204 and response.status_code != 404:
+                self.error("Error communicating to OpenNMS: HTTP/{}".format(str(response.status_code)))
+        except Exception:
+            self.error("Can't connect to OpenNMS API")
+        return True
+
     def __onms_sync_requisition(self):
         url = "{}/requisitions/{}/import".format(self._destination_parms["resturl"], self._destination_parms["requisition"])
         try:
-            response = requests.put(url, data="", auth=(self._destination_parms["restuser"], self._destination_parms["restpassword"]), verify=False, timeout=self.__timeout)
+            response = self.__session.put(url, data="", timeout=self.__timeout)
             if response.status_code > 202:
                 self.error("Error communicating to OpenNMS: HTTP/{}".format(str(response.status_code)))
         except Exception:
             self.error("Can't connect to OpenNMS API")
         return True
 
+    def __onms_update_snmpconfs(self):
+        # the SNMP configs of the nodes are sent in parallel
+        self.dispatch([lambda config=config: self.__onms_update_snmpconf_v12(*config) for config in self.__snmp_configs])
+        self.__snmp_configs = []
+
     def __onms_update_snmpconf_v12(self, ip, community, version="v2c", port="161"):
         # create XML
         snmp_config_xml = ET.Element("snmp-info")
@@ -305,8 +370,7 @@ class ExternalSystemOpenNMS(ExternalSystem):
             "Content-Type": "application/xml"
         }
         try:
-            response = requests.put(url, data=data, headers=headers, auth=(self._destination_parms["restuser"], self._destination_parms["restpassword"]),
-                                    verify=False, timeout=self.__timeout)
+            response = self.__session.put(url, data=data, headers=headers, timeout=self.__timeout)
             if response.status_code > 204:
                 self.error("Error communicating to OpenNMS: HTTP/{}".format(str(response.status_code)))
         except Exception:
@@ -366,9 +430,18 @@ class ExternalSystemCpanelDns(ExternalSystem):
         # SSL verify option
         self.__cpanel_api_ssl_verify = self._destination_parms.get("cpanelApiSslVerify")
 
+        # all API calls share the connections of one session
+        self.__session = self.create_http_session(auth=(self.__cpanel_api_user, self.__cpanel_api_password))
+        self.__session.headers.update({
+            'Authorization': 'WHM %s:%s' % (self.__cpanel_api_user, self.__cpanel_api_token),
+        })
+
         # get all existing DNS records from cPanel
         self.__existing_records = self.get_a_records(self.__domain_name)
         self.__created_records = {}
+        # changes are applied in finish_export
+        self.__records_to_delete = []
+        self.__records_to_add = []
 
     def add_object(self, cmdb_object, template_data):
         # get variables from object
@@ -385,23 +458,26 @@ class ExternalSystemCpanelDns(ExternalSystem):
             if self.__existing_records[hostname]["data"] != ip:
                 if hostname not in self.__created_records.keys():
                     # recreate entry
-                    self.delete_a_records(self.__domain_name, hostname)
-                    self.add_a_record(self.__domain_name, hostname, ip)
+                    self.__records_to_delete.append(hostname)
+                    self.__records_to_add.append((hostname, ip))
 
             # delete entry from exitsing records array
             del self.__existing_records[hostname]
         else:
             # if not create a new one
             if hostname not in self.__created_records.keys():
-                self.add_a_record(self.__domain_name, hostname, ip)
+                self.__records_to_add.append((hostname, ip))
 
         # save to created records
         self.__created_records[hostname] = ip
 
     def finish_export(self):
-        # delete all DNS A records that does not exist in DATAGERRY
-        for hostname in self.__existing_records:
-            self.delete_a_records(self.__domain_name, hostname)
+        # delete all changed DNS A records and all that does not exist in DATAGERRY
+        self.__records_to_delete.extend(self.__existing_records)
+        self.__remove_a_records(self.__domain_name, self.__records_to_delete)
+        # add the new records - they do not depend on each other
+        self.dispatch([lambda hostname=hostname, ip=ip: self.add_a_record(self.__domain_name, hostname, ip)
+                       for hostname, ip in self.__records_to_add])
 
     def get_a_records(self, cur_domain: str):
         """
@@ -454,24 +530,13 @@ class ExternalSystemCpanelDns(ExternalSystem):
         json_result = {}
 
         try:
-            # curl request
-            __session__ = requests.Session()
-            __session__.auth = (self.__cpanel_api_user, self.__cpanel_api_password)
-
-            headers = {
-                'Authorization': 'WHM %s:%s' % (self.__cpanel_api_user, self.__cpanel_api_token),
-            }
             url = self.__cpanel_api_url + url
-            response = requests.get(url,
-                                    headers=headers,
-                                    auth=(self.__cpanel_api_user, self.__cpanel_api_password),
-                                    )
+            response = self.__session.get(url)
 
             # If the response was successful, no Exception will be raised
             response.raise_for_status()
             # get JSON data
             json_result = response.json()
-            __session__.close()
         except HTTPError as http_err:
             self.error(f'HTTP error occurred: {http_err}')
         except Exception as err:
@@ -516,6 +581,26 @@ class ExternalSystemCpanelDns(ExternalSystem):
                 url_parameters += "&domain={}&line={}".format(cur_domain, str(records[r_name]['line']))
                 self.get_data(url_parameters)
 
+    def __remove_a_records(self, cur_domain, hostnames):
+        """
+        Removes the A records of all given hosts with one zone lookup
+        Args:
+            cur_domain:     domain for removing the records
+            hostnames:      host parts
+
+        Returns:
+
+        """
+        if not hostnames:
+            return
+        records = self.get_a_records(cur_domain)
+        lines = [int(records[r_name]['line']) for r_name in set(hostnames) if r_name in records]
+        # a removed record shifts the line numbers of all following records - so start at the end of the zone
+        for line in sorted(lines, reverse=True):
+            url_parameters = "cpanel_jsonapi_module=ZoneEdit&cpanel_jsonapi_func=remove_zone_record"
+            url_parameters += "&domain={}&line={}".format(cur_domain, line)
+            self.get_data(url_parameters)
+
     def format_hostname(self, value: str) -> str:
         """
     Checks, if a hostname has the correct format.
@@ -752,6 +837,10 @@ class ExternalSystemGenericRestCall(ExternalSystem):
         self.__rows = []
         if not (self.__url and self.__timeout):
             self.error("missing parameters")
+        auth = None
+        if self.__username:
+            auth = (self.__username, self.__password)
+        self.__session = self.create_http_session(auth=auth, verify=False)
 
     def prepare_export(self):
         pass
@@ -772,12 +861,8 @@ class ExternalSystemGenericRestCall(ExternalSystem):
         headers = {
             "Content-Type": "application/json"
         }
-        auth = None
-        if self.__username:
-            auth = (self.__username, self.__password)
         try:
-            response = requests.post(self.__url, data=json_data, headers=headers, auth=auth, verify=False,
-                                     timeout=self.__timeout)
+            response = self.__session.post(self.__url, data=json_data, headers=headers, timeout=self.__timeout)
             if response.status_code > 202:
                 self.error("Error communicating to REST endpoint: HTTP/{}".format(str(response.status_code)))
         except requests.exceptions.ConnectionError:
@@ -819,9 +904,16 @@ class ExternalSystemMySQLDB(ExternalSystem):
         {"name": "dbserver", "required": True, "description": "database server", "default": "localhost"},
         {"name": "database", "required": True, "description": "database name", "default": "db"},
         {"name": "username", "required": False, "description": "username for database server", "default": "user"},
-        {"name": "password", "required": False, "description": "password for database server", "default": "password"}
+        {"name": "password", "required": False, "description": "password for database server", "default": "password"},
+        {"name": "objectIdColumn", "required": False, "description": "column of all tables which holds the object id. If set, only changed objects are exported", "default": ""},
+        {"name": "batchSize", "required": False, "description": "number of rows which are inserted with one statement", "default": "1000"},
+        {"name": "syncMode", "required": False, "description": "delete: replace the table content within one transaction, staging: fill a copy of each table and swap it in with an atomic rename", "default": "delete"}
     ]
 
+    # suffixes of the tables which are used by the staging sync mode
+    STAGING_SUFFIX = "_dg_staging"
+    OLD_SUFFIX = "_dg_old"
+
     variables = [
         {
             "name": "table_<name>",
@@ -843,6 +935,19 @@ class ExternalSystemMySQLDB(ExternalSystem):
                 self.__tables.append(table_name)
                 self.__table_data[table_name] = []
 
+        # delta exports replace the rows of the changed objects by the object id column
+        self.__object_id_column = str(self._destination_parms.get("objectIdColumn") or "").strip()
+        self.delta_support = bool(self.__object_id_column)
+        self.__changed_ids = []
+
+        try:
+            self.__batch_size = max(1, int(self._destination_parms.get("batchSize")))
+        except (TypeError, ValueError):
+            self.error("batchSize must be a number")
+        self.__sync_mode = str(self._destination_parms.get("syncMode")).strip().lower()
+        if self.__sync_mode not in ["delete", "staging"]:
+            self.error("syncMode must be delete or staging")
+
     def prepare_export(self):
         pass
 
@@ -852,14 +957,67 @@ class ExternalSystemMySQLDB(ExternalSystem):
             varname = "table_" + table
             self.__table_data[table].append(str(self._export_vars.get(varname, ExportVariable(varname, "")).get_value(cmdb_object, template_data)))
 
+    def prepare_delta_export(self):
+        pass
+
+    def upsert_object(self, cmdb_object, template_data):
+        self.__changed_ids.append(cmdb_object.object_information['object_id'])
+        self.add_object(cmdb_object, template_data)
+
+    def delete_object(self, object_id: int):
+        self.__changed_ids.append(object_id)
+
+    def finish_delta_export(self):
+        db_connection = self.__connect()
+
+        # handle all database changes within one transaction
+        # if something goes wrong, a rollback will be done
+        try:
+            # beginn transaction
+            db_connection.begin()
+
+            # remove the rows of all changed and deleted objects
+            for start in range(0, len(self.__changed_ids), self.__batch_size):
+                batch = self.__changed_ids[start:start + self.__batch_size]
+                placeholders = ", ".join(["%s"] * len(batch))
+                for table in self.__tables:
+                    with db_connection.cursor() as cursor:
+                        sql = "DELETE FROM {} WHERE {} IN ({})".format(table, self.__object_id_column, placeholders)
+                        cursor.execute(sql, batch)
+
+            # insert the current rows of the changed objects
+            for table in self.__tables:
+                self.__insert_rows(db_connection, table, self.__table_data[table])
+
+            # close transaction
+            db_connection.commit()
+
+        finally:
+            db_connection.close()
+
+    def __connect(self):
+        return pymysql.connect(host=self._destination_parms.get("dbserver"),
+                               user=self._destination_parms.get("username"),
+                               password=self._destination_parms.get("password"),
+                               db=self._destination_parms.get("database"),
+                               cursorclass=pymysql.cursors.DictCursor,
+                               autocommit=False)
+
+    def __insert_rows(self, db_connection, table: str, rows: list):
+        """Insert the rows with multi-row INSERT statements of `batchSize` rows"""
+        for start in range(0, len(rows), self.__batch_size):
+            batch = rows[start:start + self.__batch_size]
+            with db_connection.cursor() as cursor:
+                sql = "INSERT INTO {} VALUES {}".format(table, ", ".join("({})".format(data) for data in batch))
+                cursor.execute(sql)
+
     def finish_export(self):
+        if self.__sync_mode == "staging":
+            self.__finish_export_staging()
+            return
+
         # connect to database
-        db_connection = pymysql.connect(host=self._destination_parms.get("dbserver"),
-                                        user=self._destination_parms.get("username"),
-                                        password=self._destination_parms.get("password"),
-                                        db=self._destination_parms.get("database"),
-                                        cursorclass=pymysql.cursors.DictCursor,
-                                        autocommit=False)
+        db_connection = self.__connect()
 
         # handle all database changes within one transaction
         # if something goes wrong, a rollback will be done
@@ -875,13 +1033,45 @@ class ExternalSystemMySQLDB(ExternalSystem):
 
             # insert new data in all tables
             for table in self.__tables:
-                for data in self.__table_data[table]:
-                    with db_connection.cursor() as cursor:
-                        sql = "INSERT INTO {} VALUES({})".format(table, data)
-                        cursor.execute(sql)
+                self.__insert_rows(db_connection, table, self.__table_data[table])
 
             # close transaction
             db_connection.commit()
 
         finally:
             db_connection.close()
+
+    def __finish_export_staging(self):
+        """
+        Fill an empty copy of every table and swap all copies in with one RENAME TABLE statement.
+        The tables are never empty for readers - the old content stays visible until the rename.
+        """
+        db_connection = self.__connect()
+        staging_tables = ["{}{}".format(table, self.STAGING_SUFFIX) for table in self.__tables]
+        old_tables = ["{}{}".format(table, self.OLD_SUFFIX) for table in self.__tables]
+        try:
+            # create empty staging copies of the tables - leftovers of aborted runs are removed
+            with db_connection.cursor() as cursor:
+                for table, staging_table, old_table in zip(self.__tables, staging_tables, old_tables):
+                    cursor.execute("DROP TABLE IF EXISTS {}, {}".format(staging_table, old_table))
+                    cursor.execute("CREATE TABLE {} LIKE {}".format(staging_table, table))
+
+            # insert new data in all staging tables
+            db_connection.begin()
+            for table, staging_table in zip(self.__tables, staging_tables):
+                self.__insert_rows(db_connection, staging_table, self.__table_data[table])
+            db_connection.commit()
+
+            # swap all tables at once and remove the old content
+            with db_connection.cursor() as cursor:
+                renames = ["{} TO {}, {} TO {}".format(table, old_table, staging_table, table)
+                           for table, staging_table, old_table in zip(self.__tables, staging_tables, old_tables)]
+                cursor.execute("RENAME TABLE {}".format(", ".join(renames)))
+                cursor.execute("DROP TABLE IF EXISTS {}".format(", ".join(old_tables)))
+        except Exception:
+            db_connection.rollback()
+            with db_connection.cursor() as cursor:
+                cursor.execute("DROP TABLE IF EXISTS {}".format(", ".join(staging_tables)))
+            raise
+        finally:
+            db_connection.close()
@@ -19,7 +19,6 @@ from cmdb.exportd import ExportdJob
 from cmdb.manager.managers import ManagerBase as ExportDManager
 from cmdb.framework.results import IterationResult
 from cmdb.manager import ManagerIterationError, ManagerGetError
-from cmdb.search import Pipeline
 
 
 class ExportDJobManager(ExportDManager):
@@ -44,19 +43,15 @@ class ExportDJobManager(ExportDManager):
             skip: number of elements to skip first
             sort: sort field
             order: sort order
+            count (optional): `CountMode` of the total
 
         Returns:
             IterationResult: Instance of IterationResult with generic ExportdJob.
         """
 
         try:
-            query: Pipeline = self.builder.build(filter=filter, limit=limit, skip=skip, sort=sort, order=order)
-            count_query: Pipeline = self.builder.count(filter=filter)
-            aggregation_result = list(self._aggregate(self.collection, query))
-            total_cursor = self._aggregate(self.collection, count_query)
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            aggregation_result, total = self._iterate(self.builder, filter=filter, limit=limit, skip=skip,
+                                                      sort=sort, order=order, count=kwargs.get('count'))
         except ManagerGetError as err:
             raise ManagerIterationError(err=err)
         iteration_result: IterationResult[ExportdJob] = IterationResult(aggregation_result, total)
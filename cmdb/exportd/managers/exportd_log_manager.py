@@ -19,7 +19,6 @@ from cmdb.exportd.exportd_logs.exportd_log import ExportdJobLog
 from cmdb.manager.managers import ManagerBase as ExportDManager
 from cmdb.framework.results import IterationResult
 from cmdb.manager import ManagerIterationError, ManagerGetError
-from cmdb.search import Pipeline
 
 
 class ExportDLogManager(ExportDManager):
@@ -44,19 +43,15 @@ class ExportDLogManager(ExportDManager):
             skip: number of elements to skip first
             sort: sort field
             order: sort order
+            count (optional): `CountMode` of the total
 
         Returns:
             IterationResult: Instance of IterationResult with generic ExportdJobLog.
         """
 
         try:
-            query: Pipeline = self.builder.build(filter=filter, limit=limit, skip=skip, sort=sort, order=order)
-            count_query: Pipeline = self.builder.count(filter=filter)
-            aggregation_result = list(self._aggregate(self.collection, query))
-            total_cursor = self._aggregate(self.collection, count_query)
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            aggregation_result, total = self._iterate(self.builder, filter=filter, limit=limit, skip=skip,
+                                                      sort=sort, order=order, count=kwargs.get('count'))
         except ManagerGetError as err:
             raise ManagerIterationError(err=err)
         iteration_result: IterationResult[ExportdJobLog] = IterationResult(aggregation_result, total)
@@ -17,14 +17,19 @@
 import logging
 import cmdb.process_management.service
 import cmdb.exportd.exporter_base
-import time
-import sched
 
-from threading import Thread
+from queue import Queue
+from threading import Thread, Lock
 from datetime import datetime
+from typing import Dict, List, Set
+
+from cmdb.event_management.event import Event
+from cmdb.exportd.exporter_base import ExportdDestinationError
+from cmdb.exportd.exportd_job.exportd_job_index import ExportdJobIndex
 from cmdb.exportd.exportd_job.exportd_job_manager import ExportdJobManagement
 from cmdb.exportd.exportd_job.exportd_job import ExecuteState
 from cmdb.database.managers import DatabaseManagerMongo
+from cmdb.utils.debounce import Debouncer
 from cmdb.utils.system_config import SystemConfigReader
 from cmdb.exportd.exportd_logs.exportd_log_manager import ExportdLogManager
 from cmdb.exportd.exportd_logs.exportd_log_manager import LogManagerInsertError, LogAction, ExportdJobLog
@@ -32,10 +37,36 @@ from cmdb.user_management.managers.user_manager import UserManager
 
 
 LOGGER = logging.getLogger(__name__)
-scheduler = sched.scheduler(time.time, time.sleep)
+
+
+def merge_trigger_events(pending: Event, event: Event) -> Event:
+    """
+    Merge two trigger events of the same job run - a manual run stays a full sync of its requester
+
+    Args:
+        pending: already queued trigger event
+        event: new trigger event
+
+    Returns:
+        the manual run event if one of both is a manual run, otherwise the latest event
+    """
+    if pending is not None and pending.get_type() == "cmdb.exportd.run_manual" \
+            and event.get_type() != "cmdb.exportd.run_manual":
+        return pending
+    return event
 
 
 class ExportdService(cmdb.process_management.service.AbstractCmdbService):
+
+    # Number of jobs which are executed concurrently - `workers` of the config section `Exportd`
+    DEFAULT_WORKERS: int = 4
+    # Seconds without a new object change before a job runs - `event_quiet_period`
+    DEFAULT_EVENT_QUIET_PERIOD: float = 5
+    # Max seconds between the first object change and the job run - `event_max_delay`
+    DEFAULT_EVENT_MAX_DELAY: float = 60
+    # Seconds before a job runs after it was activated
+    JOB_CHANGE_QUIET_PERIOD: float = 10
+
     def __init__(self):
         super(ExportdService, self).__init__()
         self._name = "exportd"
@@ -44,22 +75,45 @@ class ExportdService(cmdb.process_management.service.AbstractCmdbService):
                             "cmdb.core.objecttype.#",
                             "cmdb.core.objecttypes.#",
                             "cmdb.exportd.#"]
+        self.executor: ExportdJobExecutor = None
+        self.job_index: ExportdJobIndex = None
+        self.debouncer: Debouncer = None
 
     def _run(self):
         LOGGER.info("{}: start run".format(self._name))
+        scr = SystemConfigReader()
+        database_manager = DatabaseManagerMongo(**scr.get_all_values_from_section('Database'))
+        self.executor = ExportdJobExecutor(database_manager=database_manager,
+                                           workers=int(self.__get_option(scr, 'workers', self.DEFAULT_WORKERS)))
+        self.job_index = ExportdJobIndex(self.executor.exportd_job_manager)
+        self.debouncer = Debouncer(
+            quiet_period=float(self.__get_option(scr, 'event_quiet_period', self.DEFAULT_EVENT_QUIET_PERIOD)),
+            max_delay=float(self.__get_option(scr, 'event_max_delay', self.DEFAULT_EVENT_MAX_DELAY)),
+            merge=merge_trigger_events)
+        self.executor.start()
         while not self._event_shutdown.is_set():
-            scheduler.run()
-            time.sleep(1)
+            for job_id, event in self.debouncer.pop_due():
+                self.executor.submit(job_id, event)
+            self.debouncer.wait(1)
+        self.executor.shutdown()
         LOGGER.info("{}: end run".format(self._name))
 
+    @staticmethod
+    def __get_option(scr: SystemConfigReader, name: str, default):
+        try:
+            return scr.get_value(name, 'Exportd', default)
+        except Exception:
+            return default
+
     def _handle_event(self, event):
         LOGGER.debug("event received: {}".format(event.get_type()))
         self.handler(event)
 
-    def __schedule_job(self, event):
-        pass
-
     def handler(self, event):
+        if self.debouncer is None:
+            LOGGER.warning(f'Exportd service not started - event {event.get_type()} is dropped')
+            return
+
         # get type of Event
         event_type = event.get_type()
 
@@ -72,108 +126,160 @@ class ExportdService(cmdb.process_management.service.AbstractCmdbService):
         # get Exportd Job state
         event_param_state = event.get_param("active")
 
-        for q in scheduler.queue:
-            if "cmdb.core.object" in event_type and event_param_type_id == q.argument[0].get_param("type_id"):
-                scheduler.cancel(q)
-
-            elif "cmdb.exportd" in event.get_type() and event_param_id == q.argument[0].get_param("id"):
-                scheduler.cancel(q)
-
-        if event_param_state:
-            scheduler.enter(10, 1, self.start_thread, argument=(event,))
-        elif "cmdb.exportd.deleted" != event_type and "cmdb.core.object.deleted" != event_type:
-            scheduler.enter(5, 1, self.start_thread, argument=(event, ))
-
-    @staticmethod
-    def start_thread(event):
-        event_type = event.get_type()
-        # start new threads
-
-        if "cmdb.exportd.run_manual" == event_type:
-            new_thread = ExportdThread(event=event, state=True)
-            new_thread.start()
-
-        elif "cmdb.core.object" in event_type:
-            new_thread = ExportdThread(event=event, state=False)
-            new_thread.start()
-
-        elif "cmdb.exportd" in event_type:
-            new_thread = ExportdThread(event=event, state=event.get_param("active"))
-            new_thread.start()
-
-
-class ExportdThread(Thread):
+        try:
+            if "cmdb.exportd.run_manual" == event_type:
+                self.debouncer.trigger(event_param_id, event)
+            elif "cmdb.exportd" in event_type:
+                # job definitions changed
+                self.job_index.invalidate()
+                if event_param_state:
+                    self.debouncer.trigger(event_param_id, event, quiet_period=self.JOB_CHANGE_QUIET_PERIOD)
+                else:
+                    self.debouncer.cancel(event_param_id)
+            elif "cmdb.core.object" in event_type and event_param_type_id \
+                    and "cmdb.core.object.deleted" != event_type:
+                for job_id in self.job_index.get_event_jobs(event_param_type_id):
+                    self.debouncer.trigger(job_id, event)
+        except Exception as err:
+            LOGGER.error(err)
 
-    def __init__(self, event, state=False):
-        super(ExportdThread, self).__init__()
-        self.job = None
-        self.job_id = event.get_param("id")
-        self.type_id = event.get_param("type_id")
-        self.user_id = event.get_param("user_id")
-        self.event = event
-        self.is_active = state
-        self.exception_handling = None
 
-        scr = SystemConfigReader()
-        database_options = scr.get_all_values_from_section('Database')
-        self.__dbm = DatabaseManagerMongo(
-            **database_options
-        )
-        self.log_manager = ExportdLogManager(
-            database_manager=self.__dbm)
-        self.exportd_job_manager = ExportdJobManagement(database_manager=self.__dbm)
-        self.user_manager = UserManager(database_manager=self.__dbm)
-
-    def run(self):
-        try:
-            if self.type_id:
-                for obj in self.exportd_job_manager.get_job_by_event_based(True):
-                    if next((item for item in obj.get_sources() if item["type_id"] == self.type_id), None):
-                        if obj.get_active() and obj.scheduling["event"]["active"]:
-                            self.job = obj
-                            self.worker()
-            elif self.is_active:
-                self.job = self.exportd_job_manager.get_job(self.job_id)
-                self.worker()
-        except Exception as ex:
-            LOGGER.error(ex)
-            return ex
-
-    def worker(self):
+class ExportdJobExecutor:
+    """
+    Fixed size pool of worker threads which execute the exportd jobs.
+    All workers share one database manager. A job runs at most once at a time -
+    triggers of a job which is already queued are merged into the queued run,
+    triggers of a running job are merged into a single follow-up run.
+    """
+
+    def __init__(self, database_manager: DatabaseManagerMongo, workers: int = 4):
+        """
+        Constructor of `ExportdJobExecutor`
+
+        Args:
+            database_manager: Database connection which is shared by all workers
+            workers: Number of jobs which are executed concurrently
+        """
+        self.database_manager = database_manager
+        self.workers = max(1, workers)
+        self.log_manager = ExportdLogManager(database_manager=database_manager)
+        self.exportd_job_manager = ExportdJobManagement(database_manager=database_manager)
+        self.user_manager = UserManager(database_manager=database_manager)
+
+        self._queue: Queue = Queue()
+        self._lock = Lock()
+        # merged trigger event of every queued job
+        self._pending: Dict[int, Event] = {}
+        self._running: Set[int] = set()
+        self._threads: List[Thread] = []
+
+    def start(self):
+        """Start the worker threads"""
+        for index in range(self.workers):
+            thread = Thread(target=self.__work, name=f'exportd-worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def shutdown(self, timeout: float = 5):
+        """Stop the workers after their current job - queued runs are dropped"""
+        with self._lock:
+            self._pending.clear()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, job_id: int, event: Event) -> bool:
+        """
+        Queue a run of a job
+
+        Args:
+            job_id: public id of the job
+            event: trigger event - logged and used for the user of the run
+
+        Returns:
+            False if the trigger was merged into an already queued run
+        """
+        with self._lock:
+            merged = job_id in self._pending
+            self._pending[job_id] = merge_trigger_events(self._pending.get(job_id), event)
+            if merged:
+                LOGGER.debug(f'Exportd job {job_id} already queued - trigger {event.get_type()} merged')
+                return False
+            if job_id not in self._running:
+                self._queue.put(job_id)
+            return True
+
+    def __work(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            with self._lock:
+                event = self._pending.pop(job_id, None)
+                if event is None:
+                    continue
+                self._running.add(job_id)
+            try:
+                self.run_job(job_id, event)
+            except Exception as err:
+                LOGGER.error(err)
+            finally:
+                with self._lock:
+                    self._running.discard(job_id)
+                    # triggers during the run are executed in one follow-up run
+                    if job_id in self._pending:
+                        self._queue.put(job_id)
+
+    def run_job(self, job_id: int, event: Event):
+        """
+        Execute a job and update its state and logs
+
+        Args:
+            job_id: public id of the job
+            event: trigger event
+        """
+        job = self.exportd_job_manager.get_job(job_id)
+        user_id = event.get_param("user_id")
         cur_user = None
+        exception_handling = None
         try:
             # update job for UI
-            self.job.state = ExecuteState.RUNNING.name
-            self.job.last_execute_date = datetime.utcnow()
+            job.state = ExecuteState.RUNNING.name
+            job.last_execute_date = datetime.utcnow()
 
             # get current user
-            cur_user = self.user_manager.get(self.user_id)
+            cur_user = self.user_manager.get(user_id)
 
-            self.exportd_job_manager.update_job(self.job, self.user_manager.get(self.user_id), event_start=False)
+            self.exportd_job_manager.update_job(job, cur_user, event_start=False)
             # execute Exportd job
-            job = cmdb.exportd.exporter_base.ExportdManagerBase(self.job)
-            job.execute(self.event, cur_user.get_public_id(), cur_user.get_display_name())
-
+            manager = cmdb.exportd.exporter_base.ExportdManagerBase(job, database_manager=self.database_manager)
+            # manual runs resync the complete job
+            manager.execute(event, cur_user.get_public_id(), cur_user.get_display_name(),
+                            full_sync=event.get_type() == "cmdb.exportd.run_manual")
+
+        except ExportdDestinationError as err:
+            # the failed destinations are already logged by the export
+            LOGGER.error(err.message)
+            exception_handling = err
         except Exception as err:
             LOGGER.error(err)
-            self.exception_handling = err
+            exception_handling = err
             # Generate Error log
             try:
                 log_params = {
-                    'job_id': self.job.get_public_id(),
+                    'job_id': job.get_public_id(),
                     'state': False,
                     'user_id': cur_user.get_public_id(),
                     'user_name': cur_user.get_display_name(),
-                    'event': self.event.get_type(),
+                    'event': event.get_type(),
                     'message': ['Successful'] if not err else err.args,
                 }
                 self.log_manager.insert_log(action=LogAction.EXECUTE, log_type=ExportdJobLog.__name__, **log_params)
-            except LogManagerInsertError as err:
+            except (LogManagerInsertError, AttributeError) as err:
                 LOGGER.error(err)
         finally:
             # update job for UI
-            self.job.state = ExecuteState.SUCCESSFUL.name if not self.exception_handling else ExecuteState.FAILED.name
-            self.exportd_job_manager.update_job(self.job, self.user_manager.get(self.user_id), event_start=False)
-
-
-
+            job.state = ExecuteState.SUCCESSFUL.name if not exception_handling else ExecuteState.FAILED.name
+            self.exportd_job_manager.update_job(job, self.user_manager.get(user_id), event_start=False)
@@ -19,12 +19,14 @@ import io
 import json
 import re
 import tempfile
-import xml.dom.minidom
-import xml.etree.ElementTree as ET
+import textwrap
 import zipfile
 import openpyxl
 
-from typing import List
+from xml.sax.saxutils import XMLGenerator
+from xml.sax.xmlreader import AttributesImpl
+
+from typing import List, Iterable, Iterator
 
 from cmdb.utils import json_encoding
 from cmdb.utils.helpers import load_class
@@ -51,6 +53,9 @@ class ZipExportType(BaseExporterFormat):
     ICON = "file-archive"
     DESCRIPTION = "Export Zipped Files"
     ACTIVE = True
+    STREAMING = True
+    # Number of bytes which are read from the saved zip file per chunk
+    CHUNK_SIZE = 64 * 1024
 
     def export(self, data: List[RenderResult], *args):
 
@@ -64,41 +69,56 @@ class ZipExportType(BaseExporterFormat):
         Returns:
             zip file containing object files separated by types
         """
-
-        # check what export type is requested and intitializes a new zip file in memory
-        export_type = load_class(f'cmdb.exporter.exporter_base.{args[0].get("classname", "")}')()
         zipped_file = io.BytesIO()
+        for chunk in self.export_stream(data, *args):
+            zipped_file.write(chunk)
 
-        # Build .zip file
-        with zipfile.ZipFile(zipped_file, "a", zipfile.ZIP_DEFLATED, False) as f:
+        # returns zipped file
+        zipped_file.seek(0)
+        return zipped_file
 
-            # Enters loop until the object list is empty
-            while len(data) > 0:
+    def export_stream(self, data: Iterable[RenderResult], *args) -> Iterator[bytes]:
 
-                # Set what type the loop filters to and makes an empty list
-                type_id = data[len(data) - 1].type_information['type_id']
-                type_name = data[len(data) - 1].type_information['type_name']
-                type_list = []
+        """
+        Export a zip file as chunks, containing the object list sorted by type in several files.
+        The objects are grouped by type in one pass and every type file is streamed into its zip member.
 
-                # Filters object list to the current type_id and inserts it into type_list
-                # When an object is inserted into type_list it gets deleted from object_list
-                for i in range(len(data) - 1, -1, -1):
-                    if data[i].type_information['type_id'] == type_id:
-                        type_list.append(data[i])
-                        del data[i]
+        Args:
+            data: Objects to be exported
+            args: the filetype with which the objects are stored
 
-                # Runs the requested export function and returns the output in the export variable
-                export = export_type.export(type_list)
+        Returns:
+            Generator of zip file chunks
+        """
 
-                # check if export output is a string, bytes or a file and inserts it into the zip file
-                if isinstance(export, str) or isinstance(export, bytes):
-                    f.writestr((type_name + "_ID_" + str(type_id) + "." + export_type.FILE_EXTENSION).format(i), export)
-                else:
-                    f.writestr((type_name + "_ID_" + str(type_id) + "." + export_type.FILE_EXTENSION).format(i), export.getvalue())
+        # check what export type is requested
+        export_type = load_class(f'cmdb.exporter.exporter_base.{args[0].get("classname", "")}')()
 
-        # returns zipped file
-        zipped_file.seek(0)
-        return zipped_file
+        # group the objects by type
+        type_groups = {}
+        for obj in data:
+            type_groups.setdefault(obj.type_information['type_id'], []).append(obj)
+
+        with tempfile.TemporaryFile() as tmp:
+            # Build .zip file
+            with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED, True) as f:
+                while type_groups:
+                    # release every group once it is written
+                    type_id, type_list = type_groups.popitem()
+                    type_name = type_list[0].type_information['type_name']
+                    member_name = type_name + "_ID_" + str(type_id) + "." + export_type.FILE_EXTENSION
+
+                    # Runs the requested export function and writes the output chunks into the zip member
+                    with f.open(member_name, 'w', force_zip64=True) as member:
+                        for chunk in export_type.export_stream(type_list):
+                            # check if export output is a string, bytes or a file
+                            if not isinstance(chunk, (str, bytes)):
+                                chunk = chunk.getvalue()
+                            member.write(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+
+            tmp.seek(0)
+            for chunk in iter(lambda: tmp.read(self.CHUNK_SIZE), b''):
+                yield chunk
 
 
 class CsvExportType(BaseExporterFormat):
@@ -109,6 +129,9 @@ class CsvExportType(BaseExporterFormat):
     ICON = "file-csv"
     DESCRIPTION = "Export as CSV (only of the same type)"
     ACTIVE = True
+    STREAMING = True
+    # Number of characters which are collected before a chunk is yielded
+    CHUNK_SIZE = 64 * 1024
 
     def export(self, data: List[RenderResult], *args):
 
@@ -120,11 +143,26 @@ class CsvExportType(BaseExporterFormat):
         Returns:
             Csv file containing the data
         """
+        csv_file = io.StringIO()
+        for chunk in self.export_stream(data, *args):
+            csv_file.write(chunk)
+        csv_file.seek(0)
+        return csv_file
+
+    def export_stream(self, data: Iterable[RenderResult], *args) -> Iterator[str]:
+
+        """ Exports data as .csv file chunks
+
+        Args:
+            data: The objects to be exported - only one object is hold in memory at a time
+
+        Returns:
+            Generator of csv text chunks
+        """
 
         # init values
         header = ['public_id', 'active']
-        columns = [] if not data else [x['name'] for x in data[0].fields]
-        rows = []
+        columns = None
         view = 'native'
         current_type_id = None
 
@@ -135,10 +173,15 @@ class CsvExportType(BaseExporterFormat):
             header = _meta['header']
             columns = _meta['columns']
 
+        csv_file = io.StringIO()
+        writer = csv.writer(csv_file, dialect=csv.excel)
         for obj in data:
             # get type from first object and setup csv header
             if current_type_id is None:
                 current_type_id = obj.type_information['type_id']
+                if columns is None:
+                    columns = [x['name'] for x in obj.fields]
+                writer.writerow([*header, *columns])
 
             # throw Exception if objects of different type are detected
             if current_type_id != obj.type_information['type_id']:
@@ -157,9 +200,16 @@ class CsvExportType(BaseExporterFormat):
                 row.append(str(obj.object_information[head]))
             for name in columns:
                 row.append(str(obj_fields_dict.get(name, None)))
-            rows.append(row)
+            writer.writerow(row)
 
-        return self.csv_writer([*header, *columns], rows)
+            if csv_file.tell() >= self.CHUNK_SIZE:
+                yield csv_file.getvalue()
+                csv_file.seek(0)
+                csv_file.truncate(0)
+
+        if current_type_id is None:
+            writer.writerow([*header, *(columns or [])])
+        yield csv_file.getvalue()
 
     def csv_writer(self, header, rows, dialect=csv.excel):
 
@@ -180,6 +230,9 @@ class JsonExportType(BaseExporterFormat):
     ICON = "file-code"
     DESCRIPTION = "Export as JSON"
     ACTIVE = True
+    STREAMING = True
+    # Number of characters which are collected before a chunk is yielded
+    CHUNK_SIZE = 64 * 1024
 
     def export(self, data: List[RenderResult], *args):
 
@@ -191,21 +244,44 @@ class JsonExportType(BaseExporterFormat):
         Returns:
             Json file containing the data
         """
+        return ''.join(self.export_stream(data, *args))
+
+    def export_stream(self, data: Iterable[RenderResult], *args) -> Iterator[str]:
+
+        """Exports data as .json file chunks.
+        The output is the same as a `json.dumps` of the complete list with an indent of 2.
+
+        Args:
+            data: The objects to be exported - only one object is hold in memory at a time
+
+        Returns:
+            Generator of json text chunks
+        """
 
         # init values
         header = ['public_id', 'active', 'type_label']
-        columns = [] if not data else [x for x in data[0].fields]
+        columns = None
+        meta_columns = None
         view = 'native'
-        output = []
 
         # Export only the shown fields chosen by the user
         if args and args[0].get("metadata", False) and args[0].get('view', 'native') == ExporterConfigType.render.name:
             _meta = json.loads(args[0].get("metadata", ""))
             view = args[0].get('view', 'native')
             header = _meta['header']
-            columns = [x for x in columns if x['name'] in _meta['columns']]
+            meta_columns = _meta['columns']
 
+        chunk = ''
         for obj in data:
+            # columns are defined by the first object
+            if columns is None:
+                columns = [x for x in obj.fields]
+                if meta_columns is not None:
+                    columns = [x for x in columns if x['name'] in meta_columns]
+                chunk += '[\n'
+            else:
+                chunk += ',\n'
+
             # init output element
             output_element = {}
             for head in header:
@@ -227,9 +303,13 @@ class JsonExportType(BaseExporterFormat):
                     'value': ExperterUtils.summary_renderer(obj, field, view)
                 })
 
-            output.append(output_element)
+            element = json.dumps(output_element, default=json_encoding.default, ensure_ascii=False, indent=2)
+            chunk += textwrap.indent(element, '  ')
+            if len(chunk) >= self.CHUNK_SIZE:
+                yield chunk
+                chunk = ''
 
-        return json.dumps(output, default=json_encoding.default, ensure_ascii=False, indent=2)
+        yield '[]' if columns is None else chunk + '\n]'
 
 
 class XlsxExportType(BaseExporterFormat):
@@ -240,6 +320,9 @@ class XlsxExportType(BaseExporterFormat):
     ICON = "file-excel"
     DESCRIPTION = "Export as XLS"
     ACTIVE = True
+    STREAMING = True
+    # Number of bytes which are read from the saved workbook per chunk
+    CHUNK_SIZE = 64 * 1024
 
     def export(self, data: List[RenderResult], *args):
 
@@ -251,29 +334,39 @@ class XlsxExportType(BaseExporterFormat):
         Returns:
             Xlsx file containing the data
         """
+        return b''.join(self.export_stream(data, *args))
+
+    def export_stream(self, data: Iterable[RenderResult], *args) -> Iterator[bytes]:
+
+        """Exports object_list as .xlsx file chunks.
+        The rows are written to the write-only sheets and the saved workbook is read back from a temporary file.
+
+        Args:
+            data: The objects to be exported - only one object is hold in memory at a time
 
+        Returns:
+            Generator of xlsx file chunks
+        """
         workbook = self.create_xls_object(data, args)
 
         # save workbook
-        with tempfile.NamedTemporaryFile() as tmp:
-            workbook.save(tmp.name)
+        with tempfile.TemporaryFile() as tmp:
+            workbook.save(tmp)
             tmp.seek(0)
-            return tmp.read()
+            for chunk in iter(lambda: tmp.read(self.CHUNK_SIZE), b''):
+                yield chunk
 
-    def create_xls_object(self, data: List[RenderResult], args):
+    def create_xls_object(self, data: Iterable[RenderResult], args):
 
-        # create workbook
-        workbook = openpyxl.Workbook()
+        # create write-only workbook - rows can only be appended, but are not kept in memory
+        workbook = openpyxl.Workbook(write_only=True)
 
-        # sorts data_list by type_id
-        decorated = [(dict_.type_information['type_id'], dict_) for dict_ in data]
-        decorated = sorted(decorated, key=lambda x: x[0], reverse=False)
-        sorted_list = [dict_ for (key, dict_) in decorated]
+        # one sheet per type - sheets are ordered by the type_id when all objects are written
+        sheets = {}
 
         # init values
-        current_type_id = None
         header = ['public_id', 'active']
-        columns = [] if not data else [x['name'] for x in data[0].fields]
+        columns = None
         view = 'native'
 
         # Export only the shown fields chosen by the user
@@ -283,40 +376,20 @@ class XlsxExportType(BaseExporterFormat):
             header = _meta['header']
             columns = _meta['columns']
 
-        i = 0
-        for obj in sorted_list:
-
-            # check, if starting a new object type
-            if current_type_id != obj.type_information['type_id']:
-                # set current type id and fields
-                current_type_id = obj.type_information['type_id']
-                i = 1
-
-                # delete default sheet
-                workbook.remove(workbook.active)
-
-                # start a new worksheet and rename it
+        for obj in data:
+            # columns are defined by the first object
+            if columns is None:
+                columns = [x['name'] for x in obj.fields]
+
+            # start a new worksheet for a new object type
+            type_id = obj.type_information['type_id']
+            sheet = sheets.get(type_id)
+            if sheet is None:
                 title = self.__normalize_sheet_title(obj.type_information['type_label'])
-                sheet = workbook.create_sheet(title)
-
-                # insert header: public_id, active
-                for count, head in enumerate(header):
-                    cell = sheet.cell(row=i, column=count+1)
-                    cell.value = head
-
-                # insert header: get fields from type definition
-                c = len(header)
-                for field in columns:
-                    cell = sheet.cell(row=i, column=c+1)
-                    cell.value = field
-                    c = c + 1
-                i = i + 1
-
-            # insert row values: header
-            for count, head in enumerate(header):
-                head = 'object_id' if head == 'public_id' else head
-                cell = sheet.cell(row=i, column=count+1)
-                cell.value = str(obj.object_information[head])
+                sheet = sheets[type_id] = workbook.create_sheet(title)
+
+                # insert header: public_id, active and fields from type definition
+                sheet.append([*header, *columns])
 
             # get object fields as dict:
             obj_fields_dict = {}
@@ -324,15 +397,20 @@ class XlsxExportType(BaseExporterFormat):
                 obj_field_name = field.get('name')
                 obj_fields_dict[obj_field_name] = ExperterUtils.summary_renderer(obj, field, view)
 
-            # insert row values: fields
-            c = len(header)+1
+            # insert row values: header and fields
+            row = []
+            for head in header:
+                head = 'object_id' if head == 'public_id' else head
+                row.append(str(obj.object_information[head]))
             for field in columns:
-                cell = sheet.cell(row=i, column=c)
-                cell.value = str(obj_fields_dict.get(field))
-                c = c + 1
+                row.append(str(obj_fields_dict.get(field)))
+            sheet.append(row)
 
-            # increase row number
-            i = i + 1
+        if not sheets:
+            # a workbook needs at least one sheet
+            workbook.create_sheet()
+        for index, type_id in enumerate(sorted(sheets)):
+            workbook.move_sheet(sheets[type_id].title, index - workbook.index(sheets[type_id]))
 
         return workbook
 
@@ -348,6 +426,9 @@ class XmlExportType(BaseExporterFormat):
     ICON = "file-alt"
     DESCRIPTION = "Export as XML"
     ACTIVE = True
+    STREAMING = True
+    # Number of characters which are collected before a chunk is yielded
+    CHUNK_SIZE = 64 * 1024
 
     def export(self, data: List[RenderResult], *args):
 
@@ -359,10 +440,23 @@ class XmlExportType(BaseExporterFormat):
         Returns:
             Xml file containing the data
         """
+        return ''.join(self.export_stream(data, *args))
+
+    def export_stream(self, data: Iterable[RenderResult], *args) -> Iterator[str]:
+
+        """Exports object_list as .xml file chunks.
+        The document is written element by element and indented with tabs like a pretty printed tree.
+
+        Args:
+            data: The objects to be exported - only one object is hold in memory at a time
+
+        Returns:
+            Generator of xml text chunks
+        """
 
         # init values
         header = ['public_id', 'active', 'type_label']
-        columns = [] if not data else [x['name'] for x in data[0].fields]
+        columns = None
         view = 'native'
 
         # Export only the shown fields chosen by the user
@@ -372,10 +466,27 @@ class XmlExportType(BaseExporterFormat):
             header = _meta['header']
             columns = _meta['columns']
 
+        xml_file = io.StringIO()
+        generator = XMLGenerator(xml_file, encoding='utf-8', short_empty_elements=True)
+
+        def _element(name: str, text: str = None, attributes: dict = None, indent: int = 0):
+            generator.ignorableWhitespace('\n' + '\t' * indent)
+            generator.startElement(name, AttributesImpl(attributes or {}))
+            if text is not None:
+                generator.characters(text)
+            generator.endElement(name)
+
         # object list
-        cmdb_object_list = ET.Element('objects')
+        generator.startDocument()
+        generator.startElement('objects', AttributesImpl({}))
+        empty = True
 
         for obj in data:
+            empty = False
+            # columns are defined by the first object
+            if columns is None:
+                columns = [x['name'] for x in obj.fields]
+
             # get object fields as dict:
             obj_fields_dict = {}
             for field in obj.fields:
@@ -383,30 +494,43 @@ class XmlExportType(BaseExporterFormat):
                 obj_fields_dict[obj_field_name] = ExperterUtils.summary_renderer(obj, field, view)
 
             # xml output: object
-            cmdb_object = ET.SubElement(cmdb_object_list, 'object')
-            cmdb_object_meta = ET.SubElement(cmdb_object, 'meta')
+            generator.ignorableWhitespace('\n\t')
+            generator.startElement('object', AttributesImpl({}))
+            generator.ignorableWhitespace('\n\t\t')
+            generator.startElement('meta', AttributesImpl({}))
 
             # xml output meta: header
             for head in header:
                 head = 'object_id' if head == 'public_id' else head
                 if head == 'type_label':
-                    cmdb_object_meta_type = ET.SubElement(cmdb_object_meta, 'type')
-                    cmdb_object_meta_type.text = obj.type_information['type_label']
+                    _element('type', obj.type_information['type_label'], indent=3)
                 else:
-                    cmdb_object_meta_id = ET.SubElement(cmdb_object_meta, head)
-                    cmdb_object_meta_id.text = str(obj.object_information[head])
+                    _element(head, str(obj.object_information[head]), indent=3)
+            if header:
+                generator.ignorableWhitespace('\n\t\t')
+            generator.endElement('meta')
 
             # xml output: fields
-            cmdb_object_fields = ET.SubElement(cmdb_object, 'fields')
+            generator.ignorableWhitespace('\n\t\t')
+            generator.startElement('fields', AttributesImpl({}))
 
             # walk over all type fields and add object field values
             for field in columns:
-                field_attribs = {
-                    'name': str(field),
-                    'value': str(obj_fields_dict.get(field))
-                }
-                ET.SubElement(cmdb_object_fields, "field", field_attribs)
-
-        # return xml as string (pretty printed)
-        return xml.dom.minidom.parseString(
-            ET.tostring(cmdb_object_list, encoding='unicode', method='xml')).toprettyxml()
+                _element('field', attributes={'name': str(field), 'value': str(obj_fields_dict.get(field))}, indent=3)
+            if columns:
+                generator.ignorableWhitespace('\n\t\t')
+            generator.endElement('fields')
+            generator.ignorableWhitespace('\n\t')
+            generator.endElement('object')
+
+            if xml_file.tell() >= self.CHUNK_SIZE:
+                yield xml_file.getvalue()
+                xml_file.seek(0)
+                xml_file.truncate(0)
+
+        if not empty:
+            generator.ignorableWhitespace('\n')
+        generator.endElement('objects')
+        generator.ignorableWhitespace('\n')
+        generator.endDocument()
+        yield xml_file.getvalue()
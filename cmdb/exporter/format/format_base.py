@@ -22,9 +22,25 @@ class BaseExporterFormat:
     ICON = None
     DESCRIPTION = None
     ACTIVE = None
+    # Format writes the file with `export_stream` chunk by chunk
+    STREAMING = False
 
     def __init__(self, file_name=''):
         self.file_name = f'{file_name}.{self.FILE_EXTENSION}'
 
     def export(self, data, *args):
         pass
+
+    def export_stream(self, data, *args):
+        """
+        Export the data as a generator of file chunks.
+        Formats without streaming support yield the complete file.
+
+        Args:
+            data: Iterable of the objects to be exported
+            args: export options
+
+        Returns:
+            Generator of str or bytes chunks
+        """
+        yield self.export(list(data), *args)
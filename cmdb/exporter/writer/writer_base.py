@@ -15,8 +15,10 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
-from flask import Response, abort
-from typing import List
+import itertools
+
+from flask import Response, abort, stream_with_context
+from typing import List, Iterable, Iterator
 
 from cmdb.framework.cmdb_object import CmdbObject
 from cmdb.framework.cmdb_render import RenderList, RenderResult
@@ -79,6 +81,9 @@ class SupportedExporterExtension:
 
 class BaseExportWriter:
 
+    # Number of objects which are fetched and rendered together
+    CHUNK_SIZE: int = 1000
+
     def __init__(self, export_format: BaseExporterFormat, export_config: ExporterConfig):
         """init of FileExporter
 
@@ -88,34 +93,65 @@ class BaseExportWriter:
         """
         self.export_format = export_format
         self.export_config = export_config
-        self.data: List[RenderResult] = []
+        self.data: Iterable[RenderResult] = []
 
     def from_database(self, user: UserModel, permission: AccessControlPermission):
-        """Get all objects from the collection"""
-        from cmdb.framework.managers.object_manager import ObjectManager
-        manager = ObjectManager(database_manager=database_manager)
-
+        """Get all objects from the collection.
+        The objects are fetched and rendered lazily in chunks of `CHUNK_SIZE` while the export is written."""
+        # the response is streamed - a format error must be detected before the first chunk is sent
+        if not self.export_format.MULTITYPE_SUPPORT and self._count_types(user=user, permission=permission) > 1:
+            return abort(400, f'{self.export_format.LABEL} can export only objects of the same type')
         try:
-            _params = self.export_config.parameters
-            _result: List[CmdbObject] = manager.iterate(filter=_params.filter,
-                                                        sort=_params.sort,
-                                                        order=_params.order,
-                                                        limit=0, skip=0,
-                                                        user=user, permission=permission).results
-
-            self.data = RenderList(object_list=_result, request_user=user,
-                                   object_manager=object_manager, ref_render=True).render_result_list(raw=False)
-
+            chunks = self._iter_objects(user=user, permission=permission)
+            # run the query before the response starts, so errors still abort the request
+            first_chunk = next(chunks, [])
+            self.data = self._iter_render(itertools.chain([first_chunk], chunks), user=user)
         except CMDBError as e:
             return abort(400, e)
 
+    def _count_types(self, user: UserModel, permission: AccessControlPermission) -> int:
+        """Get the number of different types of the export filter - counting stops at 2"""
+        from cmdb.framework.managers.object_manager import ObjectQueryBuilder
+
+        pipeline = ObjectQueryBuilder(database_manager=database_manager).filter_stages(
+            filter=self.export_config.parameters.filter, user=user, permission=permission)
+        pipeline += [{'$group': {'_id': '$type_id'}}, {'$limit': 2}]
+        return len(list(database_manager.aggregate(CmdbObject.COLLECTION, pipeline)))
+
+    def _iter_objects(self, user: UserModel, permission: AccessControlPermission) -> Iterator[List[CmdbObject]]:
+        """Get the objects of the export filter from a database cursor in chunks of `CHUNK_SIZE`"""
+        from cmdb.framework.managers.object_manager import ObjectQueryBuilder
+
+        _params = self.export_config.parameters
+        pipeline = ObjectQueryBuilder(database_manager=database_manager).build(
+            filter=_params.filter, limit=0, skip=0, sort=_params.sort, order=_params.order,
+            user=user, permission=permission)
+        cursor = database_manager.aggregate(CmdbObject.COLLECTION, pipeline, batchSize=self.CHUNK_SIZE)
+        try:
+            while True:
+                chunk = [CmdbObject.from_data(resource) for resource in itertools.islice(cursor, self.CHUNK_SIZE)]
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            cursor.close()
+
+    def _iter_render(self, chunks: Iterable[List[CmdbObject]], user: UserModel) -> Iterator[RenderResult]:
+        """Render the object chunks - references and types are loaded once per chunk"""
+        for chunk in chunks:
+            yield from RenderList(object_list=chunk, request_user=user, object_manager=object_manager,
+                                  ref_render=True, batch=True).render_result_list(raw=False)
+
     def export(self):
         import datetime
         import time
 
         conf_option = self.export_config.options
         timestamp = datetime.datetime.fromtimestamp(time.time()).strftime('%Y_%m_%d-%H_%M_%S')
-        export = self.export_format.export(self.data, conf_option)
+        if self.export_format.STREAMING:
+            export = stream_with_context(self.export_format.export_stream(self.data, conf_option))
+        else:
+            export = self.export_format.export(list(self.data), conf_option)
 
         return Response(
             export,
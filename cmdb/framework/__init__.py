@@ -29,6 +29,7 @@ from cmdb.framework.models import TypeModel
 from cmdb.framework.models import CategoryModel
 from cmdb.framework.models import ObjectLinkModel
 from cmdb.framework.models.log import CmdbLog, CmdbObjectLog, CmdbMetaLog
+from cmdb.framework.models.search_index import SearchIndexModel
 
 CmdbLog.register_log_type(CmdbObjectLog.__name__, CmdbObjectLog)
 
@@ -38,6 +39,7 @@ __COLLECTIONS__ = [
     TypeModel,
     CategoryModel,
     CmdbMetaLog,
-    ObjectLinkModel
+    ObjectLinkModel,
+    SearchIndexModel
 ]
 
@@ -43,6 +43,14 @@ class CmdbObject(CmdbDAO):
         'fields',
         'version'
     ]
+    INDEX_KEYS = [
+        {'keys': [('type_id', CmdbDAO.DAO_ASCENDING), ('public_id', CmdbDAO.DAO_ASCENDING)], 'name': 'type_id'},
+        {'keys': [('active', CmdbDAO.DAO_ASCENDING), ('type_id', CmdbDAO.DAO_ASCENDING)], 'name': 'active'},
+        {'keys': [('creation_time', CmdbDAO.DAO_DESCENDING)], 'name': 'creation_time'},
+        {'keys': [('last_edit_time', CmdbDAO.DAO_DESCENDING)], 'name': 'last_edit_time'},
+        {'keys': [('author_id', CmdbDAO.DAO_ASCENDING)], 'name': 'author_id'},
+        {'keys': [('fields.name', CmdbDAO.DAO_ASCENDING), ('fields.value', CmdbDAO.DAO_ASCENDING)], 'name': 'fields'}
+    ]
 
     def __init__(self, type_id, creation_time, author_id, active, fields, last_edit_time=None, editor_id: int = None,
                  status: int = None, version: str = '1.0.0', **kwargs):
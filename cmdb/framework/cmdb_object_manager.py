@@ -26,7 +26,10 @@ import json
 from cmdb.database.utils import object_hook
 from bson import json_util
 from datetime import datetime
-from typing import List
+from typing import List, Dict, Tuple, Union
+
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
 
 from cmdb.database.errors.database_errors import PublicIDAlreadyExists
 from cmdb.event_management.event import Event
@@ -40,7 +43,10 @@ from cmdb.framework.cmdb_errors import WrongInputFormatError, \
 from cmdb.framework import ObjectLinkModel
 from cmdb.framework.cmdb_object import CmdbObject
 from cmdb.framework.models.type import TypeModel
+from cmdb.manager import ManagerGetError
 from cmdb.search.query import Query, Pipeline
+from cmdb.search.search_index import SearchIndex
+from cmdb.security.acl.builder import AccessControlTypeCache
 from cmdb.security.acl.control import AccessControlList
 from cmdb.security.acl.errors import AccessDeniedError
 from cmdb.security.acl.permission import AccessControlPermission
@@ -70,10 +76,12 @@ def verify_access(type: TypeModel, user: UserModel = None, permission: AccessCon
 
 
 class CmdbObjectManager(CmdbManagerBase):
+    SORTABLE_PROPERTIES = ['active', 'public_id', 'type_id', 'author_id', 'creation_time']
 
     def __init__(self, database_manager=None, event_queue=None):
         self._event_queue = event_queue
         self._type_manager = TypeManager(database_manager)
+        self._search_index = SearchIndex(database_manager)
         super(CmdbObjectManager, self).__init__(database_manager)
 
     def is_ready(self) -> bool:
@@ -82,6 +90,26 @@ class CmdbObjectManager(CmdbManagerBase):
     def get_new_id(self, collection: str) -> int:
         return self.dbm.get_next_public_id(collection)
 
+    def get_new_ids(self, collection: str, amount: int) -> range:
+        return self.dbm.reserve_public_ids(collection, amount)
+
+    def _update_search_index(self, objects: List[Union[CmdbObject, dict]] = None, deleted_ids: List[int] = None):
+        """Keep the search index in sync with the written objects - a failure does not fail the write"""
+        try:
+            if objects:
+                self._search_index.update(objects)
+            if deleted_ids:
+                self._search_index.delete(deleted_ids)
+        except Exception as err:
+            LOGGER.error(f'Search index could not be updated: {err}')
+
+    def _reindex_search_index(self, filter: dict):
+        """Update the search index of all objects which match a filter - a failure does not fail the write"""
+        try:
+            self._search_index.reindex(filter)
+        except Exception as err:
+            LOGGER.error(f'Search index could not be updated: {err}')
+
     def aggregate(self, collection, pipeline: Pipeline, **kwargs):
         try:
             return self._aggregate(collection=collection, pipeline=pipeline, **kwargs)
@@ -223,6 +251,70 @@ class CmdbObjectManager(CmdbManagerBase):
 
         return object_list
 
+    def get_objects_page(self, match: dict, sort: str = 'public_id', order: int = -1, skip: int = 0,
+                         limit: int = 0) -> Tuple[List[CmdbObject], int]:
+        """Get one page of sorted objects and the total number of matching objects with a single aggregation.
+           Without a limit the objects are loaded with a plain aggregation and the total is counted separately.
+
+           Args:
+               match (dict): filter of the objects
+               sort (str): object property or field name to sort by
+               order (int): Ascending/Descending Sort e.g. -1
+               skip (int): number of objects which are skipped
+               limit (int): max number of returned objects - 0 means no limit
+           Returns:
+               the CMDB Objects of the page and the total number of objects which matched
+           """
+        result_stages = []
+        if sort in self.SORTABLE_PROPERTIES:
+            sort_stage = {sort: order}
+        else:
+            # sort by the value of a field
+            result_stages.append({"$addFields": {
+                "order": {
+                    "$filter": {
+                        "input": "$fields",
+                        "as": "fields",
+                        "cond": {"$eq": ["$$fields.name", sort]}
+                    }
+                }
+            }})
+            sort_stage = {'order': order}
+        if sort != 'public_id':
+            # stable order over the pages
+            sort_stage['public_id'] = order
+        result_stages.append({'$sort': sort_stage})
+        result_stages.append({'$skip': max(skip, 0)})
+        if limit > 0:
+            result_stages.append({'$limit': limit})
+        result_stages.append({'$project': {'_id': 0, 'order': 0}})
+
+        if limit <= 0:
+            # without a limit all results would be in one facet document, which could exceed the document size limit
+            try:
+                results = [CmdbObject(**document) for document in
+                           self.dbm.aggregate(CmdbObject.COLLECTION, [{'$match': match or {}}] + result_stages)]
+                total = len(results) if skip <= 0 else self.dbm.count(CmdbObject.COLLECTION, filter=match or {})
+            except Exception as err:
+                raise ObjectManagerGetError(err)
+            return results, total
+
+        pipeline = [
+            {'$match': match or {}},
+            {'$facet': {
+                'results': result_stages,
+                'total': [{'$count': 'count'}]
+            }}
+        ]
+        try:
+            page = next(self.dbm.aggregate(CmdbObject.COLLECTION, pipeline))
+        except StopIteration:
+            return [], 0
+        except Exception as err:
+            raise ObjectManagerGetError(err)
+        total = page['total'][0]['count'] if page['total'] else 0
+        return [CmdbObject(**document) for document in page['results']], total
+
     def count_objects(self):
         return self.dbm.count(collection=CmdbObject.COLLECTION)
 
@@ -266,6 +358,7 @@ class CmdbObjectManager(CmdbManagerBase):
                 collection=CmdbObject.COLLECTION,
                 data=new_object.__dict__
             )
+            self._update_search_index(objects=[new_object])
             if self._event_queue:
                 event = Event("cmdb.core.object.added", {"id": new_object.get_public_id(),
                                                          "type_id": new_object.get_type_id(),
@@ -275,6 +368,59 @@ class CmdbObjectManager(CmdbManagerBase):
             raise ObjectInsertError(e)
         return ack
 
+    def upsert_objects(self, objects: List[CmdbObject], user: UserModel = None,
+                       permission: AccessControlPermission = None) -> Dict[int, str]:
+        """
+        Insert or replace a batch of CMDB Objects with one unordered bulk write.
+        Existing objects with the same public id are replaced.
+        One `cmdb.core.objects.added` event is published for all written objects.
+        Args:
+            objects: objects with already assigned public ids
+            user: current user, to detect who triggered event
+            permission: extended user acl rights
+        Returns:
+            Error messages of the failed objects - indexed by their position in `objects`
+        """
+        if not objects:
+            return {}
+        failed_objects: Dict[int, str] = {}
+        for type_id in {object_.type_id for object_ in objects}:
+            try:
+                type_ = self._type_manager.get(type_id)
+            except ManagerGetError as err:
+                # objects of unknown types fail, the other objects of the batch are still written
+                for idx, object_ in enumerate(objects):
+                    if object_.type_id == type_id:
+                        failed_objects[idx] = err.message
+                continue
+            verify_access(type_, user, permission)
+
+        write_indexes = [idx for idx in range(len(objects)) if idx not in failed_objects]
+        operations = [ReplaceOne({'public_id': objects[idx].public_id}, objects[idx].__dict__, upsert=True)
+                      for idx in write_indexes]
+        if operations:
+            try:
+                self.dbm.bulk_write(CmdbObject.COLLECTION, operations, ordered=False)
+            except BulkWriteError as err:
+                # the error index refers to the operations - map it back to the position in `objects`
+                for write_error in err.details.get('writeErrors', []):
+                    failed_objects[write_indexes[write_error['index']]] = write_error.get('errmsg')
+                LOGGER.debug(f'Bulk write of {len(objects)} objects failed for {len(failed_objects)} objects')
+
+        written_objects = [object_ for idx, object_ in enumerate(objects) if idx not in failed_objects]
+        self._update_search_index(objects=written_objects)
+        if written_objects:
+            self.dbm.update_public_id_counter(CmdbObject.COLLECTION,
+                                              max(object_.public_id for object_ in written_objects))
+        if self._event_queue and written_objects:
+            for type_id in {object_.type_id for object_ in written_objects}:
+                event = Event("cmdb.core.objects.added", {
+                    "ids": [object_.public_id for object_ in written_objects if object_.type_id == type_id],
+                    "type_id": type_id,
+                    "user_id": user.get_public_id() if user else written_objects[0].author_id})
+                self._event_queue.put(event)
+        return failed_objects
+
     def update_object(self, data: (dict, CmdbObject), user: UserModel = None,
                       permission: AccessControlPermission = None) -> str:
 
@@ -296,6 +442,7 @@ class CmdbObjectManager(CmdbManagerBase):
             public_id=update_object.get_public_id(),
             data=update_object.__dict__
         )
+        self._update_search_index(objects=[update_object])
         # create cmdb.core.object.updated event
         if self._event_queue and user:
             event = Event("cmdb.core.object.updated", {"id": update_object.get_public_id(),
@@ -306,10 +453,12 @@ class CmdbObjectManager(CmdbManagerBase):
 
     def remove_object_fields(self, filter_query: dict, update: dict):
         ack = self._update_many(CmdbObject.COLLECTION, filter_query, update)
+        self._reindex_search_index(filter_query)
         return ack
 
     def update_object_fields(self, filter: dict, update: dict):
         ack = self._update_many(CmdbObject.COLLECTION, filter, update)
+        self._reindex_search_index(filter)
         return ack
 
     def get_object_references(self, public_id: int, active_flag=None, user: UserModel = None,
@@ -369,12 +518,14 @@ class CmdbObjectManager(CmdbManagerBase):
                                "user_id": user.get_public_id()})
                 self._event_queue.put(event)
             ack = self._delete(CmdbObject.COLLECTION, public_id)
+            self._update_search_index(deleted_ids=[public_id])
             return ack
         except (CMDBError, Exception):
             raise ObjectDeleteError(msg=public_id)
 
     def delete_many_objects(self, filter_query: dict, public_ids, user: UserModel):
         ack = self._delete_many(CmdbObject.COLLECTION, filter_query)
+        self._update_search_index(deleted_ids=public_ids)
         if self._event_queue:
             event = Event("cmdb.core.objects.deleted", {"ids": public_ids,
                                                         "user_id": user.get_public_id()})
@@ -445,6 +596,7 @@ class CmdbObjectManager(CmdbManagerBase):
             public_id=update_type.get_public_id(),
             data=TypeModel.to_json(update_type)
         )
+        AccessControlTypeCache.invalidate(self.dbm)
         if self._event_queue:
             event = Event("cmdb.core.objecttype.updated", {"id": update_type.get_public_id()})
             self._event_queue.put(event)
@@ -453,6 +605,7 @@ class CmdbObjectManager(CmdbManagerBase):
     @deprecated
     def update_many_types(self, filter: dict, update: dict):
         ack = self._update_many(TypeModel.COLLECTION, filter, update)
+        AccessControlTypeCache.invalidate(self.dbm)
         return ack
 
     @deprecated
@@ -17,11 +17,12 @@
 """
 Object/Type render
 """
-from typing import List, Union
+from copy import deepcopy
+from typing import List, Union, Dict, Set
 
 from cmdb.database.managers import DatabaseManagerMongo
 from cmdb.framework.cmdb_errors import ObjectManagerGetError
-from cmdb.framework.cmdb_object_manager import CmdbObjectManager
+from cmdb.framework.cmdb_object_manager import CmdbObjectManager, verify_access
 from cmdb.security.acl.errors import AccessDeniedError
 from cmdb.security.acl.permission import AccessControlPermission
 from cmdb.utils.wraps import timing
@@ -74,7 +75,8 @@ class CmdbRender:
     def __init__(self, object_instance: CmdbObject,
                  type_instance: TypeModel,
                  render_user: UserModel, user_list: List[UserModel] = None,
-                 object_manager: CmdbObjectManager = None, dt_render=False, ref_render=False):
+                 object_manager: CmdbObjectManager = None, dt_render=False, ref_render=False,
+                 reference_objects: Dict[int, CmdbObject] = None, reference_types: Dict[int, TypeModel] = None):
         self.object_instance: CmdbObject = object_instance
         self.type_instance: TypeModel = type_instance
         self.user_list: List[UserModel] = user_list
@@ -82,6 +84,9 @@ class CmdbRender:
         self.object_manager = object_manager
         self.dt_render = dt_render
         self.ref_render = ref_render
+        # Preloaded references - if set the references are resolved without database calls
+        self.reference_objects: Dict[int, CmdbObject] = reference_objects
+        self.reference_types: Dict[int, TypeModel] = reference_types or {}
 
     def _render_username_by_id(self, user_id: int, default=AUTHOR_ANONYMOUS_NAME) -> str:
         user: UserModel = None
@@ -215,7 +220,8 @@ class CmdbRender:
 
     def __merge_fields_value(self) -> list:
         field_map = []
-        html_parser = DtHtmlParser(self.object_manager)
+        html_parser = DtHtmlParser(self.object_manager, reference_objects=self.reference_objects,
+                                   reference_types=self.reference_types)
         for field in self.type_instance.fields:
             html_parser.current_field = field
             try:
@@ -244,28 +250,41 @@ class CmdbRender:
             'icon': None
         }
         if current_field['value']:
-            try:
-                ref_object = self.object_manager.get_object(int(current_field['value']), user=self.render_user,
-                                                            permission=AccessControlPermission.READ)
-            except AccessDeniedError as err:
-                return err.message
-            except ObjectManagerGetError:
-                return reference
+            if self.reference_objects is not None:
+                ref_object = self.reference_objects.get(int(current_field['value']))
+                if not ref_object:
+                    return reference
+                ref_type = self.reference_types.get(ref_object.get_type_id())
+                if not ref_type:
+                    return reference
+                try:
+                    verify_access(ref_type, self.render_user, AccessControlPermission.READ)
+                except AccessDeniedError as err:
+                    return err.message
+            else:
+                try:
+                    ref_object = self.object_manager.get_object(int(current_field['value']), user=self.render_user,
+                                                                permission=AccessControlPermission.READ)
+                except AccessDeniedError as err:
+                    return err.message
+                except ObjectManagerGetError:
+                    return reference
 
-            try:
-                ref_type = self.object_manager.get_type(ref_object.get_type_id())
-                reference['type_label'] = ref_type.label
-                reference['icon'] = ref_type.get_icon()
-
-                summaries = []
-                summary_fields = ref_type.get_summary().fields
-                for field in summary_fields:
-                    summary_value = str([x for x in ref_object.fields if x['name'] == field['name']][0]['value'])
-                    if summary_value:
-                        summaries.append({"value": summary_value, "type": field.get('type')})
-                reference['summaries'] = summaries
-            except ObjectManagerGetError:
-                return reference
+                try:
+                    ref_type = self.object_manager.get_type(ref_object.get_type_id())
+                except ObjectManagerGetError:
+                    return reference
+
+            reference['type_label'] = ref_type.label
+            reference['icon'] = ref_type.get_icon()
+
+            summaries = []
+            summary_fields = ref_type.get_summary().fields
+            for field in summary_fields:
+                summary_value = str([x for x in ref_object.fields if x['name'] == field['name']][0]['value'])
+                if summary_value:
+                    summaries.append({"value": summary_value, "type": field.get('type')})
+            reference['summaries'] = summaries
 
         return reference
 
@@ -345,21 +364,43 @@ class CmdbRender:
 class RenderList:
 
     def __init__(self, object_list: List[CmdbObject], request_user: UserModel, dt_render=False, ref_render=False,
-                 object_manager: CmdbObjectManager = None):
+                 object_manager: CmdbObjectManager = None, batch: bool = False, user_list: List[UserModel] = None):
+        """
+        Constructor of RenderList
+
+        Args:
+            object_list: Objects which should be rendered
+            request_user: User which requested the render
+            dt_render: Render the field values as html for the data tables
+            ref_render: Resolve the summaries of referenced objects
+            object_manager: Object manager instance - a new one will be created if not passed
+            batch: Preload all types and references with one query per collection before rendering
+            user_list: Already loaded users - the users are loaded on every render if not passed
+        """
         self.object_list: List[CmdbObject] = object_list
         self.request_user = request_user
         self.dt_render = dt_render
         self.ref_render = ref_render
-        from cmdb.utils.system_config import SystemConfigReader
-        database_manager = DatabaseManagerMongo(
-            **SystemConfigReader().get_all_values_from_section('Database')
-        )
+        self.batch = batch
+        self.user_list = user_list
+        # Number of database queries of the last batch render
+        self.query_count: int = 0
+        if object_manager:
+            database_manager = object_manager.dbm
+        else:
+            from cmdb.utils.system_config import SystemConfigReader
+            database_manager = DatabaseManagerMongo(
+                **SystemConfigReader().get_all_values_from_section('Database')
+            )
         self.object_manager = object_manager or CmdbObjectManager(database_manager=database_manager)
         self.user_manager = UserManager(database_manager=database_manager)
 
     @timing('RenderList')
     def render_result_list(self, raw: bool = False) -> List[Union[RenderResult, dict]]:
-        complete_user_list: List[UserModel] = self.user_manager.get_users()
+        if self.batch:
+            return self._render_batch_result_list(raw=raw)
+
+        complete_user_list: List[UserModel] = self.user_list or self.user_manager.get_users()
 
         preparation_objects: List[RenderResult] = []
         for passed_object in self.object_list:
@@ -375,6 +416,78 @@ class RenderList:
             preparation_objects.append(current_render_result)
         return preparation_objects
 
+    def _render_batch_result_list(self, raw: bool = False) -> List[Union[RenderResult, dict]]:
+        """
+        Render the object list from preloaded in-memory maps.
+        Users, types and referenced objects are loaded with a single `$in` query per collection,
+        so the number of queries does not depend on the number of objects.
+        """
+        self.query_count = 0
+        complete_user_list: List[UserModel] = self.user_list
+        if complete_user_list is None:
+            complete_user_list = self.user_manager.get_users()
+            self.query_count += 1
+
+        type_documents: Dict[int, dict] = self.__load_documents(
+            TypeModel.COLLECTION, {passed_object.type_id for passed_object in self.object_list})
+
+        reference_objects: Dict[int, CmdbObject] = {}
+        reference_types: Dict[int, TypeModel] = {}
+        if self.ref_render or self.dt_render:
+            reference_ids = self.__collect_reference_ids(type_documents)
+            reference_objects = {public_id: CmdbObject(**document) for public_id, document in
+                                 self.__load_documents(CmdbObject.COLLECTION, reference_ids).items()}
+            reference_type_ids = {ref_object.get_type_id() for ref_object in reference_objects.values()}
+            type_documents.update(self.__load_documents(TypeModel.COLLECTION,
+                                                        reference_type_ids - type_documents.keys()))
+            reference_types = {type_id: TypeModel.from_data(type_documents[type_id])
+                               for type_id in reference_type_ids if type_id in type_documents}
+
+        preparation_objects: List[RenderResult] = []
+        for passed_object in self.object_list:
+            type_document = type_documents.get(passed_object.type_id)
+            if not type_document:
+                raise ObjectManagerGetError(f'Type with ID: {passed_object.type_id} not found!')
+            # the render writes the object values into the type fields, so every object needs its own copy
+            tmp_render = CmdbRender(
+                type_instance=TypeModel.from_data(deepcopy(type_document)),
+                object_instance=passed_object,
+                render_user=self.request_user, user_list=complete_user_list,
+                object_manager=self.object_manager, dt_render=self.dt_render, ref_render=self.ref_render,
+                reference_objects=reference_objects, reference_types=reference_types)
+            if raw:
+                current_render_result = tmp_render.result().__dict__
+            else:
+                current_render_result = tmp_render.result()
+            preparation_objects.append(current_render_result)
+        LOGGER.debug(f'[RenderList] Rendered {len(preparation_objects)} objects with {self.query_count} queries')
+        return preparation_objects
+
+    def __collect_reference_ids(self, type_documents: Dict[int, dict]) -> Set[int]:
+        """Get the public ids of all objects referenced by the ref fields of the object list"""
+        reference_ids: Set[int] = set()
+        for passed_object in self.object_list:
+            type_document = type_documents.get(passed_object.type_id) or {}
+            ref_fields = [field['name'] for field in type_document.get('fields') or [] if field.get('type') == 'ref']
+            if not ref_fields:
+                continue
+            for field in passed_object.fields:
+                if field.get('name') in ref_fields and field.get('value'):
+                    try:
+                        reference_ids.add(int(field['value']))
+                    except (TypeError, ValueError):
+                        continue
+        return reference_ids
+
+    def __load_documents(self, collection: str, public_ids: Set[int]) -> Dict[int, dict]:
+        """Load all documents of a collection with the passed public ids in one query"""
+        if not public_ids:
+            return {}
+        self.query_count += 1
+        documents = self.object_manager.dbm.find_all(collection=collection,
+                                                     filter={'public_id': {'$in': list(public_ids)}})
+        return {document['public_id']: document for document in documents}
+
 
 class RenderError(CMDBError):
     """
@@ -24,7 +24,6 @@ from cmdb.manager.managers import ManagerBase
 from cmdb.framework.results.iteration import IterationResult
 from cmdb.framework.utils import PublicID
 from cmdb.manager import ManagerGetError, ManagerIterationError, ManagerUpdateError
-from cmdb.search import Pipeline
 
 
 class CategoryManager(ManagerBase):
@@ -44,19 +43,15 @@ class CategoryManager(ManagerBase):
             skip: number of elements to skip first
             sort: sort field
             order: sort order
+            count (optional): `CountMode` of the total
 
         Returns:
             IterationResult: Instance of IterationResult with generic CategoryModel.
         """
 
         try:
-            query: Pipeline = self.builder.build(filter=filter, limit=limit, skip=skip, sort=sort, order=order)
-            count_query: Pipeline = self.builder.count(filter=filter)
-            aggregation_result = list(self._aggregate(self.collection, query))
-            total_cursor = self._aggregate(self.collection, count_query)
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            aggregation_result, total = self._iterate(self.builder, filter=filter, limit=limit, skip=skip,
+                                                      sort=sort, order=order, count=kwargs.get('count'))
         except ManagerGetError as err:
             raise ManagerIterationError(err=err)
 
@@ -18,6 +18,8 @@
 from typing import Union, List
 from datetime import datetime
 
+from pymongo import InsertOne
+
 from cmdb.framework import CmdbLog, CmdbMetaLog
 from cmdb.database.managers import DatabaseManagerMongo
 from cmdb.manager.managers import ManagerQueryBuilder, ManagerBase
@@ -27,7 +29,6 @@ from cmdb.framework.results.iteration import IterationResult
 from cmdb.manager import ManagerGetError, ManagerIterationError, ManagerDeleteError, ManagerInsertError, \
     ManagerUpdateError
 from cmdb.framework.models.log import LOGGER, LogAction, CmdbObjectLog
-from cmdb.search import Query, Pipeline
 from cmdb.security.acl.builder import LookedAccessControlQueryBuilder
 from cmdb.security.acl.permission import AccessControlPermission
 from cmdb.user_management import UserModel
@@ -36,78 +37,54 @@ from cmdb.utils.error import CMDBError
 
 class LogQueryBuilder(ManagerQueryBuilder):
 
-    def __init__(self):
+    def __init__(self, database_manager: DatabaseManagerMongo = None):
+        """
+        Args:
+            database_manager: Connection for resolving the acl type allowlist
+        """
+        self.database_manager = database_manager
         super(LogQueryBuilder, self).__init__()
 
-    def build(self, filter: Union[List[dict], dict], limit: int, skip: int, sort: str, order: int,
-              user: UserModel = None, permission: AccessControlPermission = None, *args, **kwargs) -> \
-            Union[Query, Pipeline]:
+    def filter_stages(self, filter: Union[List[dict], dict], user: UserModel = None,
+                      permission: AccessControlPermission = None, *args, **kwargs) -> List[dict]:
         """
-        Converts the parameters from the call to a mongodb aggregation pipeline
+        Stages which select the logs - including the acl stages of the logged objects
         Args:
             filter: dict or list of dict query/queries which the elements have to match.
-            limit: max number of documents to return.
-            skip: number of documents to skip first.
-            sort: sort field
-            order: sort order
             user: request user
             permission: AccessControlPermission
-            *args:
-            **kwargs:
 
         Returns:
-            The `LogQueryBuilder` query pipeline with the parameter contents.
+            List of pipeline stages
         """
-        self.clear()
-        self.query = Pipeline([])
-
-        if isinstance(filter, dict):
-            self.query.append(self.match_(filter))
-        elif isinstance(filter, list):
-            for pipe in filter:
-                self.query.append(pipe)
-
+        stages = super(LogQueryBuilder, self).filter_stages(filter)
         if user and permission:
-            self.query += (
-                LookedAccessControlQueryBuilder().build(group_id=PublicID(user.group_id), permission=permission))
+            stages += (
+                LookedAccessControlQueryBuilder(database_manager=self.database_manager)
+                .build(group_id=PublicID(user.group_id), permission=permission))
+        return stages
 
-        if limit == 0:
-            results_query = [self.skip_(limit)]
-        else:
-            results_query = [self.skip_(skip), self.limit_(limit)]
-
-        self.query.append(self.sort_(sort=sort, order=order))
-
-        self.query += results_query
-        return self.query
-
-    def count(self, filter: Union[List[dict], dict], user: UserModel = None,
-              permission: AccessControlPermission = None) -> Union[Query, Pipeline]:
+    def result_stages(self, limit: int, skip: int, sort: str, order: int, cursor=None) -> List[dict]:
         """
-        Count the number of documents in the stages
+        Stages which sort and page the selected logs
         Args:
-            filter: filter requirement
-            user: request user
-            permission: acl permission
+            limit: max number of documents to return.
+            skip: number of documents to skip first.
+            sort: sort field
+            order: sort order
+            cursor: keyset cursor (`APICursor`) - replaces the skip with a range match
 
         Returns:
-            Query with count stages.
+            List of pipeline stages
         """
-        self.clear()
-        self.query = Pipeline([])
-
-        if isinstance(filter, dict):
-            self.query.append(self.match_(filter))
-        elif isinstance(filter, list):
-            for pipe in filter:
-                self.query.append(pipe)
+        if cursor is not None:
+            return self.keyset_(sort=sort, order=order, limit=limit, cursor=cursor)
 
-        if user and permission:
-            self.query += (
-                LookedAccessControlQueryBuilder().build(group_id=PublicID(user.group_id), permission=permission))
-
-        self.query.append(self.count_('total'))
-        return self.query
+        if limit == 0:
+            results_query = [self.skip_(limit)]
+        else:
+            results_query = [self.skip_(skip), self.limit_(limit)]
+        return [self.sort_(sort=sort, order=order)] + results_query
 
 
 class CmdbLogManager(ManagerBase):
@@ -122,7 +99,7 @@ class CmdbLogManager(ManagerBase):
         Args:
             database_manager: Connection to the database class.
         """
-        self.log_builder = LogQueryBuilder()
+        self.log_builder = LogQueryBuilder(database_manager=database_manager)
         super(CmdbLogManager, self).__init__(CmdbMetaLog.COLLECTION, database_manager=database_manager)
 
     def get(self, public_id: Union[PublicID, int]) -> Union[CmdbMetaLog, CmdbObjectLog]:
@@ -143,20 +120,17 @@ class CmdbLogManager(ManagerBase):
             skip: number of elements to skip first
             sort: sort field
             order: sort order
+            cursor (optional): keyset cursor of the cursor pagination mode
+            count (optional): `CountMode` of the total
 
         Returns:
             IterationResult: Instance of IterationResult with generic CmdbObjectLog.
         """
         try:
-            query: Query = self.log_builder.build(filter=filter, limit=limit, skip=skip, sort=sort, order=order,
-                                                  user=user, permission=permission)
-            count_query: Pipeline = self.log_builder.count(filter=filter, user=user, permission=permission)
-            aggregation_result = list(self._aggregate(self.collection, query))
-            total_cursor = self._aggregate(self.collection, count_query)
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
-        except ManagerGetError as err:
+            aggregation_result, total = self._iterate(self.log_builder, filter=filter, limit=limit, skip=skip,
+                                                      sort=sort, order=order, count=kwargs.get('count'),
+                                                      cursor=kwargs.get('cursor'), user=user, permission=permission)
+        except (ManagerGetError, ValueError) as err:
             raise ManagerIterationError(err=err)
 
         try:
@@ -188,6 +162,33 @@ class CmdbLogManager(ManagerBase):
             raise LogManagerInsertError(err)
         return ack
 
+    def insert_many(self, action: LogAction, log_type: str, logs: List[dict]) -> List[int]:
+        """
+        Insert a batch of logs with one id reservation and one bulk write.
+
+        Args:
+            action: action of all logs
+            log_type: class name of all logs
+            logs: log parameters of every log - like the kwargs of `insert`
+
+        Returns:
+            public ids of the new logs
+        """
+        if not logs:
+            return []
+        log_time = datetime.utcnow()
+        public_ids = list(self._database_manager.reserve_public_ids(CmdbMetaLog.COLLECTION, len(logs)))
+        try:
+            operations = [InsertOne(CmdbLog(**{'public_id': public_id, 'action': action.value,
+                                               'action_name': action.name, 'log_type': log_type,
+                                               'log_time': log_time, **log_params}).to_database())
+                          for public_id, log_params in zip(public_ids, logs)]
+            self._database_manager.bulk_write(CmdbMetaLog.COLLECTION, operations, ordered=False)
+        except (CMDBError, Exception) as err:
+            LOGGER.error(err)
+            raise LogManagerInsertError(err)
+        return public_ids
+
     def update(self, data) -> int:
         raise NotImplementedError
 
@@ -24,7 +24,6 @@ from cmdb.framework.managers.object_manager import ObjectQueryBuilder
 from cmdb.framework.results import IterationResult
 from cmdb.framework.utils import PublicID
 from cmdb.manager import ManagerGetError, ManagerIterationError, ManagerDeleteError
-from cmdb.search import Pipeline
 from cmdb.security.acl.permission import AccessControlPermission
 from cmdb.user_management import UserModel
 
@@ -66,13 +65,8 @@ class ObjectLinkManager(ManagerBase):
         """
 
         try:
-            query: Pipeline = self.query_builder.build(filter=filter, limit=limit, skip=skip, sort=sort, order=order)
-            count_query: Pipeline = self.query_builder.count(filter=filter, user=user, permission=permission)
-            aggregation_result = list(self._aggregate(self.collection, query))
-            total_cursor = self._aggregate(self.collection, count_query)
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            aggregation_result, total = self._iterate(self.query_builder, filter=filter, limit=limit, skip=skip,
+                                                      sort=sort, order=order, count=kwargs.get('count'))
         except ManagerGetError as err:
             raise ManagerIterationError(err=err)
         iteration_result: IterationResult[ObjectLinkModel] = IterationResult(aggregation_result, total)
@@ -25,7 +25,6 @@ from cmdb.framework.managers.type_manager import TypeManager
 from cmdb.framework.results import IterationResult
 from cmdb.framework.utils import PublicID
 from cmdb.manager import ManagerGetError, ManagerIterationError
-from cmdb.search import Query, Pipeline
 from cmdb.security.acl.builder import AccessControlQueryBuilder
 from cmdb.security.acl.permission import AccessControlPermission
 from cmdb.user_management import UserModel
@@ -33,39 +32,49 @@ from cmdb.user_management import UserModel
 
 class ObjectQueryBuilder(ManagerQueryBuilder):
 
-    def __init__(self):
+    def __init__(self, database_manager: DatabaseManagerMongo = None):
+        """
+        Args:
+            database_manager: Connection for resolving the acl type allowlist
+        """
+        self.database_manager = database_manager
         super(ObjectQueryBuilder, self).__init__()
 
-    def build(self, filter: Union[List[dict], dict], limit: int, skip: int, sort: str, order: int,
-              user: UserModel = None, permission: AccessControlPermission = None, *args, **kwargs) -> \
-            Union[Query, Pipeline]:
+    def filter_stages(self, filter: Union[List[dict], dict], user: UserModel = None,
+                      permission: AccessControlPermission = None, *args, **kwargs) -> List[dict]:
         """
-        Converts the parameters from the call to a mongodb aggregation pipeline
+        Stages which select the objects - including the acl stages
         Args:
             filter: dict or list of dict query/queries which the elements have to match.
-            limit: max number of documents to return.
-            skip: number of documents to skip first.
-            sort: sort field
-            order: sort order
             user: request user
             permission: AccessControlPermission
-            *args:
-            **kwargs:
 
         Returns:
-            The `FrameworkQueryBuilder` query pipeline with the parameter contents.
+            List of pipeline stages
         """
-        self.clear()
-        self.query = Pipeline([])
+        stages = super(ObjectQueryBuilder, self).filter_stages(filter)
+        if user and permission:
+            stages += (AccessControlQueryBuilder(database_manager=self.database_manager)
+                       .build(group_id=PublicID(user.group_id), permission=permission))
+        return stages
 
-        if isinstance(filter, dict):
-            self.query.append(self.match_(filter))
-        elif isinstance(filter, list):
-            for pipe in filter:
-                self.query.append(pipe)
+    def result_stages(self, limit: int, skip: int, sort: str, order: int, cursor=None) -> List[dict]:
+        """
+        Stages which sort and page the selected objects
+        Args:
+            limit: max number of documents to return.
+            skip: number of documents to skip first.
+            sort: sort field - `fields.<name>` sorts by a field value
+            order: sort order
+            cursor: keyset cursor (`APICursor`) - replaces the skip with a range match
 
-        if user and permission:
-            self.query += (AccessControlQueryBuilder().build(group_id=PublicID(user.group_id), permission=permission))
+        Returns:
+            List of pipeline stages
+        """
+        if cursor is not None:
+            if sort.startswith('fields'):
+                raise ValueError('Cursor pagination is not supported for sorting by field values')
+            return self.keyset_(sort=sort, order=order, limit=limit, cursor=cursor)
 
         if limit == 0:
             results_query = [self.skip_(limit)]
@@ -75,7 +84,7 @@ class ObjectQueryBuilder(ManagerQueryBuilder):
         # TODO: Remove nasty quick hack
         if sort.startswith('fields'):
             sort_value = sort[7:]
-            self.query.append({'$addFields': {
+            return [{'$addFields': {
                 'order': {
                     '$filter': {
                         'input': '$fields',
@@ -83,46 +92,14 @@ class ObjectQueryBuilder(ManagerQueryBuilder):
                         'cond': {'$eq': ['$$fields.name', sort_value]}
                     }
                 }
-            }})
-            self.query.append({'$sort': {'order': order}})
-        else:
-            self.query.append(self.sort_(sort=sort, order=order))
-
-        self.query += results_query
-        return self.query
-
-    def count(self, filter: Union[List[dict], dict], user: UserModel = None,
-              permission: AccessControlPermission = None) -> Union[Query, Pipeline]:
-        """
-        Count the number of documents in the stages
-        Args:
-            filter: filter requirement
-            user: request user
-            permission: acl permission
-
-        Returns:
-            Query with count stages.
-        """
-        self.clear()
-        self.query = Pipeline([])
-
-        if isinstance(filter, dict):
-            self.query.append(self.match_(filter))
-        elif isinstance(filter, list):
-            for pipe in filter:
-                self.query.append(pipe)
-
-        if user and permission:
-            self.query += (AccessControlQueryBuilder().build(group_id=PublicID(user.group_id), permission=permission))
-
-        self.query.append(self.count_('total'))
-        return self.query
+            }}, {'$sort': {'order': order}}] + results_query
+        return [self.sort_(sort=sort, order=order)] + results_query
 
 
 class ObjectManager(ManagerBase):
 
     def __init__(self, database_manager: DatabaseManagerMongo):
-        self.object_builder = ObjectQueryBuilder()
+        self.object_builder = ObjectQueryBuilder(database_manager=database_manager)
         super(ObjectManager, self).__init__(CmdbObject.COLLECTION, database_manager=database_manager)
 
     def get(self, public_id: Union[PublicID, int], user: UserModel = None,
@@ -151,15 +128,10 @@ class ObjectManager(ManagerBase):
                 user: UserModel = None, permission: AccessControlPermission = None, *args, **kwargs) \
             -> IterationResult[CmdbObject]:
         try:
-            query: Pipeline = self.object_builder.build(filter=filter, limit=limit, skip=skip, sort=sort, order=order,
-                                                        user=user, permission=permission)
-            count_query: Pipeline = self.object_builder.count(filter=filter, user=user, permission=permission)
-            aggregation_result = list(self._aggregate(self.collection, query))
-            total_cursor = self._aggregate(self.collection, count_query)
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
-        except ManagerGetError as err:
+            aggregation_result, total = self._iterate(self.object_builder, filter=filter, limit=limit, skip=skip,
+                                                      sort=sort, order=order, count=kwargs.get('count'),
+                                                      cursor=kwargs.get('cursor'), user=user, permission=permission)
+        except (ManagerGetError, ValueError) as err:
             raise ManagerIterationError(err=err)
         iteration_result: IterationResult[CmdbObject] = IterationResult(aggregation_result, total)
         iteration_result.convert_to(CmdbObject)
@@ -201,4 +173,5 @@ class ObjectManager(ManagerBase):
             }
         })
         return self.iterate(filter=query, limit=limit, skip=skip, sort=sort, order=order,
-                            user=user, permission=permission)
+                            user=user, permission=permission, cursor=kwargs.get('cursor'),
+                            count=kwargs.get('count'))
@@ -22,7 +22,7 @@ from cmdb.framework.results.iteration import IterationResult
 from cmdb.framework.results.list import ListResult
 from cmdb.framework.utils import PublicID
 from cmdb.manager import ManagerGetError, ManagerIterationError, ManagerUpdateError, ManagerDeleteError
-from cmdb.search import Pipeline
+from cmdb.security.acl.builder import AccessControlTypeCache
 
 
 class TypeManager(ManagerBase):
@@ -50,19 +50,15 @@ class TypeManager(ManagerBase):
             skip: number of elements to skip first
             sort: sort field
             order: sort order
+            count (optional): `CountMode` of the total
 
         Returns:
             IterationResult: Instance of IterationResult with generic TypeModel.
         """
 
         try:
-            query: Pipeline = self.builder.build(filter=filter, limit=limit, skip=skip, sort=sort, order=order)
-            count_query: Pipeline = self.builder.count(filter=filter)
-            aggregation_result = list(self._aggregate(self.collection, query))
-            total_cursor = self._aggregate(self.collection, count_query)
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            aggregation_result, total = self._iterate(self.builder, filter=filter, limit=limit, skip=skip,
+                                                      sort=sort, order=order, count=kwargs.get('count'))
         except ManagerGetError as err:
             raise ManagerIterationError(err=err)
         iteration_result: IterationResult[TypeModel] = IterationResult(aggregation_result, total)
@@ -112,7 +108,9 @@ class TypeManager(ManagerBase):
         """
         if isinstance(type, TypeModel):
             type = TypeModel.to_json(type)
-        return self._insert(self.collection, resource=type)
+        result = self._insert(self.collection, resource=type)
+        AccessControlTypeCache.invalidate(self._database_manager)
+        return result
 
     def update(self, public_id: Union[PublicID, int], type: Union[TypeModel, dict]):
         """
@@ -128,6 +126,7 @@ class TypeManager(ManagerBase):
         if isinstance(type, TypeModel):
             type = TypeModel.to_json(type)
         update_result = self._update(self.collection, filter={'public_id': public_id}, resource=type)
+        AccessControlTypeCache.invalidate(self._database_manager)
         if update_result.matched_count != 1:
             raise ManagerUpdateError(f'Something happened during the update!')
         return update_result
@@ -144,6 +143,7 @@ class TypeManager(ManagerBase):
         """
         raw_type: TypeModel = self.get(public_id=public_id)
         delete_result = self._delete(self.collection, filter={'public_id': public_id})
+        AccessControlTypeCache.invalidate(self._database_manager)
         if delete_result.deleted_count == 0:
             raise ManagerDeleteError(err='No type matched this public id')
         return raw_type
@@ -0,0 +1,85 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2019 - 2021 NETHINKS GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+import re
+from typing import List, Union
+
+from cmdb.framework.cmdb_dao import CmdbDAO
+from cmdb.framework.cmdb_object import CmdbObject
+from cmdb.framework.utils import Model, Collection
+
+
+class SearchIndexModel(CmdbDAO):
+    """
+    Search index entry of a single object.
+    Holds the normalized word tokens and the text values of the object fields,
+    so the quick search can resolve a term with an indexed prefix match instead of a regex over all objects.
+    """
+    COLLECTION: Collection = 'framework.search_index'
+    MODEL: Model = 'SearchIndex'
+
+    TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+    INDEX_KEYS = [
+        {'keys': [('tokens', CmdbDAO.DAO_ASCENDING)], 'name': 'tokens', 'unique': False},
+        {'keys': [('type_id', CmdbDAO.DAO_ASCENDING)], 'name': 'type_id', 'unique': False}
+    ]
+
+    def __init__(self, public_id: int, type_id: int, active: bool = True, tokens: List[str] = None,
+                 values: List[str] = None):
+        self.type_id: int = type_id
+        self.active: bool = active
+        self.tokens: List[str] = tokens or []
+        self.values: List[str] = values or []
+        super(SearchIndexModel, self).__init__(public_id=public_id)
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        """Split a text into lower case word tokens"""
+        return cls.TOKEN_PATTERN.findall(text.lower())
+
+    @classmethod
+    def from_object(cls, object_: Union[CmdbObject, dict]) -> "SearchIndexModel":
+        """
+        Create the index entry of an object.
+        Only text values are indexed - like the regex search, which only matches strings.
+        """
+        data: dict = object_ if isinstance(object_, dict) else object_.__dict__
+        values: List[str] = []
+        for field in data.get('fields') or []:
+            value = field.get('value')
+            if isinstance(value, str):
+                values.append(value)
+            elif isinstance(value, list):
+                values += [item for item in value if isinstance(item, str)]
+        values = [value for value in values if value]
+        tokens = sorted({token for value in values for token in cls.tokenize(value)})
+        return cls(public_id=data.get('public_id'), type_id=data.get('type_id'), active=data.get('active', True),
+                   tokens=tokens, values=values)
+
+    @classmethod
+    def from_data(cls, data: dict) -> "SearchIndexModel":
+        return cls(public_id=data.get('public_id'), type_id=data.get('type_id'), active=data.get('active', True),
+                   tokens=data.get('tokens', None), values=data.get('values', None))
+
+    @classmethod
+    def to_data(cls, instance: "SearchIndexModel") -> dict:
+        return {
+            'public_id': instance.get_public_id(),
+            'type_id': instance.type_id,
+            'active': instance.active,
+            'tokens': instance.tokens,
+            'values': instance.values
+        }
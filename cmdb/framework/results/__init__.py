@@ -14,8 +14,9 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from .iteration import IterationResult
+from .iteration import IterationResult, CountMode
 
 __all__ = [
-    IterationResult
+    IterationResult,
+    CountMode
 ]
@@ -14,6 +14,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
+from enum import Enum
 from typing import TypeVar, Generic, List, Union, Type
 
 from cmdb.framework import CmdbDAO
@@ -21,15 +22,23 @@ from cmdb.framework import CmdbDAO
 C = TypeVar('C', bound=CmdbDAO)
 
 
+class CountMode(Enum):
+    """How the total number of elements of an iteration is computed"""
+    NONE = 'none'
+    ESTIMATED = 'estimated'
+    EXACT = 'exact'
+    ONLY = 'only'
+
+
 class IterationResult(Generic[C]):
     """Framework Result for a iteration call over a collection"""
 
-    def __init__(self, results: List[Union[C, dict]], total: int):
+    def __init__(self, results: List[Union[C, dict]], total: int = None):
         """
         Constructor of IterationResult
         Args:
             results: List of raw oder generic database results
-            total: Total number of elements in the query.
+            total: Total number of elements in the query - None if it was not counted.
         """
         self.results = results
         self.count = len(self.results)
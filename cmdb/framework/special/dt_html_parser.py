@@ -22,9 +22,13 @@ from flask import abort
 
 class DtHtmlParser:
 
-    def __init__(self, object_manager: CmdbObjectManager, current_field=None):
+    def __init__(self, object_manager: CmdbObjectManager, current_field=None, reference_objects: dict = None,
+                 reference_types: dict = None):
         self.object_manager: CmdbObjectManager = object_manager
         self.current_field = current_field
+        # Preloaded references (public_id -> instance) of a batch render
+        self.reference_objects: dict = reference_objects
+        self.reference_types: dict = reference_types or {}
 
     def field_to_html(self, field_type):
         """Dispatch method"""
@@ -56,13 +60,23 @@ class DtHtmlParser:
     def ref(self):
         html_content = 'No reference set'
         if self.current_field['value']:
-            try:
-                ref_object = self.object_manager.get_object(int(self.current_field['value']))
-            except ObjectManagerGetError as err:
-                return '<span>%s</span>' % html_content
+            if self.reference_objects is not None:
+                ref_object = self.reference_objects.get(int(self.current_field['value']))
+                if not ref_object:
+                    return '<span>%s</span>' % html_content
+            else:
+                try:
+                    ref_object = self.object_manager.get_object(int(self.current_field['value']))
+                except ObjectManagerGetError as err:
+                    return '<span>%s</span>' % html_content
 
             try:
-                ref_type = self.object_manager.get_type(ref_object.get_type_id())
+                if self.reference_objects is not None:
+                    ref_type = self.reference_types.get(ref_object.get_type_id())
+                    if not ref_type:
+                        return '<span>%s</span>' % html_content
+                else:
+                    ref_type = self.object_manager.get_type(ref_object.get_type_id())
                 html_content = '<i class="%s"></i> %s #%s' % (ref_type.get_icon(), ref_type.label, ref_object.public_id)
                 html_content += ' - '
 
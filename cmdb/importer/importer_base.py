@@ -17,11 +17,11 @@
 Module of basic importers
 """
 import logging
-from typing import Optional
+from itertools import islice
+from typing import Optional, Iterable, Iterator, List, Tuple
 
 from cmdb.framework import CmdbObject
-from cmdb.framework.cmdb_errors import ObjectManagerGetError, ObjectManagerInsertError, \
-    ObjectManagerDeleteError
+from cmdb.framework.cmdb_errors import ObjectManagerInsertError
 from cmdb.framework.cmdb_object_manager import CmdbObjectManager
 from cmdb.importer.importer_config import ObjectImporterConfig, BaseImporterConfig
 from cmdb.importer.importer_response import BaseImporterResponse, ImporterObjectResponse, ImportFailedMessage, \
@@ -29,7 +29,7 @@ from cmdb.importer.importer_response import BaseImporterResponse, ImporterObject
 from cmdb.importer.parser_base import BaseObjectParser
 from cmdb.importer.parser_response import ObjectParserResponse
 from cmdb.user_management import UserModel
-from cmdb.security.acl.permission import AccessControlPermission
+from cmdb.utils.error import CMDBError
 
 LOGGER = logging.getLogger(__name__)
 
@@ -107,92 +107,103 @@ class ObjectImporter(BaseImporter):
             object_instance_list.append(self.generate_object(entry, *args, **kwargs))
         return object_instance_list
 
+    def _iter_objects(self, entries: Iterable, *args, **kwargs) -> Iterator[dict]:
+        """Lazy version of _generate_objects - generates the objects while the entries are consumed"""
+        for entry in entries:
+            yield self.generate_object(entry, *args, **kwargs)
+
     def generate_object(self, entry, *args, **kwargs) -> dict:
         """Generation of the CMDB-Objects based on the parser response
         and the imported fields"""
         raise NotImplementedError
 
-    def _import(self, import_objects: list) -> ImporterObjectResponse:
+    def _import(self, import_objects: Iterable[dict], in_range: bool = False) -> ImporterObjectResponse:
         """Basic import wrapper - starting the import process
+        The objects are validated and written in batches of the configured `batch_size`.
         Args:
-            import_objects: list of all objects for import - or output of _generate_objects()
+            import_objects: list or iterable of all objects for import - or output of _generate_objects()
+            in_range: objects are already limited to the start_element/max_elements of the config
         """
         run_config = self.get_config()
+        batch_size: int = run_config.get_batch_size()
 
         success_imports: [ImportSuccessMessage] = []
         failed_imports: [ImportFailedMessage] = []
 
-        current_import_index = run_config.start_element
+        if in_range:
+            working_objects = import_objects
+        else:
+            stop_index = run_config.max_elements if run_config.max_elements > 0 else None
+            working_objects = islice(import_objects, run_config.start_element, stop_index)
+
+        LOGGER.info(f'Starting import with a batch size of {batch_size}')
         importer_counter = 0
-        import_objects_length: int = len(import_objects)
+        current_batch: List[dict] = []
+        for current_import_object in working_objects:
+            current_batch.append(current_import_object)
+            if len(current_batch) >= batch_size:
+                self._import_batch(current_batch, success_imports, failed_imports)
+                importer_counter += len(current_batch)
+                current_batch = []
+        if current_batch:
+            self._import_batch(current_batch, success_imports, failed_imports)
+            importer_counter += len(current_batch)
 
-        LOGGER.info(f'Starting import of {import_objects_length} objects')
-        while current_import_index < import_objects_length:
+        return ImporterObjectResponse(
+            message=f'Import of {importer_counter} objects',
+            success_imports=success_imports,
+            failed_imports=failed_imports
+        )
 
-            current_import_object: dict = import_objects[current_import_index]
-            LOGGER.debug(f'Current working object: {current_import_object}')
+    def _import_batch(self, import_objects: List[dict], success_imports: List[ImportSuccessMessage],
+                      failed_imports: List[ImportFailedMessage]):
+        """Validate and write one batch of objects
+        Objects without a PublicID get one from a single id reservation,
+        existing objects with the same PublicID are replaced.
+        Args:
+            import_objects: objects of the current batch
+            success_imports: list where the successful imports are appended
+            failed_imports: list where the failed imports are appended
+        """
+        run_config = self.get_config()
 
+        valid_objects: List[Tuple[dict, CmdbObject]] = []
+        for current_import_object in import_objects:
             current_public_id: (int, None) = current_import_object.get('public_id')
-            LOGGER.debug(f'Current working public id: {current_public_id}')
 
             # Object has PublicID and can not overwrite
             if current_public_id is not None and not run_config.overwrite_public:
                 failed_imports.append(ImportFailedMessage(
                     error_message='Object import for object - has PublicID but not overwrite setting',
                     obj=current_import_object))
-                current_import_index += 1
                 continue
 
-            # Object has no PublicID <- assign new
-            elif not current_public_id:
-                current_public_id = self.object_manager.get_new_id(CmdbObject.COLLECTION)
-                LOGGER.debug(f'Assign new PublicID: {current_public_id}')
-                current_import_object.update({'public_id': current_public_id})
-            # else assign given PublicID
-            else:
-                current_public_id = current_import_object.get('public_id')
-                LOGGER.debug(f'Assign given PublicID: {current_public_id}')
-
-            # Insert data
             try:
-                self.object_manager.get_object(current_public_id)
-            except ObjectManagerGetError:
-                try:
-                    self.object_manager.insert_object(current_import_object)
-                except ObjectManagerInsertError as err:
-                    failed_imports.append(ImportFailedMessage(error_message=err.message, obj=current_import_object))
-                    current_import_index += 1
-                    continue
-                else:
-                    success_imports.append(ImportSuccessMessage(public_id=current_public_id, obj=current_import_object))
+                object_instance = CmdbObject(**{**current_import_object, 'public_id': current_public_id or 0})
+            except (CMDBError, TypeError, ValueError) as err:
+                error = ObjectManagerInsertError(getattr(err, 'message', err))
+                failed_imports.append(ImportFailedMessage(error_message=error.message, obj=current_import_object))
+                continue
+            valid_objects.append((current_import_object, object_instance))
+
+        # Object has no PublicID <- assign new
+        missing_public_ids = [entry for entry in valid_objects if not entry[1].public_id]
+        new_public_ids = self.object_manager.get_new_ids(CmdbObject.COLLECTION, len(missing_public_ids))
+        for (current_import_object, object_instance), new_public_id in zip(missing_public_ids, new_public_ids):
+            object_instance.public_id = new_public_id
+            current_import_object.update({'public_id': new_public_id})
+        LOGGER.debug(f'Assigned {len(missing_public_ids)} new PublicIDs')
+
+        # Insert data
+        failed_objects = self.object_manager.upsert_objects([entry[1] for entry in valid_objects],
+                                                            user=self.request_user)
+        for idx, (current_import_object, object_instance) in enumerate(valid_objects):
+            if idx in failed_objects:
+                error = ObjectManagerInsertError(failed_objects[idx])
+                failed_imports.append(ImportFailedMessage(error_message=error.message, obj=current_import_object))
             else:
-                try:
-                    self.object_manager.delete_object(current_public_id, self.request_user)
-                except ObjectManagerDeleteError as err:
-                    failed_imports.append(ImportFailedMessage(error_message=err.message, obj=current_import_object))
-                    current_import_index += 1
-                    continue
-                else:
-                    try:
-                        self.object_manager.insert_object(current_import_object)
-                    except ObjectManagerInsertError as err:
-                        failed_imports.append(ImportFailedMessage(error_message=err.message, obj=current_import_object))
-                        current_import_index += 1
-                        continue
-                    else:
-                        success_imports.append(
-                            ImportSuccessMessage(public_id=current_public_id, obj=current_import_object))
-
-            # check if still import valid
-            current_import_index += 1
-            if run_config.max_elements > 0 and (current_import_index >= run_config.max_elements):
-                break
-
-        return ImporterObjectResponse(
-            message=f'Import of {importer_counter} objects',
-            success_imports=success_imports,
-            failed_imports=failed_imports
-        )
+                success_imports.append(ImportSuccessMessage(public_id=object_instance.public_id,
+                                                            obj=current_import_object))
 
     def start_import(self) -> ImporterObjectResponse:
         """Starting the import process.
@@ -33,14 +33,19 @@ class BaseImporterConfig:
 
 
 class ObjectImporterConfig(BaseImporterConfig):
+    DEFAULT_BATCH_SIZE: int = 1000
 
     def __init__(self, type_id: int, mapping: list = None, start_element: int = 0, max_elements: int = 0,
-                 overwrite_public: bool = True, *args, **kwargs):
+                 overwrite_public: bool = True, batch_size: int = None, *args, **kwargs):
         self.type_id: int = type_id
         self.start_element: int = start_element
         self.max_elements: int = max_elements
         self.overwrite_public: bool = overwrite_public
+        self.batch_size: int = int(batch_size) if batch_size and int(batch_size) > 0 else self.DEFAULT_BATCH_SIZE
         super(ObjectImporterConfig, self).__init__(mapping=mapping)
 
     def get_type_id(self):
         return self.type_id
+
+    def get_batch_size(self) -> int:
+        return self.batch_size
@@ -16,7 +16,8 @@
 
 import logging
 import datetime
-from typing import List
+from itertools import islice
+from typing import List, Dict, Tuple, Iterable, Iterator
 
 from cmdb.framework import CmdbObject
 from cmdb.framework.cmdb_errors import ObjectManagerGetError
@@ -28,7 +29,7 @@ from cmdb.importer.importer_base import ObjectImporter
 from cmdb.importer.importer_config import ObjectImporterConfig
 from cmdb.importer.importer_response import ImporterObjectResponse
 from cmdb.importer.mapper import Mapping, MapEntry
-from cmdb.importer.parser_object import JsonObjectParserResponse, CsvObjectParserResponse, ExcelObjectParserResponse
+from cmdb.importer.parser_object import ExcelObjectParserResponse
 from cmdb.importer.improve_object import ImproveObject
 from cmdb.user_management import UserModel
 
@@ -50,9 +51,10 @@ class JsonObjectImporterConfig(ObjectImporterConfig, JSONContent):
     MANUALLY_MAPPING = False
 
     def __init__(self, type_id: int, mapping: Mapping = None, start_element: int = 0, max_elements: int = 0,
-                 overwrite_public: bool = True, *args, **kwargs):
+                 overwrite_public: bool = True, batch_size: int = None, *args, **kwargs):
         super(JsonObjectImporterConfig, self).__init__(type_id=type_id, mapping=mapping, start_element=start_element,
-                                                       max_elements=max_elements, overwrite_public=overwrite_public)
+                                                       max_elements=max_elements, overwrite_public=overwrite_public,
+                                                       batch_size=batch_size)
 
 
 class JsonObjectImporter(ObjectImporter, JSONContent):
@@ -100,11 +102,15 @@ class JsonObjectImporter(ObjectImporter, JSONContent):
         return working
 
     def start_import(self) -> ImporterObjectResponse:
-        parsed_response: JsonObjectParserResponse = self.parser.parse(self.file)
         type_instance_fields: List = self.object_manager.get_type(self.config.get_type_id()).get_fields()
 
-        import_objects: [dict] = self._generate_objects(parsed_response, fields=type_instance_fields)
-        import_result: ImporterObjectResponse = self._import(import_objects)
+        entries = self.parser.iter_entries(self.file, start_element=self.config.start_element,
+                                           max_elements=self.config.max_elements)
+        try:
+            import_objects = self._iter_objects(entries, fields=type_instance_fields)
+            import_result: ImporterObjectResponse = self._import(import_objects, in_range=True)
+        except ParserRuntimeError as pre:
+            raise ImportRuntimeError(self.__class__.__name__, pre)
 
         return import_result
 
@@ -113,9 +119,10 @@ class CsvObjectImporterConfig(ObjectImporterConfig, CSVContent):
     MANUALLY_MAPPING = True
 
     def __init__(self, type_id: int, mapping: list = None, start_element: int = 0, max_elements: int = 0,
-                 overwrite_public: bool = True, *args, **kwargs):
+                 overwrite_public: bool = True, batch_size: int = None, *args, **kwargs):
         super(CsvObjectImporterConfig, self).__init__(type_id=type_id, mapping=mapping, start_element=start_element,
-                                                      max_elements=max_elements, overwrite_public=overwrite_public)
+                                                      max_elements=max_elements, overwrite_public=overwrite_public,
+                                                      batch_size=batch_size)
 
 
 class CsvObjectImporter(ObjectImporter, CSVContent):
@@ -125,6 +132,61 @@ class CsvObjectImporter(ObjectImporter, CSVContent):
         super(CsvObjectImporter, self).__init__(file=file, file_type=self.FILE_TYPE, config=config, parser=parser,
                                                 object_manager=object_manager, request_user=request_user)
 
+    def _iter_objects(self, entries: Iterable, *args, **kwargs) -> Iterator[dict]:
+        """Generates the objects in chunks of the batch size.
+        The references of every chunk are resolved with one query before the objects are generated."""
+        entries = iter(entries)
+        batch_size: int = self.get_config().get_batch_size()
+        while True:
+            current_entries: List[dict] = list(islice(entries, batch_size))
+            if not current_entries:
+                break
+            references = self._resolve_references(current_entries)
+            for entry in current_entries:
+                yield self.generate_object(entry, *args, references=references, **kwargs)
+
+    def _resolve_references(self, entries: List[dict]) -> Dict[Tuple[int, str], Dict[object, List[int]]]:
+        """Load the objects of all ref mappings for the values of the entries with a single aggregation
+        Args:
+            entries: parsed csv rows
+        Returns:
+            public ids of the found objects, by (type_id, ref_name) and the field value
+        """
+        foreign_entries: List[MapEntry] = self.get_config().get_mapping().get_entries_with_option(
+            query={'type': 'ref'})
+        lookup_values: Dict[Tuple[int, str], set] = {}
+        for foreign_entry in foreign_entries:
+            try:
+                lookup_key = (foreign_entry.get_option()['type_id'], foreign_entry.get_option()['ref_name'])
+            except (KeyError, IndexError):
+                continue
+            lookup_values.setdefault(lookup_key, set()).update(
+                entry.get(foreign_entry.get_value()) for entry in entries)
+
+        references: Dict[Tuple[int, str], Dict[object, List[int]]] = {key: {} for key in lookup_values}
+        if not lookup_values:
+            return references
+
+        lookup_queries = [{'type_id': type_id, 'fields.name': ref_name, 'fields.value': {'$in': list(values)}}
+                          for (type_id, ref_name), values in lookup_values.items()]
+        pipeline = [
+            {'$match': {'$or': lookup_queries}},
+            {'$unwind': '$fields'},
+            {'$match': {'$or': lookup_queries}},
+            {'$group': {
+                '_id': {'type_id': '$type_id', 'ref_name': '$fields.name', 'value': '$fields.value'},
+                'public_ids': {'$addToSet': '$public_id'}
+            }}
+        ]
+        LOGGER.debug(f'[CSV] Ref pipeline: {pipeline}')
+        try:
+            for result in self.object_manager.aggregate(CmdbObject.COLLECTION, pipeline=pipeline):
+                group = result['_id']
+                references[(group['type_id'], group['ref_name'])][group.get('value')] = result['public_ids']
+        except (ObjectManagerGetError, KeyError) as err:
+            LOGGER.error(f'[CSV] Error while loading ref objects {err}')
+        return references
+
     def generate_object(self, entry: dict, *args, **kwargs) -> dict:
         try:
             possible_fields: List[dict] = kwargs['fields']
@@ -143,6 +205,9 @@ class CsvObjectImporter(ObjectImporter, CSVContent):
         property_entries: List[MapEntry] = current_mapping.get_entries_with_option(query={'type': 'property'})
         field_entries: List[MapEntry] = current_mapping.get_entries_with_option(query={'type': 'field'})
         foreign_entries: List[MapEntry] = current_mapping.get_entries_with_option(query={'type': 'ref'})
+        references = kwargs.get('references')
+        if references is None:
+            references = self._resolve_references([entry])
 
         # field/properties improvement
         improve_object = ImproveObject(entry, property_entries, field_entries, possible_fields)
@@ -164,49 +229,33 @@ class CsvObjectImporter(ObjectImporter, CSVContent):
         for foreign_entry in foreign_entries:
             LOGGER.debug(f'[CSV] search for object based on {foreign_entry.__dict__}')
             try:
-                working_type_id = foreign_entry.get_option()['type_id']
+                lookup_key = (foreign_entry.get_option()['type_id'], foreign_entry.get_option()['ref_name'])
             except (KeyError, IndexError) as err:
                 continue
-            try:
-                query: dict = {
-                    'type_id': working_type_id,
-                    'fields': {
-                        '$elemMatch': {
-                            '$and': [
-                                {'name': foreign_entry.get_option()['ref_name']},
-                                {'value': entry.get(foreign_entry.get_value())},
-                            ]
-                        }
-                    }
-                }
-                LOGGER.debug(f'[CSV] Ref query: {query}')
-                founded_objects: List[CmdbObject] = self.object_manager.get_objects_by(**query)
-                LOGGER.debug(founded_objects)
-                if len(founded_objects) != 1:
-                    continue
-                else:
-                    working_object['fields'].append(
-                        {'name': foreign_entry.get_name(),
-                         'value': founded_objects[0].get_public_id()
-                    })
-
-            except (ObjectManagerGetError, Exception) as err:
-                LOGGER.error(f'[CSV] Error while loading ref object {err.message}')
+            lookup_value = entry.get(foreign_entry.get_value())
+            founded_objects: List[int] = references.get(lookup_key, {}).get(lookup_value, [])
+            if len(founded_objects) != 1:
+                LOGGER.debug(f'[CSV] Ref {foreign_entry.get_name()} with value {lookup_value} '
+                             f'found {len(founded_objects)} objects - field skipped')
                 continue
+            working_object['fields'].append(
+                {'name': foreign_entry.get_name(),
+                 'value': founded_objects[0]
+                 })
 
         return working_object
 
     def start_import(self) -> ImporterObjectResponse:
+        type_instance_fields: List[dict] = self.object_manager.get_type(self.config.get_type_id()).get_fields()
+
+        entries = self.parser.iter_entries(self.file, start_element=self.config.start_element,
+                                           max_elements=self.config.max_elements)
         try:
-            parsed_response: CsvObjectParserResponse = self.parser.parse(self.file)
+            import_objects = self._iter_objects(entries, fields=type_instance_fields)
+            import_result: ImporterObjectResponse = self._import(import_objects, in_range=True)
         except ParserRuntimeError as pre:
             raise ImportRuntimeError(self.__class__.__name__, pre)
 
-        type_instance_fields: List[dict] = self.object_manager.get_type(self.config.get_type_id()).get_fields()
-
-        import_objects: [dict] = self._generate_objects(parsed_response, fields=type_instance_fields)
-        import_result: ImporterObjectResponse = self._import(import_objects)
-
         return import_result
 
 
@@ -214,9 +263,10 @@ class ExcelObjectImporterConfig(ObjectImporterConfig, XLSXContent):
     MANUALLY_MAPPING = True
 
     def __init__(self, type_id: int, mapping: list = None, start_element: int = 0, max_elements: int = 0,
-                 overwrite_public: bool = True, *args, **kwargs):
+                 overwrite_public: bool = True, batch_size: int = None, *args, **kwargs):
         super(ExcelObjectImporterConfig, self).__init__(type_id=type_id, mapping=mapping, start_element=start_element,
-                                                        max_elements=max_elements, overwrite_public=overwrite_public)
+                                                        max_elements=max_elements, overwrite_public=overwrite_public,
+                                                        batch_size=batch_size)
 
 
 class ExcelObjectImporter(ObjectImporter, XLSXContent):
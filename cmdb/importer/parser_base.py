@@ -15,6 +15,8 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
+from itertools import islice
+from typing import Iterator
 
 from cmdb.importer.parser_response import ParserResponse, ObjectParserResponse
 
@@ -51,6 +53,12 @@ class BaseObjectParser(BaseParser):
     def parse(self, file) -> ObjectParserResponse:
         raise NotImplementedError
 
+    def iter_entries(self, file, start_element: int = 0, max_elements: int = 0) -> Iterator:
+        """Iterate over the parsed entries between `start_element` and `max_elements`.
+        Parsers which can read their files lazily should override this - the default parses the whole file."""
+        stop_element = max_elements if max_elements > 0 else None
+        return islice(self.parse(file).entries, start_element, stop_element)
+
 
 class BaseTypeParser(BaseParser):
     DEFAULT_CONFIG = {}
@@ -17,6 +17,8 @@
 import csv
 import json
 import logging
+from itertools import islice
+from typing import Iterator
 
 from openpyxl.worksheet.worksheet import Worksheet
 
@@ -44,11 +46,61 @@ class JsonObjectParser(BaseObjectParser, JSONContent):
     def __init__(self, parser_config: dict = None):
         super(JsonObjectParser, self).__init__(parser_config)
 
+    READ_CHUNK_SIZE = 64 * 1024
+
     def parse(self, file) -> (dict, list, JsonObjectParserResponse):
+        parsed = list(self.iter_entries(file))
+        return JsonObjectParserResponse(count=len(parsed), entries=parsed)
+
+    def iter_entries(self, file, start_element: int = 0, max_elements: int = 0) -> Iterator[dict]:
+        """Lazy parsing of the file content.
+        A top-level array is decoded element by element, so only the current element is held in memory.
+
+        Args:
+            file: path to the json file
+            start_element: index of the first entry which will be yielded
+            max_elements: index where the parsing stops - 0 means until the end of the file
+
+        Raises:
+            ParserRuntimeError: if the content is not valid json
+        """
+        stop_element = max_elements if max_elements > 0 else None
+        return islice(self.__iter_array(file), start_element, stop_element)
+
+    def __iter_array(self, file) -> Iterator[dict]:
         run_config = self.get_config()
+        decoder = json.JSONDecoder()
         with open(file, 'r', encoding=run_config.get('encoding')) as json_file:
-            parsed = json.load(json_file)
-        return JsonObjectParserResponse(count=len(parsed), entries=parsed)
+            buffer = json_file.read(self.READ_CHUNK_SIZE).lstrip()
+            if not buffer.startswith('['):
+                # no array - nothing to stream
+                try:
+                    parsed = json.loads(buffer + json_file.read())
+                except ValueError as err:
+                    raise ParserRuntimeError(self.__class__.__name__, err)
+                yield from parsed if isinstance(parsed, list) else [parsed]
+                return
+
+            buffer = buffer[1:]
+            end_of_file = False
+            while True:
+                buffer = buffer.lstrip().lstrip(',').lstrip()
+                if buffer.startswith(']'):
+                    return
+                try:
+                    entry, position = decoder.raw_decode(buffer)
+                except ValueError as err:
+                    entry, position = None, None
+                    if end_of_file:
+                        raise ParserRuntimeError(self.__class__.__name__, err)
+                # a decoded value which ends with the buffer could be cut (e.g. numbers)
+                if position is None or (position == len(buffer) and not end_of_file):
+                    chunk = json_file.read(self.READ_CHUNK_SIZE)
+                    end_of_file = not chunk
+                    buffer += chunk
+                    continue
+                yield entry
+                buffer = buffer[position:]
 
 
 class CsvObjectParserResponse(ObjectParserResponse):
@@ -101,18 +153,11 @@ class CsvObjectParser(BaseObjectParser, CSVContent):
         }
         try:
             with open(f'{file}', 'r', newline=run_config.get('newline')) as csv_file:
-                csv_reader = csv.reader(csv_file,
-                                        delimiter=run_config.get('delimiter'),
-                                        quotechar=run_config.get('quoteChar'),
-                                        escapechar=run_config.get('escapeChar'),
-                                        skipinitialspace=True)
+                csv_reader = self.__get_reader(csv_file)
                 if run_config.get('header'):
                     parsed['header'] = next(csv_reader)
                 for row in csv_reader:
-                    row_list = []
-                    for entry in row:
-                        row_list.append(auto_cast(entry))
-                    parsed.get('entries').append(self.__generate_index_pair(row_list))
+                    parsed.get('entries').append(self.__generate_index_pair([auto_cast(entry) for entry in row]))
                     parsed['count'] = parsed['count'] + 1
 
                 if len(parsed.get('entries')) > 0:
@@ -124,6 +169,47 @@ class CsvObjectParser(BaseObjectParser, CSVContent):
             raise ParserRuntimeError(self.__class__.__name__, err)
         return CsvObjectParserResponse(**parsed)
 
+    def iter_entries(self, file, start_element: int = 0, max_elements: int = 0) -> Iterator[dict]:
+        """Lazy parsing of the file content - only the current row is held in memory.
+        Rows before `start_element` are skipped without casting and no row after `max_elements` is read.
+
+        Args:
+            file: path to the csv file
+            start_element: index of the first row which will be yielded
+            max_elements: index where the parsing stops - 0 means until the end of the file
+
+        Raises:
+            ParserRuntimeError: if the file could not be parsed or has no content rows
+        """
+        run_config = self.get_config()
+        try:
+            with open(f'{file}', 'r', newline=run_config.get('newline')) as csv_file:
+                csv_reader = self.__get_reader(csv_file)
+                if run_config.get('header'):
+                    next(csv_reader)
+                row_count: int = 0
+                for row in csv_reader:
+                    row_count += 1
+                    if max_elements > 0 and row_count > max_elements:
+                        break
+                    if row_count > start_element:
+                        yield self.__generate_index_pair([auto_cast(entry) for entry in row])
+                if row_count == 0:
+                    raise ParserRuntimeError(self.__class__.__name__, 'No content data!')
+        except ParserRuntimeError:
+            raise
+        except Exception as err:
+            LOGGER.error(err)
+            raise ParserRuntimeError(self.__class__.__name__, err)
+
+    def __get_reader(self, csv_file):
+        run_config = self.get_config()
+        return csv.reader(csv_file,
+                          delimiter=run_config.get('delimiter'),
+                          quotechar=run_config.get('quoteChar'),
+                          escapechar=run_config.get('escapeChar'),
+                          skipinitialspace=True)
+
 
 class ExcelObjectParserResponse(ObjectParserResponse):
 
@@ -18,6 +18,9 @@ from enum import Enum
 from json import loads
 from typing import NewType, List, Union
 
+from cmdb.framework.results import CountMode
+from cmdb.interface.pagination import APICursor
+
 Parameter = NewType('Parameter', str)
 
 
@@ -59,7 +62,8 @@ class CollectionParameters(APIParameters):
     """Rest API class for parameters passed by a http request on a collection route"""
 
     def __init__(self, query_string: Parameter, limit: int = None, sort: str = None,
-                 order: int = None, page: int = None, filter: Union[List[dict], dict] = None, **kwargs):
+                 order: int = None, page: int = None, filter: Union[List[dict], dict] = None, cursor: str = None,
+                 count: str = None, **kwargs):
         """
         Constructor of the CollectionParameters.
 
@@ -70,17 +74,23 @@ class CollectionParameters(APIParameters):
             order: The order sequence in which `way` the sort should be returned.
             page: The current page. N number of elements will be skip based on (limit * page)
             filter: A generic query filter based on https://docs.mongodb.com/compass/master/query/filter/
+            cursor: Opaque keyset cursor of the pagination links. Enables the cursor mode instead of `page` -
+                an empty value starts at the first page. Only supported by the object and log collections.
+            count: How the total number of elements is computed - `exact` (default), `estimated`
+                (collection metadata, unfiltered requests only) or `none` (no total).
             **kwargs:
         """
         self.limit: int = int(limit or 10)
         self.sort: str = sort or Parameter('public_id')
         self.order: int = int(order or SortOrder.ASCENDING.value)
         self.page: int = int((page or 1) or page < 1)
-        if self.limit == 0:
+        self.cursor: APICursor = None if cursor is None else APICursor.decode(cursor)
+        if self.limit == 0 or self.cursor is not None:
             self.skip = 0
         else:
             self.skip: int = (self.page - 1) * self.limit
         self.filter: Union[List[dict], dict] = filter or {}
+        self.count: CountMode = CountMode(count or CountMode.EXACT.value)
         super(CollectionParameters, self).__init__(query_string=query_string, **kwargs)
 
     @classmethod
@@ -114,4 +124,8 @@ class CollectionParameters(APIParameters):
         }
         if parameters.projection:
             params.update({'projection': parameters.projection})
+        if parameters.cursor is not None:
+            params.update({'cursor': parameters.cursor.encode()})
+        if parameters.count != CountMode.EXACT:
+            params.update({'count': parameters.count.value})
         return params
@@ -18,14 +18,14 @@ from functools import wraps
 from typing import Type
 
 from cerberus import Validator
-from flask import Blueprint, abort, request, current_app
+from flask import Blueprint, abort, request
 
+from cmdb.framework.results import CountMode
 from cmdb.manager import ManagerGetError
 from cmdb.interface.api_parameters import CollectionParameters, APIParameters
-from cmdb.interface.route_utils import auth_is_valid, user_has_right, parse_authorization_header
-from cmdb.security.token.validator import TokenValidator, ValidationError
+from cmdb.interface.route_utils import auth_is_valid, user_has_right, get_auth_context
+from cmdb.security.token.validator import ValidationError
 from cmdb.user_management import UserModel
-from cmdb.user_management.managers.user_manager import UserManager
 
 
 class APIBlueprint(Blueprint):
@@ -49,32 +49,24 @@ class APIBlueprint(Blueprint):
                 if auth and right:
                     if not user_has_right(right):
                         if excepted:
-                            with current_app.app_context():
-                                user_manager = UserManager(current_app.database_manager)
-
-                            token = parse_authorization_header(request.headers['Authorization'])
                             try:
-                                decrypted_token = TokenValidator().decode_token(token)
+                                user_dict: dict = UserModel.to_dict(get_auth_context().user)
                             except ValidationError as err:
                                 return abort(401)
-                            try:
-                                user_id = decrypted_token['DATAGERRY']['value']['user']['public_id']
-                                user_dict: dict = UserModel.to_dict(user_manager.get(user_id))
+                            except ManagerGetError:
+                                return abort(404)
 
-                                if excepted:
-                                    for exe_key, exe_value in excepted.items():
-                                        try:
-                                            route_parameter = kwargs[exe_value]
-                                        except KeyError:
-                                            return abort(403, f'User has not the required right {right}')
+                            for exe_key, exe_value in excepted.items():
+                                try:
+                                    route_parameter = kwargs[exe_value]
+                                except KeyError:
+                                    return abort(403, f'User has not the required right {right}')
 
-                                        if exe_key not in user_dict.keys():
-                                            return abort(403, f'User has not the required right {right}')
+                                if exe_key not in user_dict.keys():
+                                    return abort(403, f'User has not the required right {right}')
 
-                                        if user_dict[exe_key] == route_parameter:
-                                            return f(*args, **kwargs)
-                            except ManagerGetError:
-                                return abort(404)
+                                if user_dict[exe_key] == route_parameter:
+                                    return f(*args, **kwargs)
                         return abort(403, f'User has not the required right {right}')
 
                 return f(*args, **kwargs)
@@ -124,6 +116,9 @@ class APIBlueprint(Blueprint):
                     )
                 except Exception as e:
                     return abort(400, str(e))
+                if request.method == 'HEAD' and params.count != CountMode.NONE:
+                    # HEAD responses only carry the X-Total-Count header
+                    params.count = CountMode.ONLY
                 return f(params=params, *args, **kwargs)
 
             return _decorate
@@ -131,7 +126,7 @@ class APIBlueprint(Blueprint):
         return _parse
 
     @classmethod
-    def parse_collection_parameters(cls, **optional):
+    def parse_collection_parameters(cls, cursor_support: bool = False, **optional):
         """
         Wrapper function for the flask routes.
         Auto parses the collection based parameters to the route.
@@ -140,6 +135,7 @@ class APIBlueprint(Blueprint):
             Move to global method like up.
 
         Args:
+            cursor_support: the route passes the keyset cursor to its manager - otherwise a cursor is rejected
             **optional: dict of optional collection parameters for given route function.
         """
 
@@ -152,6 +148,11 @@ class APIBlueprint(Blueprint):
                     )
                 except Exception as e:
                     return abort(400, str(e))
+                if params.cursor is not None and not cursor_support:
+                    return abort(400, 'Cursor pagination is not supported by this collection')
+                if request.method == 'HEAD' and params.count != CountMode.NONE:
+                    # HEAD responses only carry the X-Total-Count header
+                    params.count = CountMode.ONLY
                 return f(params=params, *args, **kwargs)
 
             return _decorate
@@ -13,9 +13,13 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
-from typing import Any
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from binascii import Error as DecodeError
+from typing import Any, List, Optional
 from urllib import parse
 
+from bson import json_util
+
 
 class APIPager:
     """
@@ -46,6 +50,80 @@ class APIPager:
         }
 
 
+class APICursor:
+    """
+    Opaque keyset cursor for the cursor pagination mode.
+    Holds the sort value and the public_id of the last seen element - a cursor without them points to the first page.
+    """
+
+    __slots__ = 'value', 'public_id', 'reverse'
+
+    def __init__(self, value: Any = None, public_id: int = None, reverse: bool = False):
+        """
+        Constructor of the APICursor.
+
+        Args:
+            value: Sort value of the last seen element.
+            public_id: PublicID of the last seen element.
+            reverse: Page backwards from the element - used for the previous page.
+        """
+        self.value = value
+        self.public_id = public_id
+        self.reverse = reverse
+
+    def is_start(self) -> bool:
+        """Check if the cursor points to the first page"""
+        return self.public_id is None
+
+    def encode(self) -> str:
+        """Get the url safe string of the cursor"""
+        raw = json_util.dumps({'v': self.value, 'id': self.public_id, 'r': self.reverse})
+        return urlsafe_b64encode(raw.encode('UTF-8')).decode('ascii')
+
+    @classmethod
+    def decode(cls, cursor: str) -> "APICursor":
+        """
+        Parse a cursor string. An empty string is the cursor of the first page.
+
+        Raises:
+            ValueError: If the string is not a valid cursor.
+        """
+        if not cursor:
+            return cls()
+        try:
+            data = json_util.loads(urlsafe_b64decode(cursor.encode('ascii')).decode('UTF-8'))
+            public_id = None if data['id'] is None else int(data['id'])
+            return cls(value=data['v'], public_id=public_id, reverse=bool(data.get('r', False)))
+        except (DecodeError, UnicodeError, ValueError, TypeError, KeyError) as err:
+            raise ValueError(f'Invalid cursor: {err}')
+
+    @classmethod
+    def from_result(cls, result: dict, sort: str, reverse: bool = False) -> Optional["APICursor"]:
+        """
+        Create the cursor which points behind (or before if `reverse`) a result element.
+
+        Args:
+            result: Element of the response.
+            sort: The sort field - nested fields via (.) dot.
+            reverse: Page backwards from the element.
+
+        Returns:
+            The cursor or None if the element has no public_id.
+        """
+        if isinstance(result, dict) and isinstance(result.get('object_information'), dict):
+            # rendered objects (view=render) hold the object properties in the object/type information
+            object_information = result['object_information']
+            result = {**object_information, 'public_id': object_information.get('object_id'),
+                      'type_id': (result.get('type_information') or {}).get('type_id')}
+        value = result
+        for key in sort.split('.'):
+            value = value.get(key) if isinstance(value, dict) else None
+        public_id = result.get('public_id') if isinstance(result, dict) else None
+        if public_id is None:
+            return None
+        return cls(value=value, public_id=public_id, reverse=reverse)
+
+
 class APIPagination:
     """
     Pagination data for rest api calls.
@@ -125,25 +203,61 @@ class APIPagination:
         return parsed_url._replace(query=new_query)
 
     @classmethod
-    def create(cls, url: str, page: int, total_pages: int):
+    def create(cls, url: str, page: int, total_pages: int = None):
         """
         Create a APIPagination from the url and the pager data
 
         Args:
             url: Full url path
             page: current page number
-            total_pages: Total number of pages
+            total_pages: Total number of pages - None if the total was not counted (no last url)
 
         Returns:
             Instance of a APIPagination
         """
         parsed_url: parse.ParseResult = parse.urlparse(url)
         first_url = parse.urlunparse(cls.__first_url(parsed_url))
-        last_url = parse.urlunparse(cls.__last_url(parsed_url, total_pages))
+        if total_pages is None:
+            last_url = None
+        else:
+            last_url = parse.urlunparse(cls.__last_url(parsed_url, total_pages))
         prev_url = parse.urlunparse(cls.__pre_url(parsed_url, page))
         next_url = parse.urlunparse(cls.__next_url(parsed_url, page, total_pages))
         return cls(current=url, first=first_url, prev=prev_url, next_=next_url, last=last_url)
 
+    @classmethod
+    def create_from_cursor(cls, url: str, results: List[dict], sort: str, limit: int, cursor: APICursor):
+        """
+        Create a APIPagination for the cursor pagination mode.
+        The prev/next urls contain the cursors of the first/last result element.
+
+        Args:
+            url: Full url path
+            results: Elements of the current page
+            sort: The sort field
+            limit: max number of elements of a page
+            cursor: Cursor of the current page
+
+        Returns:
+            Instance of a APIPagination
+        """
+        parsed_url: parse.ParseResult = parse.urlparse(url)
+
+        def cursor_url(page_cursor: APICursor = None):
+            if page_cursor is None:
+                return None
+            query = APIPagination.__update_query(parsed_url.query, 'cursor', page_cursor.encode())
+            return parse.urlunparse(parsed_url._replace(query=query))
+
+        is_full_page = limit != 0 and len(results) >= limit
+        next_cursor, prev_cursor = None, None
+        if results and (is_full_page or cursor.reverse):
+            next_cursor = APICursor.from_result(results[-1], sort)
+        if results and not cursor.is_start() and (is_full_page or not cursor.reverse):
+            prev_cursor = APICursor.from_result(results[0], sort, reverse=True)
+        return cls(current=url, first=cursor_url(APICursor()), prev=cursor_url(prev_cursor),
+                   next_=cursor_url(next_cursor), last=None)
+
     def to_dict(self) -> dict:
         return {
             'current': self.current,
@@ -171,7 +171,7 @@ class GetMultiResponse(BaseAPIResponse):
 
         Args:
             results: List of filtered elements in payload.
-            total: Complete number of elements.
+            total: Complete number of elements - None if the elements were not counted.
             params: HTTP query parameters.
             url: Requested url.
             model: Data-Model of the results.
@@ -189,11 +189,17 @@ class GetMultiResponse(BaseAPIResponse):
 
         if params.limit == 0:
             total_pages = 1
+        elif total is None:
+            total_pages = None
         else:
             total_pages = ceil(total / params.limit)
         self.pager: APIPager = APIPager(page=params.page, page_size=params.limit,
                                         total_pages=total_pages)
-        self.pagination: APIPagination = APIPagination.create(url, self.pager.page, self.pager.total_pages)
+        if params.cursor is not None:
+            self.pagination: APIPagination = APIPagination.create_from_cursor(url, results, params.sort, params.limit,
+                                                                              params.cursor)
+        else:
+            self.pagination: APIPagination = APIPagination.create(url, self.pager.page, self.pager.total_pages)
         super(GetMultiResponse, self).__init__(operation_type=OperationType.GET, url=url, model=model,
                                                body=body)
 
@@ -212,7 +218,8 @@ class GetMultiResponse(BaseAPIResponse):
             response = make_api_response(self.export(*args, **kwargs))
         else:
             response = make_api_response(None)
-        response.headers['X-Total-Count'] = self.total
+        if self.total is not None:
+            response.headers['X-Total-Count'] = self.total
         return response
 
     def export(self, text: str = 'json', pagination: bool = True) -> dict:
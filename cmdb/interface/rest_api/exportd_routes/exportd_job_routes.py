@@ -25,6 +25,7 @@ from cmdb.exportd.exportd_job.exportd_job_manager import ExportdJobManagerGetErr
     ExportdJobManagerInsertError, ExportdJobManagerUpdateError, ExportdJobManagerDeleteError
 from cmdb.exportd.exportd_logs.exportd_log_manager import LogManagerInsertError, LogAction, ExportdJobLog
 from cmdb.exportd.exportd_job.exportd_job import ExportdJob, ExecuteState
+from cmdb.exportd.exportd_job.exportd_pull_cache import ExportdPullCache
 from cmdb.exportd.managers.exportd_job_manager import ExportDJobManager
 from cmdb.framework.results import IterationResult
 from cmdb.interface.api_parameters import CollectionParameters
@@ -41,6 +42,7 @@ from cmdb.utils.error import CMDBError
 with current_app.app_context():
     exportd_manager = current_app.exportd_manager
     log_manager = current_app.exportd_log_manager
+    pull_cache = ExportdPullCache(current_app.database_manager)
 
 LOGGER = logging.getLogger(__name__)
 exportd_job_blueprint = RootBlueprint('exportd_job_blueprint', __name__, url_prefix='/exportdjob')
@@ -58,7 +60,8 @@ def get_exportd_jobs(params: CollectionParameters):
 
     try:
         iteration_result: IterationResult[ExportdJob] = job_manager.iterate(
-            filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order)
+            filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order,
+            count=params.count)
         types = [ExportdJob.to_json(type) for type in iteration_result.results]
         api_response = GetMultiResponse(types, total=iteration_result.total, params=params,
                                         url=request.url, model=ExportdJob.MODEL, body=body)
@@ -234,6 +237,7 @@ def delete_job(public_id: int, request_user: UserModel):
             return abort(404)
 
         ack = exportd_manager.delete_job(public_id=public_id, request_user=request_user)
+        pull_cache.invalidate(public_id)
     except ExportdJobManagerDeleteError:
         return abort(400)
     except CMDBError:
@@ -293,12 +297,23 @@ def worker(job: ExportdJob, request_user: UserModel):
     from flask import make_response as make_res
     from cmdb.exportd.exporter_base import ExportdManagerBase
     from cmdb.event_management.event import Event
-    try:
+
+    def build():
         event = Event("cmdb.exportd.pull")
-        content = ExportdManagerBase(job).execute(event, request_user.public_id, request_user.get_display_name(), False)
+        return ExportdManagerBase(job, database_manager=current_app.database_manager).execute(
+            event, request_user.public_id, request_user.get_display_name(), False)
+
+    try:
+        entry = pull_cache.get(job, build)
+        content = entry.header
         response = make_res(content.data, content.status)
         response.headers['Content-Type'] = '%s; charset=%s' % (content.mimetype, content.charset)
-        return response
+        # pollers revalidate the output with If-None-Match or If-Modified-Since
+        response.set_etag(entry.etag)
+        response.last_modified = entry.last_modified
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
     except Exception as err:
         LOGGER.error(err)
         return abort(404)
@@ -52,7 +52,8 @@ def get_exportd_logs(params: CollectionParameters):
 
     try:
         iteration_result: IterationResult[ExportdJobLog] = log_manager.iterate(
-            filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order)
+            filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order,
+            count=params.count)
         types = [ExportdJobLog.to_json(type) for type in iteration_result.results]
         api_response = GetMultiResponse(types, total=iteration_result.total, params=params,
                                         url=request.url, model=ExportdMetaLog.MODEL, body=body)
@@ -69,7 +69,8 @@ def get_categories(params: CollectionParameters):
             return api_response.make_response(pagination=False)
         else:
             iteration_result: IterationResult[CategoryModel] = category_manager.iterate(
-                filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order)
+                filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order,
+                count=params.count)
             category_list = [CategoryModel.to_json(category) for category in iteration_result.results]
             api_response = GetMultiResponse(category_list, total=iteration_result.total, params=params,
                                             url=request.url, model=CategoryModel.MODEL, body=body)
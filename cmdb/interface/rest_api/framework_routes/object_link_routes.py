@@ -43,7 +43,7 @@ def get_links(params: CollectionParameters, request_user: UserModel):
     try:
         iteration_result: IterationResult[ObjectLinkModel] = link_manager.iterate(
             filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order,
-            user=request_user, permission=AccessControlPermission.READ)
+            user=request_user, permission=AccessControlPermission.READ, count=params.count)
         types = [ObjectLinkModel.to_json(type) for type in iteration_result.results]
         api_response = GetMultiResponse(types, total=iteration_result.total, params=params,
                                         url=request.url, model=ObjectLinkModel.MODEL, body=body)
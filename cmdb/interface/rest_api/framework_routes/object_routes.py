@@ -61,7 +61,7 @@ object_blueprint = RootBlueprint('object_blueprint', __name__, url_prefix='/obje
 
 @objects_blueprint.route('/', methods=['GET', 'HEAD'])
 @objects_blueprint.protect(auth=True, right='base.framework.object.view')
-@objects_blueprint.parse_collection_parameters(view='native')
+@objects_blueprint.parse_collection_parameters(cursor_support=True, view='native')
 @insert_request_user
 def get_objects(params: CollectionParameters, request_user: UserModel):
     from cmdb.framework.managers.object_manager import ObjectManager
@@ -76,7 +76,8 @@ def get_objects(params: CollectionParameters, request_user: UserModel):
     try:
         iteration_result: IterationResult[CmdbObject] = manager.iterate(
             filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order,
-            user=request_user, permission=AccessControlPermission.READ
+            user=request_user, permission=AccessControlPermission.READ, cursor=params.cursor,
+            count=params.count
         )
 
         if view == 'native':
@@ -84,17 +85,20 @@ def get_objects(params: CollectionParameters, request_user: UserModel):
             api_response = GetMultiResponse(object_list, total=iteration_result.total, params=params,
                                             url=request.url, model=CmdbObject.MODEL, body=request.method == 'HEAD')
         elif view == 'render':
-            rendered_list = RenderList(object_list=iteration_result.results, request_user=request_user,
-                                       object_manager=object_manager, ref_render=True).render_result_list(
-                raw=True)
+            render_list = RenderList(object_list=iteration_result.results, request_user=request_user,
+                                     object_manager=object_manager, ref_render=True, batch=True)
+            rendered_list = render_list.render_result_list(raw=True)
             api_response = GetMultiResponse(rendered_list, total=iteration_result.total, params=params,
                                             url=request.url, model=Model('RenderResult'), body=request.method == 'HEAD')
+            response = api_response.make_response()
+            response.headers['X-Render-Query-Count'] = render_list.query_count
+            return response
         else:
             return abort(401, 'No possible view parameter')
 
     except ManagerIterationError as err:
         return abort(400, err.message)
-    except ManagerGetError as err:
+    except (ManagerGetError, ObjectManagerGetError) as err:
         return abort(404, err.message)
     return api_response.make_response()
 
@@ -194,18 +198,15 @@ def get_dt_objects_by_type(type_id, request_user: UserModel):
         order_column = table_config.get('order') if table_config.get('order') else 'type_id'
         order_direction = 1 if table_config.get('direction') == 'asc' else -1
 
-        if order_column in ['active', 'public_id', 'type_id', 'author_id', 'creation_time']:
-            object_list = object_manager.get_objects_by(sort=order_column, direction=order_direction, **filter_state)
-        else:
-            object_list = object_manager.sort_objects_by_field_value(value=order_column, order=order_direction,
-                                                                     match=filter_state)
-        totals = len(object_list)
-        object_list = object_list[start_at:start_at + site_length]
+        object_list, totals = object_manager.get_objects_page(match=filter_state, sort=order_column,
+                                                              order=order_direction, skip=start_at,
+                                                              limit=site_length)
 
     except CMDBError:
         return abort(400)
 
-    rendered_list = RenderList(object_list, request_user, dt_render=True).render_result_list()
+    rendered_list = RenderList(object_list, request_user, dt_render=True, object_manager=object_manager,
+                               batch=True).render_result_list()
 
     table_response = {
         'data': rendered_list,
@@ -273,18 +274,15 @@ def get_dt_filter_objects_by_type(type_id, request_user: UserModel):
         filter_arg.append({'$or': or_conditions})
         filter_state = {'$and': filter_arg}
 
-        if order_column in ['active', 'public_id', 'type_id', 'author_id', 'creation_time']:
-            object_list = object_manager.get_objects_by(sort=order_column, direction=order_direction, **filter_state)
-        else:
-            object_list = object_manager.sort_objects_by_field_value(value=order_column, order=order_direction,
-                                                                     match=filter_state)
-        totals = len(object_list)
-        object_list = object_list[start_at:start_at + site_length]
+        object_list, totals = object_manager.get_objects_page(match=filter_state, sort=order_column,
+                                                              order=order_direction, skip=start_at,
+                                                              limit=site_length)
 
     except CMDBError:
         return abort(400)
 
-    rendered_list = RenderList(object_list, request_user, dt_render=dt_render).render_result_list()
+    rendered_list = RenderList(object_list, request_user, dt_render=dt_render, object_manager=object_manager,
+                               batch=True).render_result_list()
 
     table_response = {
         'data': rendered_list,
@@ -399,7 +397,7 @@ def group_objects_by_type_id(value, request_user: UserModel):
 
 @objects_blueprint.route('/<int:public_id>/references', methods=['GET', 'HEAD'])
 @objects_blueprint.protect(auth=True, right='base.framework.object.view')
-@objects_blueprint.parse_collection_parameters(view='native')
+@objects_blueprint.parse_collection_parameters(cursor_support=True, view='native')
 @insert_request_user
 def get_object_references(public_id: int, params: CollectionParameters, request_user: UserModel):
     from cmdb.framework.managers.object_manager import ObjectManager
@@ -434,7 +432,9 @@ def get_object_references(public_id: int, params: CollectionParameters, request_
                                                                            sort=params.sort,
                                                                            order=params.order,
                                                                            user=request_user,
-                                                                           permission=AccessControlPermission.READ
+                                                                           permission=AccessControlPermission.READ,
+                                                                           cursor=params.cursor,
+                                                                           count=params.count
                                                                            )
 
         if view == 'native':
@@ -443,7 +443,7 @@ def get_object_references(public_id: int, params: CollectionParameters, request_
                                             url=request.url, model=CmdbObject.MODEL, body=request.method == 'HEAD')
         elif view == 'render':
             rendered_list = RenderList(object_list=iteration_result.results, request_user=request_user,
-                                       object_manager=object_manager, ref_render=True).render_result_list(
+                                       object_manager=object_manager, ref_render=True, batch=True).render_result_list(
                 raw=True)
             api_response = GetMultiResponse(rendered_list, total=iteration_result.total, params=params,
                                             url=request.url, model=Model('RenderResult'), body=request.method == 'HEAD')
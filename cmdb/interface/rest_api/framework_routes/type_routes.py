@@ -61,7 +61,8 @@ def get_types(params: CollectionParameters):
 
     try:
         iteration_result: IterationResult[TypeModel] = type_manager.iterate(
-            filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order)
+            filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order,
+            count=params.count)
         types = [TypeModel.to_json(type) for type in iteration_result.results]
         api_response = GetMultiResponse(types, total=iteration_result.total, params=params,
                                         url=request.url, model=TypeModel.MODEL, body=body)
@@ -26,7 +26,8 @@ from cmdb.framework.models.log import LogAction, CmdbObjectLog
 from cmdb.framework.managers.log_manager import LogManagerInsertError
 from cmdb.framework.cmdb_object_manager import CmdbObjectManager
 from cmdb.framework.managers.type_manager import TypeManager
-from cmdb.framework.cmdb_render import RenderError, CmdbRender
+from cmdb.framework.cmdb_object import CmdbObject
+from cmdb.framework.cmdb_render import RenderError, RenderList
 from cmdb.importer import load_parser_class, load_importer_class, __OBJECT_IMPORTER__, __OBJECT_PARSER__, \
     __OBJECT_IMPORTER_CONFIG__, load_importer_config_class, ParserLoadError, ImporterLoadError
 from cmdb.security.acl.errors import AccessDeniedError
@@ -196,28 +197,27 @@ def import_objects(request_user: UserModel):
     # close request file
     request_file.close()
 
-    # log all successful imports
-    for message in import_response.success_imports:
+    # log all successful imports - one object query, batch render and bulk log insert per batch
+    user_list = user_manager.get_users()
+    batch_size = importer_config.get_batch_size()
+    success_ids = [message.public_id for message in import_response.success_imports]
+    for batch_start in range(0, len(success_ids), batch_size):
+        batch_ids = success_ids[batch_start:batch_start + batch_size]
         try:
-
-            # get object state of every imported object
-            current_type_instance = object_manager.get_type(importer_config_request.get('type_id'))
-            current_object = object_manager.get_object(message.public_id)
-            current_object_render_result = CmdbRender(object_instance=current_object,
-                                                      type_instance=current_type_instance,
-                                                      render_user=request_user,
-                                                      user_list=user_manager.get_users()).result()
-
-            # insert object create log
-            log_params = {
-                'object_id': message.public_id,
+            current_objects = [CmdbObject(**document) for document in object_manager.dbm.find_all(
+                CmdbObject.COLLECTION, filter={'public_id': {'$in': batch_ids}})]
+            render_results = RenderList(current_objects, request_user, object_manager=object_manager, batch=True,
+                                        user_list=user_list).render_result_list()
+
+            # insert object create logs
+            log_manager.insert_many(action=LogAction.CREATE, log_type=CmdbObjectLog.__name__, logs=[{
+                'object_id': current_object.public_id,
                 'user_id': request_user.get_public_id(),
                 'user_name': request_user.get_display_name(),
                 'comment': 'Object was imported',
-                'render_state': json.dumps(current_object_render_result, default=default).encode('UTF-8'),
+                'render_state': json.dumps(render_result, default=default).encode('UTF-8'),
                 'version': current_object.version
-            }
-            log_ack = log_manager.insert(action=LogAction.CREATE, log_type=CmdbObjectLog.__name__, **log_params)
+            } for current_object, render_result in zip(current_objects, render_results)])
 
         except ObjectManagerGetError as err:
             LOGGER.error(err)
@@ -102,7 +102,7 @@ def delete_log(public_id: int, request_user: UserModel):
 # FIND routes
 @log_blueprint.route('/object/exists', methods=['GET', 'HEAD'])
 @log_blueprint.protect(auth=True, right='base.framework.log.view')
-@log_blueprint.parse_collection_parameters()
+@log_blueprint.parse_collection_parameters(cursor_support=True)
 @insert_request_user
 def get_logs_with_existing_objects(params: CollectionParameters, request_user: UserModel):
     try:
@@ -133,7 +133,8 @@ def get_logs_with_existing_objects(params: CollectionParameters, request_user: U
         body = request.method == 'HEAD'
         object_logs = log_manager.iterate(filter=query, limit=params.limit,
                                           skip=params.skip, sort=params.sort, order=params.order, user=request_user,
-                                          permission=AccessControlPermission.READ)
+                                          permission=AccessControlPermission.READ, cursor=params.cursor,
+                                          count=params.count)
         logs = [CmdbObjectLog.to_json(_) for _ in object_logs.results]
         api_response = GetMultiResponse(logs, total=object_logs.total, params=params,
                                         url=request.url, model=CmdbMetaLog.MODEL, body=body)
@@ -148,7 +149,7 @@ def get_logs_with_existing_objects(params: CollectionParameters, request_user: U
 
 @log_blueprint.route('/object/notexists', methods=['GET', 'HEAD'])
 @log_blueprint.protect(auth=True, right='base.framework.log.view')
-@log_blueprint.parse_collection_parameters()
+@log_blueprint.parse_collection_parameters(cursor_support=True)
 def get_logs_with_deleted_objects(params: CollectionParameters):
     manager = CmdbLogManager(database_manager=database_manager)
     try:
@@ -178,7 +179,8 @@ def get_logs_with_deleted_objects(params: CollectionParameters):
 
         body = request.method == 'HEAD'
         object_logs = manager.iterate(filter=query, limit=params.limit,
-                                          skip=params.skip, sort=params.sort, order=params.order)
+                                          skip=params.skip, sort=params.sort, order=params.order,
+                                          cursor=params.cursor, count=params.count)
 
         logs = [CmdbObjectLog.to_json(_) for _ in object_logs.results]
         api_response = GetMultiResponse(logs, total=object_logs.total, params=params,
@@ -194,7 +196,7 @@ def get_logs_with_deleted_objects(params: CollectionParameters):
 
 @log_blueprint.route('/object/deleted', methods=['GET', 'HEAD'])
 @log_blueprint.protect(auth=True, right='base.framework.log.view')
-@log_blueprint.parse_collection_parameters()
+@log_blueprint.parse_collection_parameters(cursor_support=True)
 def get_object_delete_logs(params: CollectionParameters):
     manager = CmdbLogManager(database_manager=database_manager)
     try:
@@ -204,7 +206,8 @@ def get_object_delete_logs(params: CollectionParameters):
         }
         body = request.method == 'HEAD'
         object_logs = manager.iterate(filter=query, limit=params.limit, skip=params.skip,
-                                          sort=params.sort, order=params.order)
+                                          sort=params.sort, order=params.order, cursor=params.cursor,
+                                          count=params.count)
         logs = [CmdbObjectLog.to_json(_) for _ in object_logs.results]
         api_response = GetMultiResponse(logs, total=object_logs.total, params=params,
                                         url=request.url, model=CmdbMetaLog.MODEL, body=body)
@@ -219,7 +222,7 @@ def get_object_delete_logs(params: CollectionParameters):
 
 @log_blueprint.route('/object/<int:object_id>', methods=['GET', 'HEAD'])
 @log_blueprint.protect(auth=True, right='base.framework.log.view')
-@log_blueprint.parse_collection_parameters()
+@log_blueprint.parse_collection_parameters(cursor_support=True)
 @insert_request_user
 def get_logs_by_object(object_id: int, params: CollectionParameters, request_user: UserModel):
     manager = CmdbLogManager(database_manager=database_manager)
@@ -228,7 +231,8 @@ def get_logs_by_object(object_id: int, params: CollectionParameters, request_use
                                                              permission=AccessControlPermission.READ)
         body = request.method == 'HEAD'
         iteration_result = manager.iterate(public_id=object_id, filter=params.filter, limit=params.limit,
-                                           skip=params.skip, sort=params.sort, order=params.order)
+                                           skip=params.skip, sort=params.sort, order=params.order,
+                                           cursor=params.cursor, count=params.count)
         logs = [CmdbObjectLog.to_json(_) for _ in iteration_result.results]
         api_response = GetMultiResponse(logs, total=iteration_result.total, params=params,
                                         url=request.url, model=CmdbMetaLog.MODEL, body=body)
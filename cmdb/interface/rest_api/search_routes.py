@@ -24,6 +24,7 @@ from cmdb.interface.route_utils import make_response, insert_request_user, login
 from cmdb.search import Search, Query
 from cmdb.search.params import SearchParam
 from cmdb.search.query import Pipeline
+from cmdb.search.search_index import SearchIndex
 from cmdb.search.searchers import SearcherFramework, SearchPipelineBuilder, QuickSearchPipelineBuilder
 from cmdb.user_management.models.user import UserModel
 from cmdb.interface.blueprint import APIBlueprint
@@ -47,12 +48,18 @@ search_blueprint = APIBlueprint('search_rest', __name__, url_prefix='/search')
 @insert_request_user
 def quick_search_result_counter(request_user: UserModel):
     search_term = request.args.get('searchValue', Search.DEFAULT_REGEX, str)
-    builder = QuickSearchPipelineBuilder()
+    search_mode = request.args.get('searchMode', None, str)
+    if search_mode is None:
+        # the frontend sends regular expressions without a search mode - terms without regex syntax use the index
+        regex_mode = not SearchIndex.is_plain(search_term)
+    else:
+        regex_mode = search_mode != 'text'
+    builder = QuickSearchPipelineBuilder(database_manager=current_app.database_manager)
     only_active = _fetch_only_active_objs()
     pipeline: Pipeline = builder.build(search_term=search_term, user=request_user, permission=AccessControlPermission.READ,
-                                       active_flag=only_active)
+                                       active_flag=only_active, regex_mode=regex_mode)
     try:
-        result = list(object_manager.aggregate(collection='framework.objects', pipeline=pipeline))
+        result = list(object_manager.aggregate(collection=builder.collection, pipeline=pipeline))
     except Exception as err:
         LOGGER.error(f'[Search count]: {err}')
         return abort(400)
@@ -87,7 +94,7 @@ def search_framework(request_user: UserModel):
         return abort(400, err)
     try:
         searcher = SearcherFramework(manager=object_manager)
-        builder = SearchPipelineBuilder()
+        builder = SearchPipelineBuilder(database_manager=current_app.database_manager)
         if request.method == 'GET' and resolve_object_references:
             query: Pipeline = builder.build_resolve_reference_pipeline(query=Query(search_parameters),
                                                                        active=only_active, user=request_user,
@@ -25,7 +25,7 @@ from cmdb.framework.utils import PublicID
 from cmdb.interface.api_parameters import CollectionParameters
 from cmdb.interface.response import GetMultiResponse, GetSingleResponse, InsertSingleResponse, UpdateSingleResponse, \
     DeleteSingleResponse
-from cmdb.interface.route_utils import abort
+from cmdb.interface.route_utils import abort, invalidate_group_cache, invalidate_user_cache
 from cmdb.interface.blueprint import APIBlueprint
 from cmdb.search import Query
 from cmdb.user_management import UserModel
@@ -62,7 +62,8 @@ def get_groups(params: CollectionParameters):
                                                right_manager=RightManager(rights))
     try:
         iteration_result: IterationResult[UserGroupModel] = group_manager.iterate(
-            filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order)
+            filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order,
+            count=params.count)
         groups = [UserGroupModel.to_dict(group) for group in iteration_result.results]
         api_response = GetMultiResponse(groups, total=iteration_result.total, params=params,
                                         url=request.url, model=UserGroupModel.MODEL, body=request.method == 'HEAD')
@@ -158,6 +159,7 @@ def update_group(public_id: int, data: dict):
         group_dict = UserGroupModel.to_dict(group)
         group_dict['rights'] = [right.get('name') for right in group_dict.get('rights', [])]
         group_manager.update(public_id=PublicID(public_id), group=group_dict)
+        invalidate_group_cache(public_id)
         api_response = UpdateSingleResponse(result=group_dict, url=request.url,
                                             model=UserGroupModel.MODEL)
     except ManagerGetError as err:
@@ -197,6 +199,7 @@ def delete_group(public_id: int, params: GroupDeletionParameters):
     if params.action:
         users_in_group: List[UserModel] = user_manager.get_many(Query({'group_id': public_id}))
         if len(users_in_group) > 0:
+            invalidate_user_cache()
             if params.action == GroupDeleteMode.MOVE.value:
                 if params.group_id:
                     for user in users_in_group:
@@ -217,6 +220,7 @@ def delete_group(public_id: int, params: GroupDeletionParameters):
 
     try:
         deleted_group = group_manager.delete(public_id=PublicID(public_id))
+        invalidate_group_cache(public_id)
         api_response = DeleteSingleResponse(raw=UserGroupModel.to_dict(deleted_group), model=UserGroupModel.MODEL)
     except ManagerGetError as err:
         return abort(404, err.message)
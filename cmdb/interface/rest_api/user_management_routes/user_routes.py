@@ -25,6 +25,7 @@ from cmdb.interface.api_parameters import CollectionParameters
 from cmdb.interface.blueprint import APIBlueprint
 from cmdb.interface.response import GetMultiResponse, GetSingleResponse, InsertSingleResponse, UpdateSingleResponse, \
     DeleteSingleResponse
+from cmdb.interface.route_utils import invalidate_user_cache
 from cmdb.security.security import SecurityManager
 from cmdb.user_management import UserModel
 from cmdb.user_management.managers.user_manager import UserManager
@@ -56,7 +57,8 @@ def get_users(params: CollectionParameters):
 
     try:
         iteration_result: IterationResult[UserModel] = user_manager.iterate(
-            filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order)
+            filter=params.filter, limit=params.limit, skip=params.skip, sort=params.sort, order=params.order,
+            count=params.count)
         users = [UserModel.to_dict(user) for user in iteration_result.results]
         api_response = GetMultiResponse(users, total=iteration_result.total, params=params,
                                         url=request.url, model=UserModel.MODEL, body=request.method == 'HEAD')
@@ -151,6 +153,7 @@ def update_user(public_id: int, data: dict):
     try:
         user = UserModel.from_data(data=data)
         user_manager.update(public_id=PublicID(public_id), user=user)
+        invalidate_user_cache(public_id)
         api_response = UpdateSingleResponse(result=UserModel.to_dict(user), url=request.url, model=UserModel.MODEL)
     except ManagerGetError as err:
         return abort(404, err.message)
@@ -178,6 +181,7 @@ def delete_user(public_id: int):
     user_manager: UserManager = UserManager(database_manager=current_app.database_manager)
     try:
         deleted_group = user_manager.delete(public_id=PublicID(public_id))
+        invalidate_user_cache(public_id)
         api_response = DeleteSingleResponse(raw=UserModel.to_dict(deleted_group), model=UserModel.MODEL)
     except ManagerGetError as err:
         return abort(404, err.message)
@@ -209,6 +213,7 @@ def change_user_password(public_id: int):
         password = security_manager.generate_hmac(request.json.get('password'))
         user.password = password
         user_manager.update(public_id=PublicID(public_id), user=user)
+        invalidate_user_cache(public_id)
         api_response = UpdateSingleResponse(result=UserModel.to_dict(user), url=request.url, model=UserModel.MODEL)
     except ManagerGetError as err:
         return abort(404, err.message)
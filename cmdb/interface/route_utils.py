@@ -32,10 +32,11 @@ from cmdb.user_management.models.user import UserModel
 from cmdb.user_management.managers.user_manager import UserManager
 from cmdb.user_management.managers.group_manager import GroupManager
 from cmdb.user_management.managers.right_manager import RightManager
+from cmdb.utils.cache import LRUCache
 from cmdb.utils.system_reader import SystemSettingsReader
 from cmdb.utils.wraps import LOGGER
 
-from flask import request, abort, current_app
+from flask import request, abort, current_app, g
 
 from cmdb.security.token.validator import TokenValidator, ValidationError
 from cmdb.utils.wraps import deprecated
@@ -43,6 +44,131 @@ from cmdb.utils import json_encoding
 
 DEFAULT_MIME_TYPE = 'application/json'
 
+# Short living cross request caches of the authenticated users and their groups - keyed by public_id
+USER_CACHE: LRUCache = LRUCache(max_size=512, ttl=10)
+GROUP_CACHE: LRUCache = LRUCache(max_size=128, ttl=10)
+
+
+class RequestAuthContext:
+    """
+    Authentication state of a single request.
+    The token is parsed and verified once, the request user, its group and the checked rights are memoized.
+    Stored in `flask.g` - use `get_auth_context` for access.
+    """
+
+    def __init__(self, database_manager):
+        self.database_manager = database_manager
+        self._parsed: bool = False
+        self._token = None
+        self._decoded_token = None
+        self._user: UserModel = None
+        self._groups: dict = {}
+        self._rights: dict = {}
+
+    def __parse(self):
+        if self._parsed:
+            return
+        self._parsed = True
+        self._token, self._decoded_token = _parse_authorization_header(request.headers.get('Authorization'),
+                                                                       self.database_manager)
+
+    @property
+    def token(self):
+        """The valid jwt of the request or None"""
+        self.__parse()
+        return self._token
+
+    @property
+    def decoded_token(self):
+        """
+        The verified and decoded token of the request.
+
+        Raises:
+            ValidationError: If the request has no valid token
+        """
+        self.__parse()
+        if self._decoded_token is None:
+            raise ValidationError('No valid token was provided')
+        return self._decoded_token
+
+    def is_valid(self) -> bool:
+        return self.token is not None
+
+    @property
+    def user(self) -> UserModel:
+        """
+        The user of the request token.
+
+        Raises:
+            ValidationError: If the request has no valid token
+            ManagerGetError: If the user does not exists
+        """
+        if self._user is None:
+            user_id = self.decoded_token['DATAGERRY']['value']['user']['public_id']
+            user = USER_CACHE.get(user_id)
+            if user is None:
+                user = UserManager(self.database_manager).get(user_id)
+                USER_CACHE.set(user_id, user)
+            self._user = user
+        return self._user
+
+    def get_group(self, group_id: int) -> UserGroupModel:
+        """
+        Get a group by its public_id.
+
+        Raises:
+            ManagerGetError: If the group does not exists
+        """
+        if group_id not in self._groups:
+            group = GROUP_CACHE.get(group_id)
+            if group is None:
+                group = GroupManager(self.database_manager, RightManager(rights)).get(group_id)
+                GROUP_CACHE.set(group_id, group)
+            self._groups[group_id] = group
+        return self._groups[group_id]
+
+    @property
+    def group(self) -> UserGroupModel:
+        """The group of the request user"""
+        return self.get_group(self.user.group_id)
+
+    def has_right(self, right_name: str, group_id: int = None) -> bool:
+        """
+        Check if the group of the request user (or the passed group) has a right.
+
+        Raises:
+            ManagerGetError: If the user or group does not exists
+        """
+        group = self.group if group_id is None else self.get_group(group_id)
+        key = (group.public_id, right_name)
+        if key not in self._rights:
+            self._rights[key] = group.has_right(right_name=right_name) or \
+                                group.has_extended_right(right_name=right_name)
+        return self._rights[key]
+
+
+def get_auth_context() -> RequestAuthContext:
+    """Get the authentication context of the current request"""
+    if 'auth_context' not in g:
+        g.auth_context = RequestAuthContext(current_app.database_manager)
+    return g.auth_context
+
+
+def invalidate_user_cache(public_id: int = None):
+    """Drop a user (or all users) from the cross request user cache"""
+    if public_id is None:
+        USER_CACHE.clear()
+    else:
+        USER_CACHE.pop(public_id)
+
+
+def invalidate_group_cache(public_id: int = None):
+    """Drop a group (or all groups) from the cross request group cache"""
+    if public_id is None:
+        GROUP_CACHE.clear()
+    else:
+        GROUP_CACHE.pop(public_id)
+
 
 def default(obj):
     """Json encoder for database values."""
@@ -92,8 +218,7 @@ def login_required(f):
 @deprecated
 def auth_is_valid() -> bool:
     try:
-        parse_authorization_header(request.headers['Authorization'])
-        return True
+        return get_auth_context().is_valid()
     except Exception as err:
         LOGGER.error(err)
         return False
@@ -101,24 +226,13 @@ def auth_is_valid() -> bool:
 
 def user_has_right(required_right: str) -> bool:
     """Check if a user has a specific right"""
-    from flask import request, current_app
-    with current_app.app_context():
-        user_manager = UserManager(current_app.database_manager)
-        group_manager = GroupManager(current_app.database_manager, RightManager(rights))
-
-    token = parse_authorization_header(request.headers['Authorization'])
+    auth_context = get_auth_context()
     try:
-        decrypted_token = TokenValidator().decode_token(token)
+        auth_context.decoded_token
     except ValidationError as err:
         return abort(401)
     try:
-        user_id = decrypted_token['DATAGERRY']['value']['user']['public_id']
-        user = user_manager.get(user_id)
-        group = group_manager.get(user.group_id)
-        right_status = group.has_right(right_name=required_right)
-        if not right_status:
-            right_status = group.has_extended_right(right_name=required_right)
-        return right_status
+        return auth_context.has_right(required_right)
     except ManagerGetError:
         return False
 
@@ -131,20 +245,10 @@ def insert_request_user(func):
 
     @functools.wraps(func)
     def get_request_user(*args, **kwargs):
-        from flask import request, current_app
-        with current_app.app_context():
-            user_manager = UserManager(current_app.database_manager)
-
-        token = parse_authorization_header(request.headers['Authorization'])
-        try:
-            decrypted_token = TokenValidator().decode_token(token)
-        except ValidationError as err:
-            return abort(401)
         try:
-            user_id = decrypted_token['DATAGERRY']['value']['user']['public_id']
-        except ValueError:
+            user = get_auth_context().user
+        except (ValidationError, ValueError, KeyError):
             return abort(401)
-        user = user_manager.get(user_id)
         kwargs.update({'request_user': user})
         return func(*args, **kwargs)
 
@@ -157,9 +261,6 @@ def right_required(required_right: str, excepted: dict = None):
     requires: insert_request_user
     """
 
-    with current_app.app_context():
-        group_manager = GroupManager(current_app.database_manager, RightManager(rights))
-
     def _page_right(func):
         @functools.wraps(func)
         def _decorate(*args, **kwargs):
@@ -168,11 +269,10 @@ def right_required(required_right: str, excepted: dict = None):
             except KeyError:
                 return abort(400, 'No request user was provided')
             try:
-                group: UserGroupModel = group_manager.get(current_user.group_id)
-                has_right = group.has_right(required_right)
+                has_right = get_auth_context().has_right(required_right, group_id=current_user.group_id)
             except ManagerGetError:
                 return abort(404, 'Group or right not exists')
-            if not has_right and not group.has_extended_right(required_right):
+            if not has_right:
                 return abort(403, 'Request user does not have the right for this action')
             return func(*args, **kwargs)
 
@@ -191,8 +291,22 @@ def parse_authorization_header(header):
     Returns:
         Valid JWT token
     """
+    return _parse_authorization_header(header, current_app.database_manager)[0]
+
+
+def _parse_authorization_header(header, database_manager=None) -> tuple:
+    """
+    Parses the HTTP Auth Header to a JWT Token and verifies it.
+    Args:
+        header: Authorization header of the HTTP Request
+        database_manager: Database connection
+
+    Returns:
+        Tuple of the valid JWT token and the decoded token or (None, None)
+    """
     if not header:
-        return None
+        return None, None
+    database_manager = database_manager or current_app.database_manager
     value = wsgi_to_bytes(header)
     try:
         auth_type, auth_info = value.split(None, 1)
@@ -210,11 +324,11 @@ def parse_authorization_header(header):
                 username = to_unicode(username, "utf-8")
                 password = to_unicode(password, "utf-8")
 
-                user_manager: UserManager = UserManager(current_app.database_manager)
-                group_manager: GroupManager = GroupManager(current_app.database_manager,
+                user_manager: UserManager = UserManager(database_manager)
+                group_manager: GroupManager = GroupManager(database_manager,
                                                            right_manager=RightManager(rights))
-                security_manager: SecurityManager = SecurityManager(current_app.database_manager)
-                auth_settings = SystemSettingsReader(current_app.database_manager).get_all_values_from_section(
+                security_manager: SecurityManager = SecurityManager(database_manager)
+                auth_settings = SystemSettingsReader(database_manager).get_all_values_from_section(
                     'auth', default=AuthModule.__DEFAULT_SETTINGS__)
                 auth_module = AuthModule(auth_settings, user_manager=user_manager,
                                          group_manager=group_manager, security_manager=security_manager)
@@ -222,23 +336,24 @@ def parse_authorization_header(header):
                 try:
                     user_instance = auth_module.login(username, password)
                 except Exception as e:
-                    return None
+                    return None, None
                 if user_instance:
-                    tg = TokenGenerator(current_app.database_manager)
-                    return tg.generate_token(payload={'user': {
+                    tg = TokenGenerator(database_manager)
+                    token = tg.generate_token(payload={'user': {
                         'public_id': user_instance.get_public_id()
                     }})
+                    return token, TokenValidator(database_manager).decode_token(token)
                 else:
-                    return None
+                    return None, None
         except Exception:
-            return None
+            return None, None
 
     if auth_type == b"bearer":
         try:
-            tv = TokenValidator()
+            tv = TokenValidator(database_manager)
             decoded_token = tv.decode_token(auth_info)
             tv.validate_token(decoded_token)
-            return auth_info
+            return auth_info, decoded_token
         except Exception:
-            return None
-    return None
+            return None, None
+    return None, None
@@ -14,10 +14,10 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
-from typing import Union, List
+from typing import Union, List, Optional, Tuple
 
 from cmdb.database.managers import DatabaseManagerMongo
-from cmdb.framework.results import IterationResult
+from cmdb.framework.results import IterationResult, CountMode
 from cmdb.framework.results.list import ListResult
 from cmdb.framework.utils import Collection, PublicID
 from cmdb.manager import AbstractManagerBase
@@ -41,8 +41,44 @@ class ManagerQueryBuilder(Builder):
         """`Delete` the query content"""
         self.query = None
 
-    def build(self, filter: Union[List[dict], dict], limit: int, skip: int, sort: str, order: int, *args, **kwargs) -> \
-            Union[Query, Pipeline]:
+    def filter_stages(self, filter: Union[List[dict], dict], *args, **kwargs) -> List[dict]:
+        """
+        Stages which select the documents of the collection
+        Args:
+            filter: dict or list of dict query/queries which the elements have to match.
+
+        Returns:
+            List of pipeline stages
+        """
+        if isinstance(filter, dict):
+            return [self.match_(filter)]
+        elif isinstance(filter, list):
+            return list(filter)
+        return []
+
+    def result_stages(self, limit: int, skip: int, sort: str, order: int, cursor=None) -> List[dict]:
+        """
+        Stages which sort and page the selected documents
+        Args:
+            limit: max number of documents to return.
+            skip: number of documents to skip first.
+            sort: sort field
+            order: sort order
+            cursor: keyset cursor (`APICursor`) - replaces the skip with a range match
+
+        Returns:
+            List of pipeline stages
+        """
+        if cursor is not None:
+            return self.keyset_(sort=sort, order=order, limit=limit, cursor=cursor)
+
+        stages = [self.sort_(sort=sort, order=order), self.skip_(skip)]
+        if limit != 0:
+            stages.append(self.limit_(limit))
+        return stages
+
+    def build(self, filter: Union[List[dict], dict], limit: int, skip: int, sort: str, order: int,
+              cursor=None, *args, **kwargs) -> Union[Query, Pipeline]:
         """
         Converts the parameters from the call to a mongodb aggregation pipeline
         Args:
@@ -51,6 +87,7 @@ class ManagerQueryBuilder(Builder):
             skip: number of documents to skip first.
             sort: sort field
             order: sort order
+            cursor: keyset cursor (`APICursor`) - replaces the skip with a range match
             *args:
             **kwargs:
 
@@ -58,19 +95,8 @@ class ManagerQueryBuilder(Builder):
             The `FrameworkQueryBuilder` query pipeline with the parameter contents.
         """
         self.clear()
-        self.query = Pipeline([])
-
-        if isinstance(filter, dict):
-            self.query.append(self.match_(filter))
-        elif isinstance(filter, list):
-            for pipe in filter:
-                self.query.append(pipe)
-
-        self.query.append(self.sort_(sort=sort, order=order))
-        self.query.append(self.skip_(skip))
-        if limit != 0:
-            self.query.append(self.limit_(limit))
-
+        self.query = Pipeline(self.filter_stages(filter, *args, **kwargs) +
+                              self.result_stages(limit=limit, skip=skip, sort=sort, order=order, cursor=cursor))
         return self.query
 
     def count(self, filter: Union[List[dict], dict], *args, **kwargs) -> Union[Query, Pipeline]:
@@ -83,16 +109,79 @@ class ManagerQueryBuilder(Builder):
             Query with count stages.
         """
         self.clear()
-        self.query = Pipeline([])
+        self.query = Pipeline(self.filter_stages(filter, *args, **kwargs) + [self.count_('total')])
+        return self.query
 
-        if isinstance(filter, dict):
-            self.query.append(self.match_(filter))
-        elif isinstance(filter, list):
-            for pipe in filter:
-                self.query.append(pipe)
-        self.query.append(self.count_('total'))
+    def facet(self, filter: Union[List[dict], dict], limit: int, skip: int, sort: str, order: int,
+              cursor=None, *args, **kwargs) -> Union[Query, Pipeline]:
+        """
+        Pipeline which returns the page and the total number of documents in one document.
+        The filter stages only run once for both.
+        Args:
+            filter: dict or list of dict query/queries which the elements have to match.
+            limit: max number of documents to return.
+            skip: number of documents to skip first.
+            sort: sort field
+            order: sort order
+            cursor: keyset cursor (`APICursor`) - replaces the skip with a range match
+
+        Returns:
+            Query with a `results` and a `total` facet.
+        """
+        self.clear()
+        self.query = Pipeline(self.filter_stages(filter, *args, **kwargs) + [self.facet_({
+            'results': self.result_stages(limit=limit, skip=skip, sort=sort, order=order, cursor=cursor),
+            'total': [self.count_('total')]
+        })])
         return self.query
 
+    def keyset_(self, sort: str, order: int, limit: int, cursor) -> List[dict]:
+        """
+        Keyset pagination stages - the page starts behind the (sort value, public_id) of the cursor.
+        Costs the same for every page, unlike a skip over all previous elements.
+        Args:
+            sort: sort field
+            order: sort order
+            limit: max number of documents to return.
+            cursor: keyset cursor (`APICursor`) with the `value` and `public_id` of the last seen document.
+                A reverse cursor returns the page in front of the document.
+
+        Returns:
+            The match, sort and limit stages
+        """
+        if order != 1 and order != -1:
+            raise ValueError('Order value must be 1 (ascending) or -1 (descending)')
+        direction = -order if cursor.reverse else order
+        stages = []
+        if cursor.public_id is not None:
+            operator = self.gt_ if direction == 1 else self.lt_
+            if sort == 'public_id':
+                stages.append(self.match_(operator('public_id', cursor.public_id)))
+            else:
+                # null and missing values sort before all other values, but a range match never selects them
+                # (type bracketing) - so they get their own branches
+                same_value = self.and_([self.eq_(sort, cursor.value), operator('public_id', cursor.public_id)])
+                if cursor.value is None:
+                    branches = [same_value]
+                    if direction == 1:
+                        branches.append(self.ne_(sort, None))
+                else:
+                    branches = [operator(sort, cursor.value), same_value]
+                    if direction == -1:
+                        branches.append(self.eq_(sort, None))
+                stages.append(self.match_(self.or_(branches)))
+        sort_stage = self.sort_(sort=sort, order=direction)
+        sort_stage['$sort']['public_id'] = direction
+        stages.append(sort_stage)
+        if limit != 0:
+            stages.append(self.limit_(limit))
+        if cursor.reverse:
+            # restore the requested order
+            sort_stage = self.sort_(sort=sort, order=order)
+            sort_stage['$sort']['public_id'] = order
+            stages.append(sort_stage)
+        return stages
+
 
 class ManagerBase(AbstractManagerBase):
     """Framework managers implementation for all framework based CRUD operations."""
@@ -114,6 +203,63 @@ class ManagerBase(AbstractManagerBase):
     def iterate(self, filter: dict, limit: int, skip: int, sort: str, order: int, *args, **kwargs) -> IterationResult:
         raise NotImplementedError
 
+    def _iterate(self, builder: ManagerQueryBuilder, filter: Union[List[dict], dict], limit: int, skip: int,
+                 sort: str, order: int, count: CountMode = CountMode.EXACT, cursor=None, **kwargs) \
+            -> Tuple[List[dict], Optional[int]]:
+        """
+        Load a page of the collection and the total number of matched documents.
+        Page and exact total are loaded with a single `$facet` aggregation.
+
+        Args:
+            builder: query builder of the manager
+            filter: match requirements of field values
+            limit: max number of elements to return
+            skip: number of elements to skip first
+            sort: sort field
+            order: sort order
+            count: how the total is computed - `ONLY` returns no documents
+            cursor: keyset cursor of the cursor pagination mode
+            **kwargs: additional arguments of the builder (e.g. user and permission)
+
+        Returns:
+            The raw documents and the total - None if the total was not computed
+
+        Raises:
+            ManagerGetError: if the aggregation fails
+        """
+        count = CountMode(count or CountMode.EXACT)
+        if count == CountMode.ONLY:
+            return [], self.__aggregate_total(builder.count(filter, **kwargs))
+
+        if count == CountMode.ESTIMATED and builder.filter_stages(filter, **kwargs) in ([], [{'$match': {}}]):
+            results = list(self._aggregate(self.collection, builder.build(
+                filter, limit=limit, skip=skip, sort=sort, order=order, cursor=cursor, **kwargs)))
+            return results, self._database_manager.estimated_count(self.collection)
+
+        if count == CountMode.NONE or (limit == 0 and skip == 0 and cursor is None):
+            # all documents are loaded - the total is the number of results
+            results = list(self._aggregate(self.collection, builder.build(
+                filter, limit=limit, skip=skip, sort=sort, order=order, cursor=cursor, **kwargs)))
+            return results, (None if count == CountMode.NONE else len(results))
+
+        if limit == 0:
+            # a single facet document could exceed the document size limit
+            results = list(self._aggregate(self.collection, builder.build(
+                filter, limit=limit, skip=skip, sort=sort, order=order, cursor=cursor, **kwargs)))
+            return results, self.__aggregate_total(builder.count(filter, **kwargs))
+
+        facet_query = builder.facet(filter, limit=limit, skip=skip, sort=sort, order=order, cursor=cursor,
+                                    **kwargs)
+        for facet_result in self._aggregate(self.collection, facet_query):
+            total = facet_result['total'][0]['total'] if facet_result['total'] else 0
+            return facet_result['results'], total
+        return [], 0
+
+    def __aggregate_total(self, count_query: Pipeline) -> int:
+        for count_result in self._aggregate(self.collection, count_query):
+            return count_result['total']
+        return 0
+
     def find(self, filter: dict, *args, **kwargs) -> ListResult:
         raise NotImplementedError
 
@@ -0,0 +1,165 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2019 - 2021 NETHINKS GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Token index of the object field values for the text search
+"""
+import logging
+import re
+from typing import List, Optional, Union
+
+from pymongo import ReplaceOne, DeleteOne
+
+from cmdb.database.managers import DatabaseManagerMongo
+from cmdb.framework.cmdb_object import CmdbObject
+from cmdb.framework.models.search_index import SearchIndexModel
+
+LOGGER = logging.getLogger(__name__)
+
+
+class SearchIndex:
+    """
+    Maintains the `framework.search_index` collection - one entry with the word tokens per object.
+    A text search term is resolved with anchored prefix matches on the indexed tokens
+    and the exact (case insensitive) substring match is checked on the text values of the found entries only.
+    """
+
+    REBUILD_BATCH_SIZE: int = 1000
+    # more candidates are not passed to a `$in` match - the search falls back to the regex scan
+    MAX_CANDIDATES: int = 10000
+
+    def __init__(self, database_manager: DatabaseManagerMongo):
+        self.database_manager = database_manager
+
+    @staticmethod
+    def unescape(search_term: str) -> str:
+        """Remove the regex escaping of a search term which the frontend adds to text terms"""
+        return re.sub(r'\\(.)', r'\1', search_term)
+
+    @staticmethod
+    def is_plain(search_term: str) -> bool:
+        """Check if a regex search term only matches its literal text - it contains no unescaped regex syntax"""
+        return re.search(r'[.*+?^$|()\[\]{}\\]', re.sub(r'\\[^0-9A-Za-z]', '', search_term)) is None
+
+    @staticmethod
+    def token_filter(search_term: str) -> Optional[dict]:
+        """
+        Filter for the index entries which contain a search term.
+
+        Args:
+            search_term: plain search text - regex characters are matched literally
+
+        Returns:
+            Filter dict or None if the term has no word token (e.g. only punctuation) and can not use the index
+        """
+        tokens = SearchIndexModel.tokenize(search_term)
+        if not tokens:
+            return None
+        # every word of the term must start a token, the values check the whole term
+        token_matches = [{'tokens': {'$regex': f'^{re.escape(token)}'}} for token in sorted(set(tokens))]
+        return {'$and': token_matches + [{'values': SearchIndex.value_regex(search_term)}]}
+
+    @staticmethod
+    def value_regex(search_term: str) -> dict:
+        """Case insensitive substring match of the literal search term"""
+        return {'$regex': re.escape(search_term), '$options': 'i'}
+
+    def find_public_ids(self, search_term: str, active_flag: bool = False,
+                        max_results: int = MAX_CANDIDATES) -> Optional[List[int]]:
+        """
+        Get the public ids of all objects with a field value containing the search term.
+
+        Args:
+            search_term: plain search text
+            active_flag: only active objects
+            max_results: max number of public ids - a short term can match most of the objects
+
+        Returns:
+            List of public ids or None if the term can not be resolved by the index or matches too many objects
+        """
+        query = self.token_filter(search_term)
+        if query is None:
+            return None
+        if active_flag:
+            query = {'$and': [query, {'active': True}]}
+        cursor = self.database_manager.find(SearchIndexModel.COLLECTION, filter=query,
+                                            projection={'_id': 0, 'public_id': 1}).limit(max_results + 1)
+        public_ids = [entry['public_id'] for entry in cursor]
+        if len(public_ids) > max_results:
+            return None
+        return public_ids
+
+    def update(self, objects: List[Union[CmdbObject, dict]]):
+        """
+        Insert or replace the index entries of objects.
+
+        Args:
+            objects: inserted or updated objects
+        """
+        operations = []
+        for object_ in objects:
+            entry = SearchIndexModel.to_data(SearchIndexModel.from_object(object_))
+            operations.append(ReplaceOne({'public_id': entry['public_id']}, entry, upsert=True))
+        if operations:
+            self.database_manager.bulk_write(SearchIndexModel.COLLECTION, operations, ordered=False)
+
+    def delete(self, public_ids: List[int]):
+        """
+        Remove the index entries of deleted objects.
+
+        Args:
+            public_ids: public ids of the deleted objects
+        """
+        operations = [DeleteOne({'public_id': public_id}) for public_id in public_ids]
+        if operations:
+            self.database_manager.bulk_write(SearchIndexModel.COLLECTION, operations, ordered=False)
+
+    def reindex(self, filter: dict) -> int:
+        """
+        Update the index entries of all objects which match a filter - the objects are loaded in batches.
+
+        Args:
+            filter: filter of the objects
+
+        Returns:
+            Number of indexed objects
+        """
+        total = 0
+        batch: List[dict] = []
+        cursor = self.database_manager.find(CmdbObject.COLLECTION, filter=filter,
+                                            projection={'_id': 0, 'public_id': 1, 'type_id': 1, 'active': 1,
+                                                        'fields': 1}, batch_size=self.REBUILD_BATCH_SIZE)
+        for object_ in cursor:
+            batch.append(object_)
+            if len(batch) >= self.REBUILD_BATCH_SIZE:
+                self.update(batch)
+                total += len(batch)
+                batch = []
+        self.update(batch)
+        total += len(batch)
+        return total
+
+    def rebuild(self) -> int:
+        """
+        Rebuild the complete index from the objects collection.
+
+        Returns:
+            Number of indexed objects
+        """
+        self.database_manager.delete_many(SearchIndexModel.COLLECTION)
+        total = self.reindex({})
+        LOGGER.info(f'Search index rebuilt with {total} objects')
+        return total
@@ -18,14 +18,17 @@
 import logging
 from typing import List
 
+from cmdb.database.managers import DatabaseManagerMongo
 from cmdb.framework.cmdb_object import CmdbObject
 from cmdb.framework.models.type import TypeModel
+from cmdb.framework.models.search_index import SearchIndexModel
 from cmdb.framework.cmdb_object_manager import CmdbObjectManager
 from cmdb.framework.cmdb_render import RenderResult, RenderList
 from cmdb.search import Search
 from cmdb.search.params import SearchParam
 from cmdb.search.query import Query, Pipeline
 from cmdb.search.query.pipe_builder import PipelineBuilder
+from cmdb.search.search_index import SearchIndex
 from cmdb.search.search_result import SearchResult
 from cmdb.user_management import UserModel
 from cmdb.security.acl.permission import AccessControlPermission
@@ -36,25 +39,36 @@ LOGGER = logging.getLogger(__name__)
 
 class QuickSearchPipelineBuilder(PipelineBuilder):
 
-    def __init__(self, pipeline: Pipeline = None):
+    def __init__(self, pipeline: Pipeline = None, database_manager: DatabaseManagerMongo = None):
         """Init constructor
         Args:
             pipeline: preset a for defined pipeline
+            database_manager: Connection for resolving the acl type allowlist
         """
+        self.database_manager = database_manager
+        self.collection: str = CmdbObject.COLLECTION
         super(QuickSearchPipelineBuilder, self).__init__(pipeline=pipeline)
 
     def build(self, search_term, user: UserModel = None, permission: AccessControlPermission = None,
-              active_flag: bool = False, *args, **kwargs) -> Pipeline:
-        """Build a pipeline query out of search search term"""
-
-        regex = self.regex_('fields.value', f'{search_term}', 'ims')
-        pipe_and = self.and_([regex, {'active': {"$eq": True}} if active_flag else {}])
+              active_flag: bool = False, regex_mode: bool = False, *args, **kwargs) -> Pipeline:
+        """Build a pipeline query out of search search term.
+        Terms of the text mode are counted on the search index - `collection` is set to the collection of the pipeline.
+        Regex terms (the default) or terms without a word character use a regex match over the object field values.
+        """
+        index_filter = None if regex_mode else SearchIndex.token_filter(SearchIndex.unescape(f'{search_term}'))
+        if index_filter is None:
+            self.collection = CmdbObject.COLLECTION
+            term_match = self.regex_('fields.value', f'{search_term}', 'ims')
+        else:
+            self.collection = SearchIndexModel.COLLECTION
+            term_match = index_filter
+        pipe_and = self.and_([term_match, {'active': {"$eq": True}} if active_flag else {}])
         pipe_match = self.match_(pipe_and)
 
         # permission builds
         if user and permission:
-            self.pipeline = [*self.pipeline, *(AccessControlQueryBuilder().build(group_id=user.group_id,
-                                                                                 permission=permission))]
+            acl_builder = AccessControlQueryBuilder(database_manager=self.database_manager)
+            self.pipeline = [*self.pipeline, *(acl_builder.build(group_id=user.group_id, permission=permission))]
         self.add_pipe(pipe_match)
         self.add_pipe({'$group': {"_id": {'active': '$active'}, 'count': {'$sum': 1}}})
         self.add_pipe({'$group': {'_id': 0,
@@ -84,11 +98,13 @@ class QuickSearchPipelineBuilder(PipelineBuilder):
 
 class SearchPipelineBuilder(PipelineBuilder):
 
-    def __init__(self, pipeline: Pipeline = None):
+    def __init__(self, pipeline: Pipeline = None, database_manager: DatabaseManagerMongo = None):
         """Init constructor
         Args:
             pipeline: preset a for defined pipeline
+            database_manager: Connection for resolving the acl type allowlist
         """
+        self.database_manager = database_manager
         super(SearchPipelineBuilder, self).__init__(pipeline=pipeline)
 
     def get_regex_pipes_values(self) -> List[str]:
@@ -140,8 +156,8 @@ class SearchPipelineBuilder(PipelineBuilder):
 
         # permission builds
         if user and permission:
-            __pipeline = [*__pipeline, *(AccessControlQueryBuilder().build(group_id=user.group_id,
-                                                                           permission=permission))]
+            acl_builder = AccessControlQueryBuilder(database_manager=self.database_manager)
+            __pipeline = [*__pipeline, *(acl_builder.build(group_id=user.group_id, permission=permission))]
         return __pipeline
 
     def build(self, params: List[SearchParam],
@@ -160,7 +176,15 @@ class SearchPipelineBuilder(PipelineBuilder):
         text_params = [_ for _ in params if _.search_form == 'text' or _.search_form == 'regex']
         for param in text_params:
             regex = self.regex_('fields.value', param.search_text, 'ims')
-            self.add_pipe(self.match_(regex))
+            public_ids = None
+            if param.search_form == 'text' and self.database_manager:
+                search_text = SearchIndex.unescape(param.search_text)
+                public_ids = SearchIndex(self.database_manager).find_public_ids(search_text, active_flag)
+            if public_ids is None:
+                self.add_pipe(self.match_(regex))
+            else:
+                # the regex is kept for the match highlighting - it only runs on the indexed candidates
+                self.add_pipe(self.match_(self.and_([self.in_('public_id', public_ids), regex])))
 
         # type builds
         disjunction_query = []
@@ -191,8 +215,8 @@ class SearchPipelineBuilder(PipelineBuilder):
 
         # permission builds
         if user and permission:
-            self.pipeline = [*self.pipeline, *(AccessControlQueryBuilder().build(group_id=user.group_id,
-                                                                                 permission=permission))]
+            acl_builder = AccessControlQueryBuilder(database_manager=self.database_manager)
+            self.pipeline = [*self.pipeline, *(acl_builder.build(group_id=user.group_id, permission=permission))]
         return self.pipeline
 
 
@@ -267,7 +291,7 @@ class SearcherFramework(Search[CmdbObjectManager]):
             # parse result list
             pre_rendered_result_list = [CmdbObject(**raw_result) for raw_result in raw_search_result_list_entry['data']]
             rendered_result_list = RenderList(pre_rendered_result_list, request_user,
-                                              object_manager=self.manager).render_result_list()
+                                              object_manager=self.manager, batch=True).render_result_list()
 
             total_results = raw_search_result_list_entry['metadata'][0].get('total', 0)
             group_result_list = raw_search_result_list[0]['group']
@@ -14,20 +14,124 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
+import time
+from threading import Lock
+from typing import Dict, List, Tuple
+
+from cmdb.database.managers import DatabaseManagerMongo
 from cmdb.framework.utils import PublicID
 from cmdb.search import Pipeline
 from cmdb.search.query.pipe_builder import PipelineBuilder
 from cmdb.security.acl.permission import AccessControlPermission
 
 
+class AccessControlTypeCache:
+    """
+    Process wide cache of the type ids a group is allowed to access with a permission.
+    Types are few and objects are many, so the ACLs of the types are resolved once in python
+    and the objects are restricted by a single indexed `type_id` match.
+
+    Notes:
+        Every type change increments a version counter in the database (see `invalidate`).
+        The counter is checked with a single `_id` lookup per call, so changes of other processes
+        are visible to the next request. `TIMEOUT` only limits the life of the cache if types were
+        changed without the managers, e.g. directly in the database.
+    """
+    TYPE_COLLECTION = 'framework.types'
+    VERSION_COLLECTION = 'settings.conf'
+    VERSION_ID = 'acl_type_version'
+    TIMEOUT: int = 300
+
+    _lock = Lock()
+    _type_documents: List[dict] = None
+    _version: int = None
+    _loaded_at: float = 0
+    _allowed_types: Dict[Tuple[int, str], List[int]] = {}
+
+    @classmethod
+    def get_version(cls, database_manager: DatabaseManagerMongo) -> int:
+        """Get the type version counter from the database - 0 if the types were never changed"""
+        document = database_manager.connector.get_collection(cls.VERSION_COLLECTION).find_one({'_id': cls.VERSION_ID})
+        return (document or {}).get('version', 0)
+
+    @classmethod
+    def get_allowed_types(cls, database_manager: DatabaseManagerMongo, group_id: PublicID,
+                          permission: AccessControlPermission) -> List[int]:
+        """
+        Get the public ids of all types the group can access with the permission.
+
+        Args:
+            database_manager: Database connection for the version check and loading the types on a cache miss
+            group_id: PublicID of the user group
+            permission: ACL permission
+
+        Returns:
+            List of type ids
+        """
+        key = (int(group_id), permission.value)
+        # read the version before the types, so a change during the load is detected by the next call
+        version = cls.get_version(database_manager)
+        with cls._lock:
+            if cls._type_documents is None or cls._version != version \
+                    or time.time() - cls._loaded_at > cls.TIMEOUT:
+                cls._type_documents = database_manager.find_all(collection=cls.TYPE_COLLECTION,
+                                                                projection={'_id': 0, 'public_id': 1, 'acl': 1})
+                cls._version = version
+                cls._loaded_at = time.time()
+                cls._allowed_types = {}
+            if key not in cls._allowed_types:
+                cls._allowed_types[key] = [type_['public_id'] for type_ in cls._type_documents
+                                           if cls._has_access(type_, *key)]
+            return cls._allowed_types[key]
+
+    @classmethod
+    def invalidate(cls, database_manager: DatabaseManagerMongo = None):
+        """
+        Drop the cached types - must be called after every type change
+
+        Args:
+            database_manager: If passed the version counter in the database is incremented,
+                              so the caches of all other processes are dropped too
+        """
+        if database_manager:
+            database_manager.connector.get_collection(cls.VERSION_COLLECTION).update_one(
+                {'_id': cls.VERSION_ID}, {'$inc': {'version': 1}}, upsert=True)
+        with cls._lock:
+            cls._type_documents = None
+            cls._version = None
+            cls._allowed_types = {}
+
+    @staticmethod
+    def _has_access(type_: dict, group_id: int, permission: str) -> bool:
+        """Python equivalent of the `_match_acl` stage of the query builders"""
+        if 'acl' not in type_:
+            return True
+        acl: dict = type_['acl'] or {}
+        if acl.get('activated', None) is False:
+            return True
+        includes: dict = (acl.get('groups') or {}).get('includes') or {}
+        return permission in (includes.get(str(group_id)) or [])
+
+
 class LookedAccessControlQueryBuilder(PipelineBuilder):
     """Query builder for looked objects in aggregation calls."""
 
-    def __init__(self, pipeline: Pipeline = None):
+    def __init__(self, pipeline: Pipeline = None, database_manager: DatabaseManagerMongo = None):
+        """
+        Init constructor
+        Args:
+            pipeline: preset a for defined pipeline
+            database_manager: If passed the acl is resolved with the type allowlist instead of a `$lookup`
+        """
+        self.database_manager = database_manager
         super(LookedAccessControlQueryBuilder, self).__init__(pipeline=pipeline)
 
     def build(self, group_id: PublicID, permission: AccessControlPermission, *args, **kwargs) -> Pipeline:
         self.clear()
+        if self.database_manager:
+            type_ids = AccessControlTypeCache.get_allowed_types(self.database_manager, group_id, permission)
+            self.add_pipe(self.match_(self.in_('object.type_id', type_ids)))
+            return self.pipeline
         self.add_pipe(self._lookup_types())
         self.add_pipe(self._unwind_types())
         self.add_pipe(self._match_acl(group_id, permission))
@@ -68,11 +172,22 @@ class LookedAccessControlQueryBuilder(PipelineBuilder):
 class AccessControlQueryBuilder(PipelineBuilder):
     """Query builder for restrict objects in aggregation calls."""
 
-    def __init__(self, pipeline: Pipeline = None):
+    def __init__(self, pipeline: Pipeline = None, database_manager: DatabaseManagerMongo = None):
+        """
+        Init constructor
+        Args:
+            pipeline: preset a for defined pipeline
+            database_manager: If passed the acl is resolved with the type allowlist instead of a `$lookup`
+        """
+        self.database_manager = database_manager
         super(AccessControlQueryBuilder, self).__init__(pipeline=pipeline)
 
     def build(self, group_id: PublicID, permission: AccessControlPermission, *args, **kwargs) -> Pipeline:
         self.clear()
+        if self.database_manager:
+            type_ids = AccessControlTypeCache.get_allowed_types(self.database_manager, group_id, permission)
+            self.add_pipe(self.match_(self.in_('type_id', type_ids)))
+            return self.pipeline
         self.add_pipe(self._lookup_types())
         self.add_pipe(self._unwind_types())
         self.add_pipe(self._match_acl(group_id, permission))
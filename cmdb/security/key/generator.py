@@ -15,6 +15,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from cmdb.database.managers import DatabaseManagerMongo
+from cmdb.security.key.holder import KeyHolder
 from cmdb.utils.system_writer import SystemSettingsWriter
 from cmdb.utils.system_config import SystemConfigReader
 
@@ -42,6 +43,7 @@ class KeyGenerator:
             'public': public_key
         }
         self.ssw.write('security', {'asymmetric_key': asymmetric_key})
+        KeyHolder.invalidate()
 
     def generate_symmetric_aes_key(self):
         from Crypto import Random
@@ -13,6 +13,12 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import time
+from threading import Lock
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
+
 from cmdb.database.managers import DatabaseManagerMongo
 from cmdb.utils.error import CMDBError
 from cmdb.utils.system_reader import SystemSettingsReader
@@ -20,25 +26,78 @@ from cmdb.utils.system_config import SystemConfigReader
 
 
 class KeyHolder:
+    """
+    Holder of the asymmetric key pair.
+    The keys are cached process wide, so the database is only accessed on the first call,
+    after `TIMEOUT` seconds or after the cache was invalidated.
+    """
+    TIMEOUT: int = 600
+
+    _lock = Lock()
+    _asymmetric_key: dict = None
+    _public_key = None
+    _loaded_at: float = 0
+    _database_manager: DatabaseManagerMongo = None
 
-    def __init__(self, key_directory=None):
+    def __init__(self, key_directory=None, database_manager: DatabaseManagerMongo = None):
         """
         Args:
             key_directory: key based directory
+            database_manager: database connection - a process wide connection is used if not passed
         """
-        self.scr = SystemConfigReader()
-        self.__dbm = DatabaseManagerMongo(
-            **self.scr.get_all_values_from_section('Database')
-        )
-        self.ssr = SystemSettingsReader(self.__dbm)
-        self.rsa_public = self.get_public_key()
-        self.rsa_private = self.get_private_key()
+        self.__dbm = database_manager
+
+    @property
+    def rsa_public(self):
+        return self.get_public_key()
+
+    @property
+    def rsa_private(self):
+        return self.get_private_key()
 
     def get_public_key(self):
-        return self.ssr.get_value('asymmetric_key', 'security')['public']
+        return self.__get_asymmetric_key()['public']
 
     def get_private_key(self):
-        return self.ssr.get_value('asymmetric_key', 'security')['private']
+        return self.__get_asymmetric_key()['private']
+
+    def get_loaded_public_key(self):
+        """Get the public key as already parsed key instance for the token verification"""
+        asymmetric_key = self.__get_asymmetric_key()
+        with KeyHolder._lock:
+            if KeyHolder._public_key is None:
+                public_key = asymmetric_key['public']
+                if isinstance(public_key, str):
+                    public_key = public_key.encode('utf-8')
+                KeyHolder._public_key = load_pem_public_key(public_key, backend=default_backend())
+            return KeyHolder._public_key
+
+    @classmethod
+    def invalidate(cls):
+        """Drop the cached keys - should be called after the key pair was changed"""
+        with cls._lock:
+            cls._asymmetric_key = None
+            cls._public_key = None
+
+    def __get_asymmetric_key(self) -> dict:
+        with KeyHolder._lock:
+            if KeyHolder._asymmetric_key is None or time.time() - KeyHolder._loaded_at > KeyHolder.TIMEOUT:
+                ssr = SystemSettingsReader(self.__get_database_manager())
+                asymmetric_key = ssr.get_value('asymmetric_key', 'security')
+                if asymmetric_key != KeyHolder._asymmetric_key:
+                    KeyHolder._public_key = None
+                KeyHolder._asymmetric_key = asymmetric_key
+                KeyHolder._loaded_at = time.time()
+            return KeyHolder._asymmetric_key
+
+    def __get_database_manager(self) -> DatabaseManagerMongo:
+        if self.__dbm:
+            return self.__dbm
+        if not KeyHolder._database_manager:
+            KeyHolder._database_manager = DatabaseManagerMongo(
+                **SystemConfigReader().get_all_values_from_section('Database')
+            )
+        return KeyHolder._database_manager
 
 
 class RSAKeyNotExists(CMDBError):
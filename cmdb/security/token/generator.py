@@ -39,13 +39,13 @@ class TokenGenerator:
     }
 
     def __init__(self, database_manager: DatabaseManagerMongo = None):
-        self.key_holder = KeyHolder()
         self.header = {
             'alg': 'RS512'
         }
         self.database_manager = database_manager or DatabaseManagerMongo(
             **SystemConfigReader().get_all_values_from_section('Database')
         )
+        self.key_holder = KeyHolder(database_manager=self.database_manager)
 
         self.auth_module = AuthModule(SystemSettingsReader(self.database_manager).get_all_values_from_section(
             'auth', default=AuthModule.__DEFAULT_SETTINGS__))
@@ -19,6 +19,7 @@ import logging
 from authlib.jose import jwt, JWT
 from authlib.jose.errors import BadSignatureError, InvalidClaimError
 
+from cmdb.database.managers import DatabaseManagerMongo
 from cmdb.security.key.holder import KeyHolder
 
 try:
@@ -31,12 +32,12 @@ LOGGER = logging.getLogger(__name__)
 
 class TokenValidator:
 
-    def __init__(self):
-        self.key_holder = KeyHolder()
+    def __init__(self, database_manager: DatabaseManagerMongo = None):
+        self.key_holder = KeyHolder(database_manager=database_manager)
 
     def decode_token(self, token: (JWT, str, dict)):
         try:
-            decoded_token = jwt.decode(s=token, key=self.key_holder.get_public_key())
+            decoded_token = jwt.decode(s=token, key=self.key_holder.get_loaded_public_key())
         except (BadSignatureError, Exception) as err:
             raise ValidationError(err)
         return decoded_token
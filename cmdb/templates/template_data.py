@@ -14,13 +14,38 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import copy
 import logging
+from typing import Dict, Iterable, List, Optional
 
-from cmdb.framework.cmdb_render import CmdbRender
+from cmdb.framework.cmdb_errors import ObjectManagerGetError
+from cmdb.framework.cmdb_object import CmdbObject
+from cmdb.framework.models.type import TypeModel
+from cmdb.framework.cmdb_render import CmdbRender, RenderResult
 
 
 LOGGER = logging.getLogger(__name__)
 
+
+class ReadOnlyDict(dict):
+    """Dict which can not be changed after its creation.
+    The template data of the cache is shared between objects and export destinations running in parallel,
+    so it must not be modified. Copies (`copy`, `copy.copy`, `copy.deepcopy`) are plain, writable dicts.
+    """
+
+    def __readonly(self, *args, **kwargs):
+        raise TypeError(f'{type(self).__name__} is read only - use a copy for modifications')
+
+    __setitem__ = __delitem__ = __ior__ = __readonly
+    clear = pop = popitem = setdefault = update = __readonly
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+
 class AbstractTemplateData:
 
     def __init__(self):
@@ -30,29 +55,143 @@ class AbstractTemplateData:
         return self._template_data
 
 
+class ObjectTemplateDataCache:
+    """Resolution cache for the referenced objects of ObjectTemplateData.
+    Should live for one export run - every referenced object is loaded and rendered only once.
+    """
+    MAX_DEPTH = 3
+
+    def __init__(self, object_manager):
+        self.__object_manager = object_manager
+        self.__rendered_objects: Dict[int, RenderResult] = {}
+        self.__failed_objects: Dict[int, Exception] = {}
+        self.__types: Dict[int, dict] = {}
+        self.__template_data: Dict[tuple, dict] = {}
+
+    @staticmethod
+    def get_reference_ids(cmdb_object: RenderResult) -> List[int]:
+        """Get the public ids of all set ref fields of a rendered object"""
+        reference_ids = []
+        for field in cmdb_object.fields:
+            try:
+                if field["type"] == "ref" and field["value"]:
+                    reference_ids.append(int(field["value"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return reference_ids
+
+    def prefetch(self, cmdb_objects: Iterable[RenderResult], depth: int = MAX_DEPTH):
+        """Load and render the references of the objects breadth first - one query per reference level
+
+        Args:
+            cmdb_objects: rendered objects whose references will be resolved
+            depth: number of reference levels
+        """
+        current_level = list(cmdb_objects)
+        for _ in range(depth):
+            public_ids = {public_id for cmdb_object in current_level
+                          for public_id in self.get_reference_ids(cmdb_object)
+                          if public_id not in self.__rendered_objects and public_id not in self.__failed_objects}
+            if not public_ids:
+                break
+            current_level = self.__load_objects(public_ids)
+
+    def get_rendered_object(self, public_id: int) -> RenderResult:
+        """Get a rendered object from the cache - it will be loaded if it was not prefetched
+
+        Raises:
+            ObjectManagerGetError: if the object does not exist
+            RenderError: if the object could not be rendered
+        """
+        public_id = int(public_id)
+        if public_id not in self.__rendered_objects and public_id not in self.__failed_objects:
+            self.__load_objects({public_id})
+        if public_id in self.__failed_objects:
+            raise self.__failed_objects[public_id]
+        return self.__rendered_objects[public_id]
+
+    def get_template_data(self, public_id: int, iteration: int) -> Optional[dict]:
+        return self.__template_data.get((public_id, iteration))
+
+    def set_template_data(self, public_id: int, iteration: int, data: dict):
+        self.__template_data[(public_id, iteration)] = data
+
+    def __load_objects(self, public_ids: set) -> List[RenderResult]:
+        """Load and render the objects and their missing types - one query per collection"""
+        rendered_objects = []
+        loaded_objects = []
+        for document in self.__object_manager.dbm.find_all(CmdbObject.COLLECTION,
+                                                            filter={'public_id': {'$in': list(public_ids)}}):
+            try:
+                loaded_objects.append(CmdbObject(**document))
+            except Exception as err:
+                self.__failed_objects[document.get('public_id')] = err
+        self.__load_types({current_object.get_type_id() for current_object in loaded_objects})
+        for current_object in loaded_objects:
+            try:
+                rendered_object = self.__render(current_object)
+            except Exception as err:
+                self.__failed_objects[current_object.get_public_id()] = err
+            else:
+                self.__rendered_objects[current_object.get_public_id()] = rendered_object
+                rendered_objects.append(rendered_object)
+        for public_id in public_ids.difference(self.__rendered_objects, self.__failed_objects):
+            self.__failed_objects[public_id] = ObjectManagerGetError(f'Object with ID: {public_id} not found!')
+        return rendered_objects
+
+    def __load_types(self, type_ids: set):
+        missing_type_ids = type_ids.difference(self.__types)
+        if not missing_type_ids:
+            return
+        for document in self.__object_manager.dbm.find_all(TypeModel.COLLECTION,
+                                                            filter={'public_id': {'$in': list(missing_type_ids)}}):
+            self.__types[document['public_id']] = document
+
+    def __render(self, current_object) -> RenderResult:
+        type_id = current_object.get_type_id()
+        if type_id not in self.__types:
+            raise ObjectManagerGetError(f'Type with ID: {type_id} not found!')
+        # the render modifies the type fields - every object gets its own copy
+        type_instance = TypeModel.from_data(copy.deepcopy(self.__types[type_id]))
+        return CmdbRender(object_instance=current_object, type_instance=type_instance, render_user=None).result()
+
+
 class ObjectTemplateData(AbstractTemplateData):
 
-    def __init__(self, object_manager, cmdb_object):
+    def __init__(self, object_manager, cmdb_object, cache: ObjectTemplateDataCache = None):
+        """
+        Args:
+            object_manager: object manager to load the referenced objects
+            cmdb_object: rendered object
+            cache: resolution cache which is shared between multiple objects - for example in one export run
+        """
         super(ObjectTemplateData, self).__init__()
         self.__object_manager = object_manager
-        self._template_data = self.__get_objectdata(cmdb_object, 3)
+        if cache is None:
+            cache = ObjectTemplateDataCache(object_manager)
+            cache.prefetch([cmdb_object])
+        self.__cache = cache
+        self._template_data = self.__get_objectdata(cmdb_object, ObjectTemplateDataCache.MAX_DEPTH)
 
     def __get_objectdata(self, cmdb_object, iteration):
-        data = {}
-        data["id"] = cmdb_object.object_information['object_id']
-        data["fields"] = {}
+        public_id = cmdb_object.object_information['object_id']
+        data = self.__cache.get_template_data(public_id, iteration)
+        if data is not None:
+            return data
+
+        fields = {}
         for field in cmdb_object.fields:
             try:
                 field_name = field["name"]
                 if field["type"] == "ref" and field["value"] and iteration > 0:
                     # resolve type
-                    current_object = self.__object_manager.get_object(field["value"])
-                    type_instance = self.__object_manager.get_type(current_object.get_type_id())
-                    cmdb_render_object = CmdbRender(object_instance=current_object, type_instance=type_instance,
-                                                    render_user=None)
-                    data["fields"][field_name] = self.__get_objectdata(cmdb_render_object.result(), iteration - 1)
+                    referenced_object = self.__cache.get_rendered_object(field["value"])
+                    fields[field_name] = self.__get_objectdata(referenced_object, iteration - 1)
                 else:
-                    data["fields"][field_name] = field["value"]
+                    fields[field_name] = field["value"]
             except Exception as err:
                 LOGGER.error(err)
+        # the data is shared by all objects which reference this object - so it is read only
+        data = ReadOnlyDict(id=public_id, fields=ReadOnlyDict(fields))
+        self.__cache.set_template_data(public_id, iteration, data)
         return data
@@ -15,16 +15,61 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
+from typing import Iterable
+
 import jinja2
 
+from cmdb.utils.cache import LRUCache
+
 LOGGER = logging.getLogger(__name__)
 
 class TemplateEngine:
+    """Renders jinja2 template strings.
+    All instances share one environment and a LRU cache of the compiled templates, keyed by the template source.
+    """
+    CACHE_SIZE = 1024
+
+    _environment = jinja2.Environment(undefined=jinja2.ChainableUndefined)
+    _template_cache = LRUCache(max_size=CACHE_SIZE)
 
     def __init__(self):
         pass
 
+    def get_template(self, template_string) -> jinja2.Template:
+        """Get the compiled template of a template string - compiles it on a cache miss"""
+        template = TemplateEngine._template_cache.get(template_string)
+        if template is None:
+            template = TemplateEngine._environment.from_string(template_string)
+            TemplateEngine._template_cache.set(template_string, template)
+        return template
+
+    def precompile(self, template_strings: Iterable[str]) -> int:
+        """Compile a set of template strings into the cache
+
+        Args:
+            template_strings: the template sources - duplicates are only compiled once
+
+        Returns:
+            number of templates which could be compiled
+        """
+        compiled = 0
+        for template_string in set(template_strings):
+            try:
+                self.get_template(template_string)
+                compiled += 1
+            except Exception as err:
+                LOGGER.warning(f'Template could not be compiled: {err}')
+        return compiled
+
     def render_template_string(self, template_string, template_data):
-        environment = jinja2.Environment(undefined=jinja2.ChainableUndefined)
-        template = environment.from_string(template_string)
+        template = self.get_template(template_string)
         return template.render(template_data)
+
+    @staticmethod
+    def cache_stats() -> dict:
+        """Get the hit/miss metrics of the compiled template cache"""
+        return TemplateEngine._template_cache.stats()
+
+    @staticmethod
+    def clear_cache():
+        TemplateEngine._template_cache.clear()
@@ -0,0 +1,46 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2019 - 2021 NETHINKS GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+
+from cmdb.framework.models.search_index import SearchIndexModel
+from cmdb.search.search_index import SearchIndex
+from cmdb.updater.updater import Updater
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Update20210215(Updater):
+
+    def author(self):
+        return 'nethinks'
+
+    def creation_date(self):
+        return '20210215'
+
+    def description(self):
+        return 'Build the search index of the objects'
+
+    def increase_updater_version(self, value):
+        super(Update20210215, self).increase_updater_version(value)
+
+    def start_update(self):
+        try:
+            self.database_manager.reconcile_indexes(SearchIndexModel.COLLECTION, SearchIndexModel.get_index_keys())
+            SearchIndex(database_manager=self.database_manager).rebuild()
+        except Exception as err:
+            raise Exception(f'Search index could not be built: {err}')
+        self.increase_updater_version(20210215)
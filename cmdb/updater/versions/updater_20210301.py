@@ -0,0 +1,46 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2019 - 2021 NETHINKS GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+
+from cmdb.exportd.exportd_job.exportd_sync_state import ExportdSyncState
+from cmdb.updater.updater import Updater
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Update20210301(Updater):
+
+    def author(self):
+        return 'nethinks'
+
+    def creation_date(self):
+        return '20210301'
+
+    def description(self):
+        return 'Create the collection of the exportd sync states'
+
+    def increase_updater_version(self, value):
+        super(Update20210301, self).increase_updater_version(value)
+
+    def start_update(self):
+        try:
+            if ExportdSyncState.COLLECTION not in self.database_manager.connector.database.list_collection_names():
+                self.database_manager.create_collection(ExportdSyncState.COLLECTION)
+            self.database_manager.reconcile_indexes(ExportdSyncState.COLLECTION, ExportdSyncState.get_index_keys())
+        except Exception as err:
+            raise Exception(f'Exportd sync state collection could not be created: {err}')
+        self.increase_updater_version(20210301)
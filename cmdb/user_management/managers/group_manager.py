@@ -23,7 +23,6 @@ from ...framework.results import IterationResult
 from ...framework.utils import PublicID
 from ...manager import ManagerDeleteError, ManagerGetError, ManagerIterationError, ManagerUpdateError
 from ...manager.managers import ManagerBase
-from ...search import Pipeline
 
 
 class GroupManager(ManagerBase):
@@ -43,19 +42,15 @@ class GroupManager(ManagerBase):
             skip: number of elements to skip first
             sort: sort field
             order: sort order
+            count (optional): `CountMode` of the total
 
         Returns:
             IterationResult: Instance of IterationResult with generic CategoryModel.
         """
 
         try:
-            query: Pipeline = self.builder.build(filter=filter, limit=limit, skip=skip, sort=sort, order=order)
-            count_query: Pipeline = self.builder.count(filter=filter)
-            aggregation_result = list(self._aggregate(self.collection, query))
-            total_cursor = self._aggregate(self.collection, count_query)
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            aggregation_result, total = self._iterate(self.builder, filter=filter, limit=limit, skip=skip,
+                                                      sort=sort, order=order, count=kwargs.get('count'))
         except ManagerGetError as err:
             raise ManagerIterationError(err=err)
         iteration_result: IterationResult[UserGroupModel] = IterationResult(aggregation_result, total)
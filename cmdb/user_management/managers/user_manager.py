@@ -21,7 +21,7 @@ from ...framework.results import IterationResult
 from ...framework.utils import PublicID
 from ...manager import ManagerGetError, ManagerIterationError, ManagerDeleteError, ManagerUpdateError
 from ...manager.managers import ManagerBase
-from ...search import Query, Pipeline
+from ...search import Query
 
 
 class UserManager(ManagerBase):
@@ -40,6 +40,7 @@ class UserManager(ManagerBase):
             skip: number of elements to skip first
             sort: sort field
             order: sort order
+            count (optional): `CountMode` of the total
             *args:
             **kwargs:
 
@@ -47,13 +48,8 @@ class UserManager(ManagerBase):
             IterationResult: Instance of IterationResult with generic UserModel.
         """
         try:
-            query: Pipeline = self.builder.build(filter=filter, limit=limit, skip=skip, sort=sort, order=order)
-            count_query: Pipeline = self.builder.count(filter=filter)
-            aggregation_result = list(self._aggregate(self.collection, query))
-            total_cursor = self._aggregate(self.collection, count_query)
-            total = 0
-            while total_cursor.alive:
-                total = next(total_cursor)['total']
+            aggregation_result, total = self._iterate(self.builder, filter=filter, limit=limit, skip=skip,
+                                                      sort=sort, order=order, count=kwargs.get('count'))
         except ManagerGetError as err:
             raise ManagerIterationError(err=err)
         iteration_result: IterationResult[UserModel] = IterationResult(aggregation_result, total)
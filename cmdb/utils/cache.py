@@ -0,0 +1,92 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2019 - 2021 NETHINKS GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Process wide in-memory caches
+"""
+import time
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Hashable
+
+
+class LRUCache:
+    """
+    Thread safe least recently used cache with an optional time to live for the entries.
+    """
+
+    def __init__(self, max_size: int = 128, ttl: float = None):
+        """
+        Constructor of `LRUCache`
+
+        Args:
+            max_size: Max number of entries - the least recently used entry is dropped if exceeded
+            ttl: Seconds after an entry expires - `None` means never
+        """
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get the cached value of a key or the default if the key is missing or expired"""
+        with self._lock:
+            try:
+                stored_at, value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value - drops the least recently used entries if the cache is full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key from the cache"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return entry[1] if entry else default
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get the usage metrics of the cache"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses
+            }
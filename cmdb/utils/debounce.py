@@ -0,0 +1,108 @@
+# DATAGERRY - OpenSource Enterprise CMDB
+# Copyright (C) 2019 - 2021 NETHINKS GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Debouncing of bursty triggers
+"""
+import time
+from threading import Lock, Event
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class _DebounceEntry:
+
+    def __init__(self, first: float, due: float, value: Any):
+        self.first = first
+        self.due = due
+        self.value = value
+
+
+class Debouncer:
+    """
+    Thread safe debouncer for keyed triggers.
+    A key is due after no new trigger arrived for the quiet period,
+    but at the latest after the max delay since its first pending trigger - so a steady stream
+    of triggers can not postpone it forever. Triggers of a pending key are merged - by default the latest value wins.
+    """
+
+    def __init__(self, quiet_period: float, max_delay: float, clock=time.monotonic,
+                 merge: Callable[[Any, Any], Any] = None):
+        """
+        Constructor of `Debouncer`
+
+        Args:
+            quiet_period: Default seconds without a new trigger before a key is due
+            max_delay: Max seconds between the first trigger and the due time of a key
+            clock: Monotonic time function
+            merge: Gets the pending and the new value of a key and returns the merged value
+        """
+        self.quiet_period: float = quiet_period
+        self.max_delay: float = max_delay
+        self._clock = clock
+        self._merge = merge
+        self._entries: Dict[Hashable, _DebounceEntry] = {}
+        self._lock = Lock()
+        self._wakeup = Event()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def trigger(self, key: Hashable, value: Any = None, quiet_period: float = None):
+        """
+        Trigger a key - starts or extends its quiet period
+
+        Args:
+            key: Key of the trigger
+            value: Value which is returned when the key is due
+            quiet_period: Quiet period of this trigger - the default quiet period if not set
+        """
+        quiet_period = self.quiet_period if quiet_period is None else quiet_period
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = _DebounceEntry(now, min(now + quiet_period, now + self.max_delay), value)
+            else:
+                entry.value = value if self._merge is None else self._merge(entry.value, value)
+                entry.due = min(now + quiet_period, entry.first + self.max_delay)
+        self._wakeup.set()
+
+    def cancel(self, key: Hashable):
+        """Drop a pending key"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def pop_due(self) -> List[Tuple[Hashable, Any]]:
+        """Remove and get all due keys with their merged value"""
+        now = self._clock()
+        with self._lock:
+            due = [key for key, entry in self._entries.items() if entry.due <= now]
+            return [(key, self._entries.pop(key).value) for key in due]
+
+    def next_due(self) -> Optional[float]:
+        """Seconds until the next key is due or None if nothing is pending"""
+        with self._lock:
+            if not self._entries:
+                return None
+            return max(0.0, min(entry.due for entry in self._entries.values()) - self._clock())
+
+    def wait(self, timeout: float):
+        """Block until the next key is due, a new trigger arrives or the timeout is reached"""
+        self._wakeup.clear()
+        next_due = self.next_due()
+        if next_due is not None:
+            timeout = min(timeout, next_due)
+        self._wakeup.wait(timeout)